@@ -28,3 +28,12 @@ SELECT
 FROM whale_signals
 ORDER BY detected_at DESC
 LIMIT 10;
+
+-- Paso 4: Columnas de clasificación usadas por el validador y las estadísticas
+-- materializadas (whale_stats.json). El detector GOLD ya las escribe; en tablas
+-- creadas antes de v3.0 hay que añadirlas.
+ALTER TABLE whale_signals ADD COLUMN IF NOT EXISTS signal_id TEXT DEFAULT 'NONE';
+ALTER TABLE whale_signals ADD COLUMN IF NOT EXISTS action TEXT;
+ALTER TABLE whale_signals ADD COLUMN IF NOT EXISTS confidence TEXT;
+ALTER TABLE whale_signals ADD COLUMN IF NOT EXISTS win_rate_hist NUMERIC;
+ALTER TABLE whale_signals ADD COLUMN IF NOT EXISTS expected_roi NUMERIC;
@@ -0,0 +1,229 @@
+#!/usr/bin/env python3
+"""
+Almacén local de actividad por wallet (/activity del data-api de Polymarket).
+
+Recuerda el timestamp más reciente sincronizado de cada wallet: en análisis
+posteriores solo se piden las páginas nuevas (la API devuelve lo más reciente
+primero) y se para en cuanto una página solapa con lo ya guardado.
+
+Por wallet, en ACTIVITY_DIR:
+- <wallet>.jsonl: items, del más reciente al más antiguo (se leen en streaming)
+- <wallet>.json:  metadatos (timestamps y claves de los extremos, completo, n_items, bytes)
+
+Los items se reemplazan antes que los metadatos: si el proceso muere entre las
+dos escrituras, el tamaño del .jsonl ya no coincide con `bytes` y la wallet se
+descarga de nuevo (con metadatos viejos la sync volvería a añadir lo ya guardado).
+
+La deduplicación solo necesita las claves de los items en los extremos: un item
+de una página es nuevo si su timestamp es posterior a newest_ts (o igual y con
+clave desconocida); en backfill, si es anterior a oldest_ts. Así no hace falta
+cargar el historial en memoria aunque tenga cientos de miles de items.
+"""
+
+import os
+import json
+import logging
+from pathlib import Path
+from datetime import datetime
+
+logger = logging.getLogger(__name__)
+
+ACTIVITY_DIR = Path(".activity_store")
+PAGE_SIZE = 500
+
+
+def clave_item(item):
+    """Identidad de un item de /activity (no trae id propio)"""
+    return "|".join((
+        item.get('transactionHash', '') or '',
+        item.get('type', '') or '',
+        item.get('asset', '') or item.get('conditionId', '') or '',
+        item.get('side', '') or '',
+        str(item.get('size', '')),
+    ))
+
+
+def _ts(item):
+    return int(item.get('timestamp', 0) or 0)
+
+
+class ActivityStore:
+    def __init__(self, directorio=ACTIVITY_DIR):
+        self.directorio = Path(directorio)
+        self.directorio.mkdir(parents=True, exist_ok=True)
+
+    def _ruta_meta(self, wallet):
+        return self.directorio / f"{wallet.lower()}.json"
+
+    def _ruta_items(self, wallet):
+        return self.directorio / f"{wallet.lower()}.jsonl"
+
+    # --- Lectura ---
+
+    def cargar_meta(self, wallet):
+        """Metadatos de la wallet o None si no hay nada guardado"""
+        path = self._ruta_meta(wallet)
+        if not path.exists() or not self._ruta_items(wallet).exists():
+            return None
+        try:
+            with open(path, 'r', encoding='utf-8') as f:
+                meta = json.load(f)
+        except Exception as e:
+            logger.warning(f"Actividad local ilegible para {wallet}, se descarga de nuevo: {e}")
+            return None
+        tamano = os.path.getsize(self._ruta_items(wallet))
+        if meta.get('bytes') is not None and meta['bytes'] != tamano:
+            logger.warning(f"Actividad local de {wallet} inconsistente con sus metadatos "
+                           f"({tamano} != {meta['bytes']} bytes), se descarga de nuevo")
+            return None
+        return meta
+
+    def iterar(self, wallet, limite=None):
+        """Items guardados, del más reciente al más antiguo, sin cargarlos todos en memoria
+        (como mucho `limite` si se indica)"""
+        n = 0
+        with open(self._ruta_items(wallet), 'r', encoding='utf-8') as f:
+            for linea in f:
+                if limite is not None and n >= limite:
+                    return
+                if linea.strip():
+                    n += 1
+                    yield json.loads(linea)
+
+    # --- Escritura ---
+
+    def _escribir_meta(self, wallet, meta):
+        meta['ultima_sincronizacion'] = datetime.now().isoformat()
+        meta['bytes'] = os.path.getsize(self._ruta_items(wallet))
+        path = self._ruta_meta(wallet)
+        tmp_path = f"{path}.tmp"
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump(meta, f)
+        os.replace(tmp_path, path)
+
+    @staticmethod
+    def _extremos(items, meta):
+        """Actualiza newest/oldest (timestamp + claves con ese timestamp) con items nuevos"""
+        for item in items:
+            ts, k = _ts(item), clave_item(item)
+            if meta['newest_ts'] is None or ts > meta['newest_ts']:
+                meta['newest_ts'], meta['newest_keys'] = ts, [k]
+            elif ts == meta['newest_ts']:
+                meta['newest_keys'].append(k)
+            if meta['oldest_ts'] is None or ts < meta['oldest_ts']:
+                meta['oldest_ts'], meta['oldest_keys'] = ts, [k]
+            elif ts == meta['oldest_ts']:
+                meta['oldest_keys'].append(k)
+
+    def guardar(self, wallet, items, completo=False):
+        """Reemplaza lo guardado por items (descarga completa)"""
+        vistos = set()
+        unicos = []
+        for item in sorted(items, key=_ts, reverse=True):
+            k = clave_item(item)
+            if k not in vistos:
+                vistos.add(k)
+                unicos.append(item)
+        path = self._ruta_items(wallet)
+        tmp_path = f"{path}.tmp"
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            for item in unicos:
+                f.write(json.dumps(item) + "\n")
+        os.replace(tmp_path, path)
+
+        meta = {'wallet': wallet.lower(), 'newest_ts': None, 'newest_keys': [],
+                'oldest_ts': None, 'oldest_keys': [], 'completo': completo, 'n_items': len(unicos)}
+        self._extremos(unicos, meta)
+        self._escribir_meta(wallet, meta)
+        return meta
+
+    def _anteponer(self, wallet, nuevos):
+        """Escribe los items nuevos delante de los guardados (copia en streaming)"""
+        path = self._ruta_items(wallet)
+        tmp_path = f"{path}.tmp"
+        with open(tmp_path, 'w', encoding='utf-8') as out, open(path, 'r', encoding='utf-8') as viejo:
+            for item in sorted(nuevos, key=_ts, reverse=True):
+                out.write(json.dumps(item) + "\n")
+            for linea in viejo:
+                out.write(linea)
+        os.replace(tmp_path, path)
+
+    # --- Sincronización ---
+
+    def sincronizar(self, wallet, fetch_pagina, limite_inicial, backfill=False):
+        """
+        Sincroniza la wallet y devuelve las páginas pedidas, o None si no hay datos
+        locales (el llamador hace la descarga completa y llama a guardar()).
+
+        fetch_pagina(offset) → lista de items, o None si la petición falló.
+        - Páginas desde offset 0 hasta solapar con newest_ts (máx. limite_inicial items).
+        - backfill=True: además sigue desde el final de lo guardado hasta agotar el historial.
+        """
+        meta = self.cargar_meta(wallet)
+        if meta is None:
+            return None
+
+        paginas = 0
+        newest_ts = meta['newest_ts'] if meta['newest_ts'] is not None else -1
+        newest_keys = set(meta['newest_keys'])
+        nuevos = {}
+        offset = 0
+        solapado = False
+        while offset < limite_inicial:
+            pagina = fetch_pagina(offset)
+            paginas += 1
+            if pagina is None:
+                logger.warning(f"Sync incompleta de {wallet} (offset {offset}): se usa lo guardado")
+                return paginas
+            for item in pagina:
+                ts = _ts(item)
+                if ts < newest_ts:
+                    solapado = True
+                elif ts > newest_ts or clave_item(item) not in newest_keys:
+                    nuevos.setdefault(clave_item(item), item)
+            if solapado or len(pagina) < PAGE_SIZE:
+                solapado = True
+                break
+            offset += PAGE_SIZE
+
+        if not solapado:
+            # Más actividad nueva que limite_inicial: el hueco no se puede cubrir, se empieza de cero
+            logger.warning(f"{wallet}: >{limite_inicial} items nuevos sin solape, se descarta el histórico local")
+            meta = self.guardar(wallet, list(nuevos.values()), completo=False)
+        elif nuevos:
+            self._anteponer(wallet, nuevos.values())
+            meta['n_items'] += len(nuevos)
+            self._extremos(nuevos.values(), meta)
+
+        if backfill and not meta['completo']:
+            paginas += self._backfill(wallet, fetch_pagina, meta)
+
+        self._escribir_meta(wallet, meta)
+        logger.info(f"{wallet}: {len(nuevos)} items nuevos en {paginas} páginas ({meta['n_items']} guardados)")
+        return paginas
+
+    def _backfill(self, wallet, fetch_pagina, meta):
+        """Añade al final los items anteriores a oldest_ts hasta que la API se queda sin páginas"""
+        paginas = 0
+        offset = (meta['n_items'] // PAGE_SIZE) * PAGE_SIZE
+        with open(self._ruta_items(wallet), 'a', encoding='utf-8') as f:
+            while True:
+                pagina = fetch_pagina(offset)
+                paginas += 1
+                if pagina is None:
+                    break
+                oldest_ts = meta['oldest_ts'] if meta['oldest_ts'] is not None else float('inf')
+                oldest_keys = set(meta['oldest_keys'])
+                antiguos = [i for i in pagina
+                            if _ts(i) < oldest_ts
+                            or (_ts(i) == oldest_ts and clave_item(i) not in oldest_keys)]
+                antiguos.sort(key=_ts, reverse=True)
+                for item in antiguos:
+                    f.write(json.dumps(item) + "\n")
+                meta['n_items'] += len(antiguos)
+                self._extremos(antiguos, meta)
+                if len(pagina) < PAGE_SIZE:
+                    meta['completo'] = True
+                    break
+                offset += PAGE_SIZE
+        return paginas
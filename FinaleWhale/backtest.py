@@ -6,68 +6,319 @@ Compara ROI con/sin filtro para validar efectividad
 """
 
 import re
-import sys
+import os
+import glob
+import json
+import argparse
 from pathlib import Path
 from datetime import datetime
 from collections import defaultdict
+from concurrent.futures import ProcessPoolExecutor
+from whale_events import leer_eventos, archivos_eventos, es_archivo_eventos
+
+CACHE_DIRNAME = ".backtest_cache"
+PARSER_VERSION = 1    # Subir si cambia el formato parseado: invalida las caches
+
+SEPARADOR = "=" * 80
+COLUMNAS = ['categoria', 'valor', 'mercado', 'outcome', 'lado', 'precio', 'precio_pct',
+            'volumen', 'hora', 'nombre', 'wallet']
+
+# Una regex por línea del bloque (mismo formato que GoldWhaleDetector._log_ballena)
+_RE_HEADER = re.compile(r"[🐋🦈]+\s+(?P<categoria>[\w\s]+)\s+DETECTADA\s+[🐋🦈]+$")
+_SECUENCIA = [
+    ('valor', re.compile(r"💰\s+Valor:\s+\$(?P<valor>[\d,]+\.\d+)\s+USD$")),
+    ('mercado', re.compile(r"📊\s+Mercado:\s+(?P<mercado>.+)$")),
+    ('url', re.compile(r"🔗\s+URL:\s+(?P<url>.+)$")),
+    ('outcome', re.compile(r"🎯\s+Outcome:\s+(?P<outcome>.+)$")),
+    ('lado', re.compile(r"📈\s+Lado:\s+(?P<lado>\w+)$")),
+    ('precio', re.compile(r"💵\s+Precio:\s+(?P<precio>\d+\.\d+)\s+\((?P<precio_pct>[\d.]+)%\)")),
+]
+# Campos opcionales que siguen al precio hasta el separador de cierre
+_EXTRAS = [
+    ('volumen', re.compile(r"📦\s+Volumen:\s+\$(?P<volumen>[\d,]+\.\d+)")),
+    ('hora', re.compile(r"🕐\s+Hora:\s+(?P<hora>.+)$")),
+    ('nombre', re.compile(r"\s*Nombre:\s+(?P<nombre>.+)$")),
+    ('wallet', re.compile(r"\s*Wallet:\s+(?P<wallet>\S+)")),
+]
+
+
+def _es_separador(linea):
+    return linea.endswith(SEPARADOR)
+
+
+def _iterar_trades(lineas):
+    """
+    Parser en streaming (máquina de estados línea a línea) de los bloques
+    'BALLENA DETECTADA'. Memoria acotada: solo guarda el bloque en curso.
+
+    Yields:
+        dict por trade (las claves opcionales quedan en None/'' si no aparecen)
+    """
+    estado = 'inicio'   # inicio → header → sep → 0..5 (secuencia) → extras
+    trade = None
+    paso = 0
+
+    for linea in lineas:
+        linea = linea.rstrip('\r\n')
+
+        if estado == 'extras':
+            if _es_separador(linea):
+                yield trade
+                trade, estado = None, 'header'
+                continue
+            for campo, regex in _EXTRAS:
+                m = regex.match(linea)
+                if m:
+                    if trade[campo] in (None, ''):
+                        trade[campo] = m.group(campo).strip()
+                    break
+            continue
+
+        if estado == 'header':
+            m = _RE_HEADER.match(linea)
+            if m:
+                trade = {'categoria': m.group('categoria').strip()}
+                estado = 'sep'
+                continue
+        elif estado == 'sep':
+            if _es_separador(linea):
+                estado, paso = 'secuencia', 0
+                continue
+        elif estado == 'secuencia':
+            campo, regex = _SECUENCIA[paso]
+            m = regex.match(linea)
+            if m:
+                if campo == 'valor':
+                    trade['valor'] = float(m.group('valor').replace(',', ''))
+                elif campo == 'precio':
+                    trade['precio'] = float(m.group('precio'))
+                    trade['precio_pct'] = float(m.group('precio_pct'))
+                    trade.update({'volumen': None, 'hora': '', 'nombre': '', 'wallet': ''})
+                    estado = 'extras'
+                elif campo != 'url':
+                    trade[campo] = m.group(campo).strip()
+                paso += 1
+                continue
 
+        # Línea que no encaja: un separador puede abrir un bloque nuevo
+        trade = None
+        estado = 'header' if _es_separador(linea) else 'inicio'
+
+    if estado == 'extras':
+        yield trade
+
+
+def _trades_de_eventos(log_file):
+    """
+    Trades desde el log estructurado (whales_*.jsonl[.zst]) con las mismas columnas
+    que el .txt. Solo las ballenas que pasaron el TradeFilter, igual que en el .txt.
+    """
+    for ev in leer_eventos(log_file):
+        if not ev.get('filtro', {}).get('valido', True):
+            continue
+        price = float(ev.get('price', 0))
+        hora = ev.get('timestamp') or ''
+        if hora:
+            try:
+                hora = datetime.fromisoformat(hora).strftime('%Y-%m-%d %H:%M:%S')
+            except (TypeError, ValueError):
+                hora = str(hora)
+        yield {
+            'categoria': ev.get('categoria', ''),
+            'valor': round(float(ev.get('valor', 0)), 2),
+            'mercado': ev.get('market_title', ''),
+            'outcome': ev.get('outcome', ''),
+            'lado': 'COMPRA' if ev.get('side') == 'BUY' else 'VENTA',
+            'precio': round(price, 4),
+            'precio_pct': round(price * 100, 2),
+            'volumen': ev.get('volumen'),
+            'hora': hora,
+            'nombre': ev.get('display_name', ''),
+            'wallet': ev.get('wallet', ''),
+        }
 
-class BacktestEngine:
-    def __init__(self, log_file):
-        self.log_file = Path(log_file)
-        if not self.log_file.exists():
-            raise FileNotFoundError(f"Log no encontrado: {log_file}")
 
+def _normalizar(trade):
+    if trade['volumen'] is not None and not isinstance(trade['volumen'], float):
+        trade['volumen'] = float(str(trade['volumen']).replace(',', ''))
+    return trade
+
+
+def _ruta_cache(log_file):
+    return log_file.parent / CACHE_DIRNAME / f"{log_file.name}.json"
+
+
+def _clave_archivo(log_file):
+    stat = log_file.stat()
+    return {'size': stat.st_size, 'mtime_ns': stat.st_mtime_ns, 'version': PARSER_VERSION}
+
+
+def _leer_cache(log_file):
+    """Columnas cacheadas si el log no cambió (mismo tamaño y mtime); si no, None"""
+    ruta = _ruta_cache(log_file)
+    try:
+        with open(ruta, 'r', encoding='utf-8') as f:
+            data = json.load(f)
+        if data.get('clave') == _clave_archivo(log_file):
+            return data['columnas']
+    except (OSError, ValueError, KeyError):
+        pass
+    return None
+
+
+def _parsear_archivo(log_file, usar_cache=True):
+    """Parsea un log completo a formato columnar (y lo cachea). Ejecutable en otro proceso."""
+    log_file = Path(log_file)
+    clave = _clave_archivo(log_file)
+    columnas = {c: [] for c in COLUMNAS}
+
+    if es_archivo_eventos(log_file):
+        for trade in _trades_de_eventos(log_file):
+            for c in COLUMNAS:
+                columnas[c].append(trade[c])
+    else:
+        with open(log_file, 'r', encoding='utf-8') as f:
+            for trade in _iterar_trades(f):
+                _normalizar(trade)
+                for c in COLUMNAS:
+                    columnas[c].append(trade[c])
+
+    if usar_cache:
+        ruta = _ruta_cache(log_file)
+        try:
+            ruta.parent.mkdir(exist_ok=True)
+            tmp = ruta.with_suffix('.tmp')
+            with open(tmp, 'w', encoding='utf-8') as f:
+                json.dump({'clave': clave, 'columnas': columnas}, f, ensure_ascii=False)
+            os.replace(tmp, ruta)
+        except OSError as e:
+            print(f"⚠️ No se pudo guardar cache de {log_file.name}: {e}")
+
+    return columnas
+
+
+def resolver_logs(rutas):
+    """
+    Expande archivos, directorios (whales_*.txt y eventos whales_*.jsonl[.zst])
+    y patrones glob a una lista ordenada de logs
+    """
+    logs = []
+    for ruta in rutas:
+        ruta = str(ruta)
+        p = Path(ruta)
+        if p.is_dir():
+            logs.extend(p.glob("whales_*.txt"))
+            logs.extend(archivos_eventos(p))
+        elif glob.has_magic(ruta):
+            logs.extend(Path(m) for m in glob.glob(ruta))
+        else:
+            logs.append(p)
+    # Sin duplicados, en orden cronológico (el nombre lleva timestamp)
+    return sorted(set(logs), key=lambda p: (p.name, str(p)))
+
+
+class BacktestEngine:
+    def __init__(self, log_file, workers=None, usar_cache=True, consulta=None):
+        """
+        Args:
+            log_file: log, directorio, patrón glob o lista de ellos; con `consulta`,
+                      directorio del archivo columnar (whale_archive)
+            consulta: filtros de whale_archive.consultar (categoria, signal_id, tier,
+                      precio_min, precio_max, desde, hasta). None = parsear logs.
+        """
+        self.consulta = consulta
+        self.workers = workers
+        self.usar_cache = usar_cache
         self.trades = []
         self.filtered_trades = []
 
+        if consulta is not None:
+            self.log_file = Path(log_file)
+            self.log_files = []
+            return
+
+        rutas = log_file if isinstance(log_file, (list, tuple)) else [log_file]
+        self.log_files = resolver_logs(rutas)
+        if not self.log_files:
+            raise FileNotFoundError(f"Log no encontrado: {log_file}")
+        for p in self.log_files:
+            if not p.exists():
+                raise FileNotFoundError(f"Log no encontrado: {p}")
+
+        # Compatibilidad: log_file apunta al primer log (nombre del reporte)
+        self.log_file = self.log_files[0]
+
+    def _cargar_archivo_columnar(self):
+        """Trades desde el archivo Parquet (solo lee las particiones/row groups que pasan el filtro)"""
+        from whale_archive import consultar, EVENTOS
+
+        tabla = consultar(EVENTOS, self.log_file, solo_validos=True, **self.consulta)
+        for fila in tabla.to_pylist():
+            price = fila['price'] or 0.0
+            self.trades.append({
+                'categoria': fila['categoria_ballena'] or '',
+                'valor': fila['valor'] or 0.0,
+                'mercado': fila['market_title'] or '',
+                'outcome': fila['outcome'] or '',
+                'lado': 'COMPRA' if fila['side'] == 'BUY' else 'VENTA',
+                'precio': price,
+                'precio_pct': round(price * 100, 2),
+                'volumen': fila['volumen'],
+                'hora': fila['timestamp'] or '',
+                'nombre': fila['display_name'] or '',
+                'wallet': fila['wallet'] or '',
+            })
+        filtros = ", ".join(f"{k}={v}" for k, v in self.consulta.items() if v is not None) or "sin filtros"
+        print(f"📂 Archivo columnar ({filtros}): {len(self.trades)} trades de ballenas encontrados")
+
     def parse_log(self):
-        """Parsea el log de ballenas y extrae trades"""
-        with open(self.log_file, 'r', encoding='utf-8') as f:
-            content = f.read()
-
-        # Pattern para extraer trades del log
-        pattern = r"""
-            ={80}\n
-            (?P<emoji>[🐋🦈]+)\s+(?P<categoria>[\w\s]+)\s+DETECTADA\s+[🐋🦈]+\n
-            ={80}\n
-            💰\s+Valor:\s+\$(?P<valor>[\d,]+\.\d+)\s+USD\n
-            📊\s+Mercado:\s+(?P<mercado>.+?)\n
-            🔗\s+URL:\s+(?P<url>.+?)\n
-            🎯\s+Outcome:\s+(?P<outcome>.+?)\n
-            📈\s+Lado:\s+(?P<lado>\w+)\n
-            💵\s+Precio:\s+(?P<precio>\d+\.\d+)\s+\((?P<precio_pct>[\d.]+)%\)
-        """
+        """Parsea los logs de ballenas (cache por archivo + procesos en paralelo) y extrae trades"""
+        if self.consulta is not None:
+            self._cargar_archivo_columnar()
+            return
+
+        resultados = {}
+        pendientes = []
+        for log in self.log_files:
+            columnas = _leer_cache(log) if self.usar_cache else None
+            if columnas is not None:
+                resultados[log] = columnas
+            else:
+                pendientes.append(log)
 
-        matches = re.finditer(pattern, content, re.VERBOSE | re.MULTILINE)
+        if len(pendientes) > 1 and self.workers != 1:
+            with ProcessPoolExecutor(max_workers=self.workers) as pool:
+                parsed = pool.map(_parsear_archivo, pendientes,
+                                  [self.usar_cache] * len(pendientes))
+                resultados.update(zip(pendientes, parsed))
+        else:
+            for log in pendientes:
+                resultados[log] = _parsear_archivo(log, self.usar_cache)
 
-        for match in matches:
-            trade = {
-                'categoria': match.group('categoria').strip(),
-                'valor': float(match.group('valor').replace(',', '')),
-                'mercado': match.group('mercado').strip(),
-                'outcome': match.group('outcome').strip(),
-                'lado': match.group('lado'),
-                'precio': float(match.group('precio')),
-                'precio_pct': float(match.group('precio_pct'))
-            }
-            self.trades.append(trade)
+        for log in self.log_files:
+            columnas = resultados[log]
+            nombres = list(columnas.keys())
+            for fila in zip(*columnas.values()):
+                self.trades.append(dict(zip(nombres, fila)))
 
-        print(f"📂 Log parseado: {len(self.trades)} trades de ballenas encontrados")
+        if len(self.log_files) == 1:
+            print(f"📂 Log parseado: {len(self.trades)} trades de ballenas encontrados")
+        else:
+            print(f"📂 {len(self.log_files)} logs parseados ({len(pendientes)} sin cache): "
+                  f"{len(self.trades)} trades de ballenas encontrados")
 
     def apply_filter(self):
         """Aplica el filtro de calidad a los trades"""
         for trade in self.trades:
             price = trade['precio']
 
-            # Mismo criterio que TradeFilter.is_worth_copying()
+            # Mismo criterio que TradeFilter.is_worth_copying() (v3.0)
             # Filtro 1: Precio fuera de rango
-            if price < 0.25 or price > 0.70:
+            if price < 0.15 or price > 0.82:
                 continue
 
-            # Filtro 3: Retorno potencial < 40%
-            potential_return_pct = ((1 / price) - 1) * 100 if price > 0 else 0
-            if potential_return_pct < 40:
+            # Filtro 2: Mercado sin liquidez (solo si el log registró el volumen)
+            if trade['volumen'] is not None and trade['volumen'] < 25_000:
                 continue
 
             # Si pasa el filtro, agregarlo
@@ -92,20 +343,20 @@ class BacktestEngine:
 
         # Distribución de precios
         price_ranges = {
-            '0.25-0.40': 0,
-            '0.40-0.55': 0,
-            '0.55-0.70': 0,
+            '0.15-0.40': 0,
+            '0.40-0.60': 0,
+            '0.60-0.82': 0,
             'Fuera de rango': 0
         }
 
         for t in trades_list:
             p = t['precio']
-            if 0.25 <= p < 0.40:
-                price_ranges['0.25-0.40'] += 1
-            elif 0.40 <= p < 0.55:
-                price_ranges['0.40-0.55'] += 1
-            elif 0.55 <= p <= 0.70:
-                price_ranges['0.55-0.70'] += 1
+            if 0.15 <= p < 0.40:
+                price_ranges['0.15-0.40'] += 1
+            elif 0.40 <= p < 0.60:
+                price_ranges['0.40-0.60'] += 1
+            elif 0.60 <= p <= 0.82:
+                price_ranges['0.60-0.82'] += 1
             else:
                 price_ranges['Fuera de rango'] += 1
 
@@ -125,6 +376,13 @@ class BacktestEngine:
             'price_ranges': price_ranges
         }
 
+    def _descripcion_logs(self):
+        if self.consulta is not None:
+            return f"archivo columnar {self.log_file}"
+        if len(self.log_files) == 1:
+            return self.log_file.name
+        return f"{len(self.log_files)} logs ({self.log_files[0].name} … {self.log_files[-1].name})"
+
     def generate_report(self):
         """Genera reporte comparativo"""
         all_metrics = self.calculate_metrics(self.trades, "SIN FILTRO")
@@ -140,7 +398,7 @@ class BacktestEngine:
 {sep}
 🔬 BACKTEST DEL FILTRO DE CALIDAD
 {sep}
-📂 Archivo analizado: {self.log_file.name}
+📂 Archivo analizado: {self._descripcion_logs()}
 📅 Fecha de análisis: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}
 {sep}
 
@@ -211,7 +469,12 @@ Retorno potencial (%)   {all_metrics['avg_potential_return']:>10.1f}    |    {fi
         print(report)
 
         # Guardar reporte
-        output_file = self.log_file.parent / f"backtest_{self.log_file.stem}.txt"
+        if self.consulta is not None:
+            output_file = self.log_file.parent / "backtest_archivo.txt"
+        elif len(self.log_files) == 1:
+            output_file = self.log_file.parent / f"backtest_{self.log_file.stem}.txt"
+        else:
+            output_file = self.log_file.parent / f"backtest_{self.log_files[0].stem}_a_{self.log_files[-1].stem}.txt"
         with open(output_file, 'w', encoding='utf-8') as f:
             f.write(report)
 
@@ -232,14 +495,40 @@ def main():
     print("\n🔬 BACKTEST DEL FILTRO DE CALIDAD DE TRADES")
     print("Analiza logs históricos para validar efectividad del filtro\n")
 
-    if len(sys.argv) > 1:
-        log_file = sys.argv[1]
+    parser = argparse.ArgumentParser(description="Backtest del filtro de calidad sobre logs de ballenas")
+    parser.add_argument('logs', nargs='*',
+                        help="Logs (.txt o eventos .jsonl[.zst]), directorios o patrones glob. "
+                             "Por defecto: el log más reciente")
+    parser.add_argument('--workers', type=int, default=None, help="Procesos para parsear en paralelo")
+    parser.add_argument('--no-cache', action='store_true', help="Ignorar la cache de logs parseados")
+    parser.add_argument('--archive', metavar='DIR', nargs='?', const='trades_live/archive',
+                        help="Leer del archivo columnar (whale_archive.py) en lugar de los logs")
+    parser.add_argument('--categoria', help="Filtro de categoría (con --archive)")
+    parser.add_argument('--signal', dest='signal_id', help="Filtro de signal_id (con --archive)")
+    parser.add_argument('--tier', help="Filtro de tier (con --archive)")
+    parser.add_argument('--precio-min', type=float, help="Precio mínimo (con --archive)")
+    parser.add_argument('--precio-max', type=float, help="Precio máximo (con --archive)")
+    parser.add_argument('--desde', help="Día inicial YYYY-MM-DD (con --archive)")
+    parser.add_argument('--hasta', help="Día final YYYY-MM-DD (con --archive)")
+    args = parser.parse_args()
+
+    if args.archive:
+        consulta = {k: getattr(args, k) for k in
+                    ('categoria', 'signal_id', 'tier', 'precio_min', 'precio_max', 'desde', 'hasta')}
+        try:
+            BacktestEngine(args.archive, consulta=consulta).run()
+        except ImportError as e:
+            print(f"❌ {e}")
+        return
+
+    if args.logs:
+        log_file = args.logs
     else:
         # Buscar el log más reciente en trades_live/
         trades_live = Path("trades_live")
         if not trades_live.exists():
             print("❌ Directorio trades_live/ no encontrado")
-            print("Uso: python backtest.py [ruta_al_log.txt]")
+            print("Uso: python backtest.py [ruta_al_log.txt | directorio | 'patrón*.txt' ...]")
             return
 
         logs = list(trades_live.glob("whales_*.txt"))
@@ -252,7 +541,7 @@ def main():
         print(f"📂 Usando log más reciente: {log_file.name}")
 
     try:
-        backtester = BacktestEngine(log_file)
+        backtester = BacktestEngine(log_file, workers=args.workers, usar_cache=not args.no_cache)
         backtester.run()
     except FileNotFoundError as e:
         print(f"❌ Error: {e}")
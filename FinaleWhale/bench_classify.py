@@ -0,0 +1,390 @@
+#!/usr/bin/env python3
+"""
+⏱️ BENCHMARK DEL HOT PATH DE CLASIFICACIÓN
+
+Genera un flujo sintético de trades a partir de los logs grabados (trades_live,
+mismos formatos que replay.py) y mide trades/s y latencia p50/p99 de:
+
+- _detect_category, classify, _resolve_conflicts
+- ConsensusTracker (add + get_signal), CoordinationDetector (add_trade + detect_coordination)
+- TradeFilter.is_worth_copying (sesión HTTP simulada, sin red)
+- WhaleScorer (scoring completo de un perfil)
+
+Los resultados se comparan con un baseline JSON: una caída de la mediana de
+throughput mayor que la tolerancia del caso marca regresión (exit code 1). La
+tolerancia de cada caso es --tolerancia o, si es mayor, RUIDO_MULT veces el
+ruido medido entre repeticiones (el del baseline o el de la corrida actual),
+como mucho TOLERANCIA_MAX. Solo se compara con un baseline medido sobre la
+misma entrada (n, seed y logs grabados); si no, exit code 2.
+
+Uso:
+    python bench_classify.py                          # compara con bench_baseline.json
+    python bench_classify.py --guardar                # (re)escribe el baseline
+    python bench_classify.py trades_live --n 50000 --solo classify,detect_category
+"""
+
+import sys
+import json
+import math
+import time
+import random
+import argparse
+import platform
+from pathlib import Path
+from datetime import datetime
+
+import gold_all_claude as gold
+from replay import cargar_trades
+from backtest import resolver_logs
+from taxonomy import limpiar_caches
+from whale_scorer import WhaleScorer
+
+BASELINE_PATH = Path(__file__).with_name("bench_baseline.json")
+N_TRADES = 20000
+CALENTAMIENTO = 2
+REPETICIONES = 11
+TOLERANCIA = 0.15   # Caída de throughput tolerada frente al baseline (mínimo por caso)
+RUIDO_MULT = 3      # Tolerancia por caso: RUIDO_MULT × IQR relativo de ops/s
+TOLERANCIA_MAX = 0.35   # Tope del término de ruido: una caída a la mitad siempre es regresión
+
+TIERS = ["", "", "💎 DIAMOND", "🥇 GOLD", "🥈 SILVER", "🥉 BRONZE", "📊 STANDARD", "⚠️ RISKY", "💀 HIGH RISK"]
+SENALES = {
+    "S1": ("COUNTER", "HIGH", 60.0), "S1B": ("COUNTER", "MEDIUM", 58.0),
+    "S2": ("FOLLOW", "MEDIUM", 72.0), "S2B": ("FOLLOW", "MEDIUM", 66.0),
+    "S3": ("FOLLOW", "MEDIUM", 65.0), "S4": ("FOLLOW", "LOW", 60.0), "S5": ("FOLLOW", "MEDIUM", 64.0),
+}
+
+
+# --- Flujo sintético ---
+
+def generar_flujo(base, n=N_TRADES, seed=42):
+    """
+    Remuestrea trades grabados: mismo reparto de mercados/traders, con precio y
+    valor perturbados, tier aleatorio y timestamps a ~10 trades/s.
+    """
+    rng = random.Random(seed)
+    wallets = [t['wallet'] or f"0x{rng.getrandbits(160):040x}" for t in base]
+    flujo = []
+    ts = 1_700_000_000.0
+    for _ in range(n):
+        t = base[rng.randrange(len(base))]
+        ts += rng.expovariate(10.0)
+        price = min(0.99, max(0.01, t['price'] + rng.uniform(-0.03, 0.03)))
+        flujo.append({
+            'ts': ts,
+            'market_title': t['market_title'],
+            'condition_id': t['condition_id'] or t['market_title'],
+            'side': t['side'] or 'BUY',
+            'price': round(price, 3),
+            'valor': max(100.0, t['valor'] * rng.lognormvariate(0, 0.3)),
+            'volumen': t['volumen'] if t['volumen'] is not None else rng.choice((10_000, 50_000, 500_000)),
+            'wallet': rng.choice(wallets),
+            'display_name': t['display_name'],
+            'tier': t['tier'] or rng.choice(TIERS),
+            'es_nicho': t['es_nicho'] or rng.random() < 0.05,
+            'edge_pct': t['edge_pct'] or rng.choice((0.0, 0.0, 0.0, rng.uniform(-8, 8))),
+        })
+    return flujo
+
+
+def perfiles_scorer(n, seed=42):
+    """Datos scrapeados sintéticos con la forma que consume WhaleScorer"""
+    rng = random.Random(seed)
+    perfiles = []
+    for _ in range(n):
+        gains = rng.lognormvariate(10, 1.5)
+        losses = gains * rng.uniform(0.3, 1.4)
+        trades = int(rng.lognormvariate(5, 1.5))
+        perfiles.append({
+            'pnl': gains - losses, 'total_gains': gains, 'total_losses': losses,
+            'profit_factor': gains / losses if losses else 0, 'win_rate': rng.uniform(30, 80),
+            'avg_win': rng.uniform(10, 2000), 'avg_loss': rng.uniform(10, 2000),
+            'biggest_wins': [{'amount': a} for a in
+                             sorted((rng.uniform(100, gains / 3) for _ in range(rng.randint(0, 5))), reverse=True)],
+            'max_loss': rng.uniform(0, losses / 2),
+            'categories': rng.sample(['Sports', 'Politics', 'Crypto', 'Pop'], rng.randint(1, 4)),
+            'badges': [], 'rank': rng.randint(1, 200_000), 'total_trades': trades,
+            'markets_traded': max(1, trades // rng.randint(1, 80)),
+        })
+    return perfiles
+
+
+class _Perfil(WhaleScorer):
+    def __init__(self, datos):
+        self.scraped_data = datos
+        self.scores = {}
+        self.red_flags = []
+        self.strengths = []
+
+    def puntuar(self):
+        self.scores['profitability'] = self.calculate_profitability_score()
+        self.scores['consistency'] = self.calculate_consistency_score()
+        self.scores['risk_management'] = self.calculate_risk_management_score()
+        self.scores['experience'] = self.calculate_experience_score()
+        self.calculate_final_score()
+        return self.generate_recommendation()
+
+
+class _Respuesta:
+    def __init__(self, datos):
+        self._datos = datos
+
+    def json(self):
+        return self._datos
+
+
+class _SesionSimulada:
+    """Sesión sin red para TradeFilter: responde a Gamma con el volumen del trade"""
+    def __init__(self, volumenes):
+        self.volumenes = volumenes
+
+    def get(self, url, timeout=None, params=None):
+        return _Respuesta([{'volume': self.volumenes.get(params.get('slug'), 0)}])
+
+
+# --- Casos ---
+# Cada caso devuelve (preparar, operacion, items): preparar() (opcional) se llama
+# antes de cada repetición y devuelve el estado; operacion(estado, item) es lo que
+# se cronometra, una vez por item.
+
+def _caso_detect_category(flujo):
+    def preparar():
+        limpiar_caches()
+    return preparar, lambda _, t: gold._detect_category(t['market_title']), flujo
+
+
+def _caso_classify(flujo):
+    def op(_, t):
+        return gold.classify(
+            market_title=t['market_title'], tier=t['tier'], poly_price=t['price'],
+            is_nicho=t['es_nicho'], valor_usd=t['valor'], side=t['side'],
+            display_name=t['display_name'], edge_pct=t['edge_pct'],
+        )
+    return limpiar_caches, op, flujo
+
+
+def _caso_resolve_conflicts(flujo):
+    rng = random.Random(7)
+    ids = list(SENALES)
+    entradas = []
+    for t in flujo:
+        senales = [{"id": i, "action": SENALES[i][0], "confidence": SENALES[i][1],
+                    "win_rate": SENALES[i][2], "reasoning": f"{i} sintética"}
+                   for i in rng.sample(ids, rng.randint(2, 3))]
+        entradas.append((senales, t['tier'].upper(), t['price']))
+
+    def op(_, e):
+        return gold._resolve_conflicts(e[0], {"action": "IGNORE", "signal_id": "NONE", "confidence": "—",
+                                              "win_rate_hist": 0.0, "reasoning": [], "warnings": []},
+                                       e[1], e[2])
+    return None, op, entradas
+
+
+def _caso_consensus(flujo):
+    def preparar():
+        reloj = [0.0]
+        return reloj, gold.ConsensusTracker(window_minutes=gold.SIGNAL_PARAMS['consenso_ventana_min'],
+                                            clock=lambda: reloj[0])
+
+    def op(estado, t):
+        reloj, tracker = estado
+        reloj[0] = t['ts']
+        tracker.add(t['condition_id'], t['side'], t['valor'], t['wallet'], t['price'], t['tier'], t['display_name'])
+        return tracker.get_signal(t['condition_id'])
+    return preparar, op, flujo
+
+
+def _caso_coordination(flujo):
+    def preparar():
+        reloj = [0.0]
+        return reloj, gold.CoordinationDetector(coordination_window=300, clock=lambda: reloj[0])
+
+    def op(estado, t):
+        reloj, detector = estado
+        reloj[0] = t['ts']
+        detector.add_trade(t['condition_id'], t['wallet'], t['side'], t['valor'])
+        return detector.detect_coordination(t['condition_id'], t['wallet'], t['side'])
+    return preparar, op, flujo
+
+
+def _caso_trade_filter(flujo):
+    trades = [{'price': t['price'], 'side': t['side'], 'slug': t['condition_id']} for t in flujo]
+    volumenes = {t['condition_id']: t['volumen'] for t in flujo}
+
+    def preparar():
+        return gold.TradeFilter(_SesionSimulada(volumenes))
+    return preparar, lambda f, tr: f.is_worth_copying(tr, 0), trades
+
+
+def _caso_whale_scorer(flujo):
+    perfiles = perfiles_scorer(max(1000, len(flujo) // 10))
+    return None, lambda _, d: _Perfil(d).puntuar(), perfiles
+
+
+CASOS = {
+    'detect_category': _caso_detect_category,
+    'classify': _caso_classify,
+    'resolve_conflicts': _caso_resolve_conflicts,
+    'consensus': _caso_consensus,
+    'coordination': _caso_coordination,
+    'trade_filter': _caso_trade_filter,
+    'whale_scorer': _caso_whale_scorer,
+}
+
+
+# --- Medición ---
+
+def _percentil(ordenados, q):
+    return ordenados[min(len(ordenados) - 1, int(math.ceil(q * len(ordenados))) - 1)]
+
+
+def _mediana(ordenados):
+    return ordenados[len(ordenados) // 2]
+
+
+def medir(nombre, flujo, repeticiones=REPETICIONES):
+    """
+    Mediana de throughput y de p50/p99 (µs) sobre varias repeticiones, tras
+    CALENTAMIENTO corridas descartadas. ruido = IQR de ops/s / mediana.
+    """
+    preparar, op, items = CASOS[nombre](flujo)
+    reloj = time.perf_counter_ns
+    corridas = []
+    for r in range(repeticiones + CALENTAMIENTO):
+        estado = preparar() if preparar else None
+        lat = [0] * len(items)
+        inicio = reloj()
+        for i, item in enumerate(items):
+            t0 = reloj()
+            op(estado, item)
+            lat[i] = reloj() - t0
+        total = reloj() - inicio
+        if r >= CALENTAMIENTO:
+            lat.sort()
+            corridas.append((len(items) / (total / 1e9), _percentil(lat, 0.50) / 1e3, _percentil(lat, 0.99) / 1e3))
+    ops = sorted(c[0] for c in corridas)
+    ops_s = _mediana(ops)
+    iqr = _percentil(ops, 0.75) - _percentil(ops, 0.25)
+    return {
+        'n': len(items),
+        'ops_s': ops_s,
+        'ruido': iqr / ops_s if ops_s else 0.0,
+        'p50_us': _mediana(sorted(c[1] for c in corridas)),
+        'p99_us': _mediana(sorted(c[2] for c in corridas)),
+    }
+
+
+def describir_entrada(rutas, base, n, seed):
+    """Lo que determina el flujo sintético: sin esto igual, los ops/s no son comparables"""
+    return {
+        'n': n,
+        'seed': seed,
+        'logs': sorted(p.name for p in resolver_logs(rutas)),
+        'trades_grabados': len(base),
+    }
+
+
+def entrada_distinta(baseline, entrada):
+    """Claves de la entrada que no coinciden con las del baseline"""
+    return [k for k, v in entrada.items() if baseline.get(k) != v]
+
+
+def comparar(resultados, baseline, tolerancia=TOLERANCIA):
+    """Añade delta y tolerancia vs baseline; devuelve la lista de casos en regresión"""
+    regresiones = []
+    for nombre, r in resultados.items():
+        b = baseline.get('casos', {}).get(nombre)
+        if not b:
+            continue
+        r['delta_ops'] = (r['ops_s'] / b['ops_s'] - 1) if b['ops_s'] else 0.0
+        r['delta_p99'] = (r['p99_us'] / b['p99_us'] - 1) if b['p99_us'] else 0.0
+        ruido = RUIDO_MULT * max(r['ruido'], b.get('ruido', 0.0))
+        r['tolerancia'] = max(tolerancia, min(TOLERANCIA_MAX, ruido))
+        if r['delta_ops'] < -r['tolerancia']:
+            regresiones.append(nombre)
+    return regresiones
+
+
+def tabla(resultados):
+    sep = "=" * 98
+    lineas = [sep, "⏱️ BENCHMARK HOT PATH", sep,
+              f"{'Caso':<18} | {'N':>7} | {'ops/s':>11} | {'p50 µs':>8} | {'p99 µs':>8} | {'Δ ops/s':>8} | {'Tol.':>6} | {'Δ p99':>7}",
+              "-" * 98]
+    for nombre, r in resultados.items():
+        d_ops = f"{r['delta_ops']:+.1%}" if 'delta_ops' in r else "—"
+        d_p99 = f"{r['delta_p99']:+.1%}" if 'delta_p99' in r else "—"
+        tol = f"{r['tolerancia']:.0%}" if 'tolerancia' in r else "—"
+        lineas.append(f"{nombre:<18} | {r['n']:>7,} | {r['ops_s']:>11,.0f} | {r['p50_us']:>8.1f} | "
+                      f"{r['p99_us']:>8.1f} | {d_ops:>8} | {tol:>6} | {d_p99:>7}")
+    lineas.append(sep)
+    return "\n".join(lineas)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark del hot path de clasificación")
+    parser.add_argument('logs', nargs='*', help="Logs .txt, eventos .jsonl o directorios (default: trades_live)")
+    parser.add_argument('--n', type=int, default=N_TRADES, help="Trades del flujo sintético")
+    parser.add_argument('--seed', type=int, default=42)
+    parser.add_argument('--repeticiones', type=int, default=REPETICIONES)
+    parser.add_argument('--solo', help=f"Casos separados por comas ({', '.join(CASOS)})")
+    parser.add_argument('--baseline', default=str(BASELINE_PATH), help="Baseline JSON con el que comparar")
+    parser.add_argument('--guardar', action='store_true', help="Guardar los resultados como nuevo baseline")
+    parser.add_argument('--tolerancia', type=float, default=TOLERANCIA,
+                        help="Caída mínima de ops/s tolerada por caso antes de marcar regresión (0.15 = 15%%)")
+    args = parser.parse_args()
+
+    casos = args.solo.split(',') if args.solo else list(CASOS)
+    desconocidos = [c for c in casos if c not in CASOS]
+    if desconocidos:
+        parser.error(f"Casos desconocidos: {', '.join(desconocidos)}")
+
+    rutas = args.logs or ['trades_live']
+    base = cargar_trades(rutas)
+    if not base:
+        print("❌ No se encontraron trades grabados para generar el flujo")
+        sys.exit(1)
+    entrada = describir_entrada(rutas, base, args.n, args.seed)
+
+    baseline_path = Path(args.baseline)
+    baseline = None
+    if baseline_path.exists() and not args.guardar:
+        with open(baseline_path, 'r', encoding='utf-8') as f:
+            baseline = json.load(f)
+        distintas = entrada_distinta(baseline, entrada)
+        if distintas:
+            print(f"❌ El baseline {baseline_path} se midió con otra entrada ({', '.join(distintas)}): "
+                  f"repite con los mismos parámetros o regenera con --guardar")
+            sys.exit(2)
+    flujo = generar_flujo(base, args.n, args.seed)
+    print(f"⏱️ Flujo sintético: {len(flujo):,} trades (de {len(base):,} grabados, "
+          f"{len({t['market_title'] for t in flujo}):,} mercados)")
+
+    resultados = {}
+    for nombre in casos:
+        resultados[nombre] = medir(nombre, flujo, args.repeticiones)
+
+    regresiones = comparar(resultados, baseline, args.tolerancia) if baseline else []
+    print(tabla(resultados))
+
+    if args.guardar:
+        baseline = {
+            'creado': datetime.now().isoformat(timespec='seconds'),
+            'python': platform.python_version(),
+            'maquina': platform.platform(),
+            **entrada,
+            'casos': resultados,
+        }
+        tmp_path = f"{baseline_path}.tmp"
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump(baseline, f, indent=2, ensure_ascii=False)
+        Path(tmp_path).replace(baseline_path)
+        print(f"💾 Baseline guardado en {baseline_path}")
+    elif regresiones:
+        print(f"❌ Regresión (más caída de ops/s que la tolerancia del caso): {', '.join(regresiones)}")
+        sys.exit(1)
+    elif not baseline_path.exists():
+        print(f"ℹ️ Sin baseline en {baseline_path}: ejecuta con --guardar para crearlo")
+
+
+if __name__ == "__main__":
+    main()
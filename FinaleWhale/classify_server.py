@@ -0,0 +1,276 @@
+#!/usr/bin/env python3
+"""
+🧠 SERVIDOR DE CLASIFICACIÓN (gold_all_claude.py --serve)
+
+Mantiene classify() cargado y con las caches calientes (regex de taxonomy,
+lru de categorías) para que otras herramientas no paguen el arranque del
+intérprete en cada --single.
+
+Dos transportes, ambos JSON y con el mismo formato de petición:
+
+    HTTP        POST /classify   cuerpo = objeto (una) o lista (lote)
+                GET  /health     contadores del servidor
+                GET  /metrics    formato Prometheus (whale_metrics.py)
+    Unix socket NDJSON: una petición (objeto o lista) por línea, una respuesta por línea
+
+Cada petición usa los nombres de argumento de classify():
+
+    {"market_title": "Lakers vs. Celtics", "tier": "🥈 SILVER", "poly_price": 0.55,
+     "valor_usd": 5000, "side": "BUY", "display_name": "x", "is_nicho": false,
+     "edge_pct": 0.0, "opposite_tier": "", "explain": true}
+
+(también valen los alias de --single: price, valor, name, nicho, edge).
+La respuesta es el dict de classify(); en un lote, una entrada por petición
+y {"error": "..."} en las que no se pudieron interpretar.
+
+Uso:
+    python gold_all_claude.py --serve                       # 127.0.0.1:8790
+    python gold_all_claude.py --serve 0.0.0.0:8790
+    python gold_all_claude.py --serve unix:/tmp/gold.sock
+    curl -s localhost:8790/classify -d '{"market_title":"Lakers vs. Celtics","tier":"","poly_price":0.55}'
+"""
+
+import os
+import sys
+import json
+import time
+import signal
+import logging
+
+from whale_metrics import RegistroMetricas
+from taxonomy import compilar_todas
+
+logger = logging.getLogger(__name__)
+
+DIRECCION_DEFECTO = os.getenv('WHALE_CLASSIFY_ADDR', '127.0.0.1:8790')
+MAX_CUERPO = 32 * 1024 * 1024   # 32 MB por petición HTTP / línea NDJSON
+
+# Argumentos de classify() aceptados y su conversión
+CAMPOS = {
+    'market_title': str,
+    'tier': str,
+    'poly_price': float,
+    'is_nicho': bool,
+    'valor_usd': float,
+    'side': str,
+    'display_name': str,
+    'edge_pct': float,
+    'opposite_tier': str,
+    'explain': bool,
+}
+OBLIGATORIOS = ('market_title', 'poly_price')
+ALIAS = {'price': 'poly_price', 'valor': 'valor_usd', 'name': 'display_name',
+         'nicho': 'is_nicho', 'edge': 'edge_pct', 'title': 'market_title'}
+
+# Títulos para calentar classify antes de aceptar conexiones (las regex de
+# taxonomy se compilan aparte con compilar_todas)
+_CALENTAMIENTO = ("Lakers vs. Celtics", "Will Bitcoin go Up or Down today?",
+                  "Arsenal vs. Chelsea", "Counter-Strike: NAVI vs. FaZe")
+
+
+def parsear_direccion(direccion):
+    """'unix:/ruta', '/ruta.sock', 'host:puerto' o 'puerto' → ('unix', ruta) | ('tcp', (host, puerto))"""
+    if direccion.startswith('unix:'):
+        return 'unix', direccion[5:]
+    if '/' in direccion or direccion.endswith('.sock'):
+        return 'unix', direccion
+    host, _, puerto = direccion.rpartition(':')
+    return 'tcp', (host or '127.0.0.1', int(puerto))
+
+
+def _a_kwargs(peticion):
+    if not isinstance(peticion, dict):
+        raise ValueError("cada petición debe ser un objeto JSON")
+    kwargs = {}
+    for clave, valor in peticion.items():
+        clave = ALIAS.get(clave, clave)
+        conversion = CAMPOS.get(clave)
+        if conversion is None:
+            raise ValueError(f"campo desconocido: {clave}")
+        if conversion is bool and isinstance(valor, str):
+            valor = valor.strip().lower() in ('true', '1', 'yes', 's')
+        kwargs[clave] = conversion(valor) if valor is not None else conversion()
+    faltan = [c for c in OBLIGATORIOS if c not in kwargs]
+    if faltan:
+        raise ValueError(f"faltan campos: {', '.join(faltan)}")
+    kwargs.setdefault('tier', '')
+    return kwargs
+
+
+class ServicioClasificacion:
+    """Traduce peticiones JSON a llamadas a classify() y lleva las métricas del servidor"""
+
+    def __init__(self, clasificar):
+        self.clasificar = clasificar
+        self.inicio = time.time()
+        self.metricas = RegistroMetricas(prefijo='whale_classify_')
+        self._peticiones = self.metricas.contador('requests_total', 'Peticiones por transporte', ('transporte',))
+        self._clasificaciones = self.metricas.contador('classifications_total', 'Clasificaciones servidas')
+        self._errores = self.metricas.contador('errors_total', 'Peticiones que no se pudieron interpretar')
+        self._latencia = self.metricas.histograma('request_seconds', 'Tiempo de atención por petición (lote completo)')
+        self.metricas.gauge('uptime_seconds', lambda: time.time() - self.inicio, 'Tiempo en marcha')
+        compilar_todas()
+        for titulo in _CALENTAMIENTO:
+            clasificar(market_title=titulo, tier='', poly_price=0.55)
+
+    def uno(self, peticion):
+        try:
+            kwargs = _a_kwargs(peticion)
+            resultado = self.clasificar(**kwargs)
+        except (ValueError, TypeError) as e:
+            self._errores.inc()
+            return {'error': str(e)}
+        except Exception as e:
+            # Un fallo de classify solo invalida su elemento, no el lote ni la conexión
+            logger.exception("Error clasificando una petición")
+            self._errores.inc()
+            return {'error': f"error interno: {e}"}
+        self._clasificaciones.inc()
+        return resultado
+
+    def procesar(self, cuerpo, transporte):
+        """Cuerpo JSON ya decodificado (objeto o lista) → respuesta serializable"""
+        inicio = time.perf_counter()
+        self._peticiones.inc(etiquetas=(transporte,))
+        if isinstance(cuerpo, list):
+            respuesta = [self.uno(p) for p in cuerpo]
+        else:
+            respuesta = self.uno(cuerpo)
+        self._latencia.observar(time.perf_counter() - inicio)
+        return respuesta
+
+    def procesar_bytes(self, datos, transporte):
+        try:
+            cuerpo = json.loads(datos)
+        except (ValueError, UnicodeDecodeError) as e:
+            self._errores.inc()
+            return {'error': f"JSON inválido: {e}"}
+        return self.procesar(cuerpo, transporte)
+
+    def salud(self):
+        return {
+            'status': 'ok',
+            'uptime_s': round(time.time() - self.inicio, 1),
+            'peticiones': self._peticiones.total(),
+            'clasificaciones': self._clasificaciones.total(),
+            'errores': self._errores.total(),
+        }
+
+
+def _serializar(obj):
+    return json.dumps(obj, ensure_ascii=False, separators=(',', ':')).encode('utf-8')
+
+
+# --- HTTP ---
+
+class _HTTPHandlerMixin:
+    servicio = None
+    protocol_version = 'HTTP/1.1'   # keep-alive: un cliente puede reutilizar la conexión
+    disable_nagle_algorithm = True  # cabeceras y cuerpo salen en dos writes: sin esto, ~40ms por petición
+
+    def _responder(self, status, cuerpo, ct='application/json; charset=utf-8'):
+        datos = cuerpo if isinstance(cuerpo, bytes) else _serializar(cuerpo)
+        self.send_response(status)
+        self.send_header('Content-Type', ct)
+        self.send_header('Content-Length', str(len(datos)))
+        self.end_headers()
+        self.wfile.write(datos)
+
+    def do_POST(self):
+        if self.path.split('?', 1)[0] != '/classify':
+            self._responder(404, {'error': 'ruta desconocida'})
+            return
+        longitud = int(self.headers.get('Content-Length') or 0)
+        if longitud > MAX_CUERPO:
+            self.close_connection = True
+            self._responder(413, {'error': 'cuerpo demasiado grande'})
+            return
+        respuesta = self.servicio.procesar_bytes(self.rfile.read(longitud), 'http')
+        self._responder(400 if isinstance(respuesta, dict) and 'error' in respuesta else 200, respuesta)
+
+    def do_GET(self):
+        ruta = self.path.split('?', 1)[0]
+        if ruta == '/health':
+            self._responder(200, self.servicio.salud())
+        elif ruta == '/metrics':
+            self._responder(200, self.servicio.metricas.texto_prometheus().encode('utf-8'),
+                            'text/plain; version=0.0.4; charset=utf-8')
+        else:
+            self._responder(404, {'error': 'ruta desconocida'})
+
+    def log_message(self, format, *args):
+        pass
+
+
+# --- Unix socket (NDJSON) ---
+
+class _NDJSONHandlerMixin:
+    servicio = None
+
+    def handle(self):
+        while True:
+            linea = self.rfile.readline(MAX_CUERPO + 1)
+            if not linea:
+                return
+            if not linea.strip():
+                continue
+            if len(linea) > MAX_CUERPO:
+                self.wfile.write(_serializar({'error': 'línea demasiado larga'}) + b'\n')
+                return
+            self.wfile.write(_serializar(self.servicio.procesar_bytes(linea, 'unix')) + b'\n')
+
+
+def crear_servidor(clasificar, direccion=DIRECCION_DEFECTO):
+    """Crea el servidor (HTTP o Unix según la dirección). serve_forever lo arranca el llamador"""
+    import socketserver
+
+    servicio = ServicioClasificacion(clasificar)
+    tipo, destino = parsear_direccion(direccion)
+    if tipo == 'unix':
+        if not hasattr(socketserver, 'ThreadingUnixStreamServer'):
+            raise OSError("Unix sockets no disponibles en esta plataforma")
+        if os.path.exists(destino):
+            os.unlink(destino)   # socket de una ejecución anterior
+        handler = type('NDJSONHandler', (_NDJSONHandlerMixin, socketserver.StreamRequestHandler),
+                       {'servicio': servicio})
+        servidor = socketserver.ThreadingUnixStreamServer(destino, handler)
+        os.chmod(destino, 0o600)
+    else:
+        from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+        handler = type('ClassifyHandler', (_HTTPHandlerMixin, BaseHTTPRequestHandler),
+                       {'servicio': servicio})
+        servidor = ThreadingHTTPServer(destino, handler)
+    servidor.daemon_threads = True
+    servidor.servicio = servicio
+    return servidor
+
+
+def describir(servidor):
+    if isinstance(servidor.server_address, str):
+        return f"unix:{servidor.server_address}"
+    host, puerto = servidor.server_address[:2]
+    return f"http://{host}:{puerto}/classify"
+
+
+def _interrumpir(signum, frame):
+    raise KeyboardInterrupt
+
+
+def servir(clasificar, direccion=DIRECCION_DEFECTO):
+    """Sirve hasta Ctrl+C/SIGTERM; al salir imprime los contadores y borra el socket Unix"""
+    servidor = crear_servidor(clasificar, direccion)
+    print(f"🧠 Servidor de clasificación en {describir(servidor)}")
+    signal.signal(signal.SIGTERM, _interrumpir)   # SIGTERM (systemd, kill) = misma salida limpia que Ctrl+C
+    try:
+        servidor.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        servidor.server_close()
+        if isinstance(servidor.server_address, str) and os.path.exists(servidor.server_address):
+            os.unlink(servidor.server_address)
+        salud = servidor.servicio.salud()
+        print(f"\n📊 {salud['clasificaciones']:,} clasificaciones en {salud['peticiones']:,} peticiones "
+              f"({salud['errores']:,} errores, {salud['uptime_s']:.0f}s)")
+        sys.exit(0)
+
@@ -12,27 +12,35 @@ Integración completa con polywhale_v5_adjusted.py:
 import requests
 import sys
 import os
-import time
 import re
 import concurrent.futures
 import subprocess
+import shutil
+import importlib.util
 import json
+import argparse
+import tempfile
+import threading
 from datetime import datetime, timedelta
+from functools import lru_cache
 from collections import defaultdict, Counter
 from requests.adapters import HTTPAdapter
 from urllib3.util.retry import Retry
 import math
+from array import array
 from whale_scorer import WhaleScorer
-
-# Verificar dependencias para scraping
-XVFB_AVAILABLE = subprocess.run(['which', 'xvfb-run'], capture_output=True).returncode == 0
-SELENIUM_AVAILABLE = False
-try:
-    import undetected_chromedriver as uc
-    from selenium.webdriver.common.by import By
-    SELENIUM_AVAILABLE = True
-except ImportError:
-    pass
+from whale_events import leer_eventos, archivos_eventos, es_archivo_eventos
+from activity_store import ActivityStore, PAGE_SIZE
+from taxonomy import detectar_sector
+
+# Verificar dependencias del scraping (perezoso: el navegador corre en un
+# subproceso, así que basta con saber si selenium/xvfb existen, sin importarlos)
+@lru_cache(maxsize=None)
+def _scraping_disponible():
+    return (shutil.which('xvfb-run') is not None
+            and importlib.util.find_spec('undetected_chromedriver') is not None
+            and importlib.util.find_spec('selenium') is not None
+            and os.path.exists(CHROME_PATH))
 
 # --- CONFIGURACIÓN ---
 DATA_API = "https://data-api.polymarket.com"
@@ -43,21 +51,69 @@ INPUT_DIR = "trades_live"
 OUTPUT_ROOT = "TheWales"
 MAX_WORKERS = 10
 ANALYSIS_LIMIT = 10000  # Reducido para batch
+BATCH_WORKERS = 6        # Wallets analizadas en paralelo
+HTTP_CONCURRENCY = int(os.getenv('FORENSIC_HTTP_CONCURRENCY', '16'))  # Peticiones simultáneas (global)
+SCRAPE_SLOTS = int(os.getenv('FORENSIC_SCRAPE_SLOTS', '2'))           # Chromes simultáneos
 DEBUG_MODE = False
-USE_SCRAPING = SELENIUM_AVAILABLE and XVFB_AVAILABLE and os.path.exists(CHROME_PATH)
 
 session = requests.Session()
 retries = Retry(total=3, backoff_factor=0.5, status_forcelist=[500, 502, 503, 504, 429])
-session.mount('https://', HTTPAdapter(max_retries=retries))
+session.mount('https://', HTTPAdapter(max_retries=retries, pool_maxsize=HTTP_CONCURRENCY))
+
+# Límites globales compartidos por todas las wallets del lote
+_http_semaphore = threading.BoundedSemaphore(HTTP_CONCURRENCY)
+_scrape_semaphore = threading.BoundedSemaphore(SCRAPE_SLOTS)
+
+
+def _http_get(url, **kwargs):
+    """GET a la API respetando el tope global de concurrencia HTTP"""
+    with _http_semaphore:
+        return session.get(url, **kwargs)
+
+class FlujosMercado:
+    """
+    Flujos invertido/devuelto por mercado en arrays compactos (struct-of-arrays).
+    Cada clave de mercado se interna una vez → índice entero en los arrays.
+    """
+    def __init__(self):
+        self.indices = {}
+        self.invested = array('d')
+        self.returned = array('d')
+        self.titles = []
+
+    def indice(self, key, title, mejorar_titulo=True):
+        i = self.indices.get(key)
+        if i is None:
+            i = self.indices[key] = len(self.titles)
+            self.invested.append(0.0)
+            self.returned.append(0.0)
+            self.titles.append(title)
+        elif mejorar_titulo and len(title) > len(self.titles[i]):
+            # Actualizar título si es mejor
+            self.titles[i] = title
+        return i
+
+    def __contains__(self, key):
+        return key in self.indices
+
+    def items(self):
+        for key, i in self.indices.items():
+            yield key, i
+
 
 class PolyWhaleIntelligence(WhaleScorer):
-    def __init__(self, wallet, name):
+    def __init__(self, wallet, name, backfill=False, usar_store=True):
         self.wallet = wallet.lower()
         self.name = name
+        self.backfill = backfill        # Descargar historial completo más allá de ANALYSIS_LIMIT
+        self.usar_store = usar_store    # Sincronización incremental con ActivityStore
+        self.paginas_descargadas = 0
         self.output_buffer = [] 
         self.positions = []
         self.activity = []
-        self.timestamps = []
+        self.activity_store = None      # ActivityStore si la actividad se lee en streaming
+        self.ts_min = None
+        self.ts_max = None
         
         # Datos scrapeados de polymarketanalytics.com
         self.scraped_data = {}
@@ -103,34 +159,78 @@ class PolyWhaleIntelligence(WhaleScorer):
     def get_current_portfolio(self):
         try:
             url = f"{DATA_API}/positions?user={self.wallet}&size_gt=0.001"
-            res = session.get(url, timeout=10)
+            res = _http_get(url, timeout=10)
             self.positions = res.json()
             self.positions.sort(key=lambda x: float(x.get('currentValue', 0)), reverse=True)
             return sum(float(p.get('currentValue', 0)) for p in self.positions)
         except: return 0.0
 
-    def fetch_batch(self, offset):
+    def fetch_pagina(self, offset):
+        """Página de /activity; None si la petición falla (para no confundir error con fin)"""
         try:
             url = f"{DATA_API}/activity"
-            params = {"user": self.wallet, "limit": 500, "offset": offset}
-            res = session.get(url, params=params, timeout=10)
+            params = {"user": self.wallet, "limit": PAGE_SIZE, "offset": offset}
+            res = _http_get(url, params=params, timeout=10)
             data = res.json()
             return data if isinstance(data, list) else []
-        except: return []
+        except Exception:
+            return None
 
     def get_full_activity_threaded(self):
+        """Descarga hasta ANALYSIS_LIMIT ops en paralelo.
+        Devuelve (páginas fallidas, fin): fin = alguna página llegó corta (no hay más historial)"""
         print(f"   ⏳ Descargando {self.name} ({ANALYSIS_LIMIT} ops)...", end='\r')
-        offsets = range(0, ANALYSIS_LIMIT, 500)
+        offsets = range(0, ANALYSIS_LIMIT, PAGE_SIZE)
+        fallidas = 0
+        fin = False
         with concurrent.futures.ThreadPoolExecutor(max_workers=MAX_WORKERS) as executor:
-            future_to_offset = {executor.submit(self.fetch_batch, off): off for off in offsets}
+            future_to_offset = {executor.submit(self.fetch_pagina, off): off for off in offsets}
             for future in concurrent.futures.as_completed(future_to_offset):
                 data = future.result()
-                if data: self.activity.extend(data)
+                if data is None:
+                    fallidas += 1
+                    continue
+                if len(data) < PAGE_SIZE:
+                    fin = True
+                self.activity.extend(data)
+        self.paginas_descargadas += len(offsets)
         self.activity.sort(key=lambda x: x.get('timestamp', 0), reverse=True)
+        return fallidas, fin
+
+    def sync_activity(self):
+        """Actividad desde el store local: solo páginas nuevas; descarga completa la primera vez"""
+        if not self.usar_store:
+            self.get_full_activity_threaded()
+            return
+        store = ActivityStore()
+        paginas = store.sincronizar(self.wallet, self.fetch_pagina, ANALYSIS_LIMIT, self.backfill)
+        if paginas is None:
+            fallidas, completo = self.get_full_activity_threaded()
+            if fallidas:
+                # Un hueco en la primera descarga no se recuperaría nunca (la sync
+                # incremental solo mira lo nuevo): no se guarda y se reintenta la próxima vez
+                print(f"   ⚠️ {self.name}: {fallidas} páginas fallidas, historial no guardado en el store")
+                return
+            store.guardar(self.wallet, self.activity, completo)
+            if not (self.backfill and not completo):
+                return
+            paginas = store.sincronizar(self.wallet, self.fetch_pagina, ANALYSIS_LIMIT, True)
+        self.paginas_descargadas += paginas
+        # El análisis lee del store en streaming: no se carga el historial en memoria
+        self.activity = []
+        self.activity_store = store
+
+    def iterar_actividad(self):
+        if self.activity_store is not None:
+            # El store solo crece: sin --backfill se analizan las ANALYSIS_LIMIT más
+            # recientes, igual que una descarga directa (runs comparables entre sí)
+            limite = None if self.backfill else ANALYSIS_LIMIT
+            return self.activity_store.iterar(self.wallet, limite)
+        return iter(self.activity)
 
     def scrape_polymarketanalytics(self):
         """Extrae TODOS los datos disponibles de polymarketanalytics.com"""
-        if not USE_SCRAPING:
+        if not _scraping_disponible():
             return False
 
         print(f"   🔹 Scraping polymarketanalytics.com para {self.name}...", end='\r')
@@ -313,9 +413,10 @@ except Exception as e:
         pass
 '''
 
-        script_path = "/tmp/polywhale_scraper_batch.py"
-        with open(script_path, "w") as f:
+        # Un archivo por llamada: con SCRAPE_SLOTS > 1 cada hilo ejecuta su propio script (wallet incluida)
+        with tempfile.NamedTemporaryFile('w', suffix='.py', prefix='polywhale_scraper_', delete=False) as f:
             f.write(script_content)
+            script_path = f.name
 
         try:
             result = subprocess.run(
@@ -349,33 +450,7 @@ except Exception as e:
                 pass
 
     def detect_sector(self, title):
-        t = title.lower()
-        def has_word(keywords, text):
-            pattern = r'\b(' + '|'.join(map(re.escape, keywords)) + r')\b'
-            return bool(re.search(pattern, text))
-
-        pol_kw = ['trump', 'biden', 'harris', 'election', 'senate', 'vote', 'president', 'republican', 'democrat', 'cabinet', 'nominee', 'poll', 'politics', 'vance', 'presidency']
-        if has_word(pol_kw, t): return "Política 🏛️"
-        
-        eco_kw = ['fed', 'rates', 'interest', 'inflation', 'cpi', 'gdp', 'recession', 'bank', 'spx', 'stocks', 'ipo', 'market', 'nasdaq', 'dow', 'rate', 'bps']
-        if has_word(eco_kw, t): return "Economía 📉"
-
-        cry_kw = ['bitcoin', 'ethereum', 'solana', 'price', 'etf', 'btc', 'eth', 'crypto', 'token', 'nft', 'airdrop', 'doge', 'memecoin', 'chain', 'wallet']
-        if has_word(cry_kw, t): return "Crypto ₿"
-
-        geo_kw = ['war', 'israel', 'iran', 'ukraine', 'russia', 'china', 'military', 'strike', 'border', 'ceasefire', 'gaza', 'hamas', 'weapon', 'nuclear', 'missile']
-        if has_word(geo_kw, t): return "Geopolítica 🌍"
-
-        spt_kw = ['nfl', 'nba', 'soccer', 'football', 'league', 'cup', 'winner', 'vs', 'score', 'champions', 'premier', 'ufc', 'game', 'win', 'lose', 'points', 'goals', 'season', 'mvp', 'fc', 'club', 'real', 'barcelona', 'madrid', 'city', 'utd', 'united', 'spread', 'handicap', 'over', 'under']
-        if has_word(spt_kw, t) or 'vs.' in t: return "Deportes ⚽"
-        
-        sci_kw = ['spacex', 'nasa', 'mars', 'ai', 'chatgpt', 'openai', 'apple', 'google', 'fda', 'temperature', 'covid', 'launch', 'tech', 'tesla']
-        if has_word(sci_kw, t): return "Ciencia/Tech 🚀"
-
-        pop_kw = ['movie', 'song', 'spotify', 'grammy', 'oscar', 'taylor', 'swift', 'box', 'office', 'actor', 'music', 'album', 'award']
-        if has_word(pop_kw, t): return "Pop Culture 🍿"
-            
-        return "Otros 🌐"
+        return detectar_sector(title)
 
     def get_market_key(self, item):
         """
@@ -414,98 +489,88 @@ except Exception as e:
         Cálculo de PnL mejorado usando marketSlug + cashPnl
         Basado en claude_individual.py V2.2
         """
-        # Estructura: (tipo, key) -> {invested, returned, title, ...}
-        market_flows = {}
-        
-        # 1. Mapear posiciones actuales (incluyendo liquidadas)
-        position_map = {}
+        self.iniciar_analisis()
+        self.procesar_actividad(self.iterar_actividad())
+        return self.cerrar_analisis()
+
+    def iniciar_analisis(self):
+        """Paso 1: flujos iniciales a partir de las posiciones actuales (incluyendo liquidadas)"""
+        self.market_flows = FlujosMercado()
+        self.position_map = {}
         for p in self.positions:
             key = self.get_market_key(p)
-            
             title = p.get('title', 'Unknown')
-            current_val = float(p.get('currentValue', 0))
-            initial_val = float(p.get('initialValue', 0))
-            cash_pnl = float(p.get('cashPnl', 0))
-            size = float(p.get('size', 0))
-            
-            position_map[key] = {
+            self.position_map[key] = {
                 'title': title,
-                'current_value': current_val,
-                'initial_value': initial_val,
-                'cash_pnl': cash_pnl,
-                'size': size
+                'current_value': float(p.get('currentValue', 0)),
+                'initial_value': float(p.get('initialValue', 0)),
+                'cash_pnl': float(p.get('cashPnl', 0)),
+                'size': float(p.get('size', 0))
             }
-            
             # Inicializar flujos
-            if key not in market_flows:
-                market_flows[key] = {
-                    'invested': 0,
-                    'returned': 0,
-                    'title': title
-                }
-        
-        # 2. Procesar actividad histórica
-        for activity in self.activity:
-            key = self.get_market_key(activity)
+            self.market_flows.indice(key, title, mejorar_titulo=False)
+
+    def procesar_actividad(self, items):
+        """
+        Paso 2: agrega actividad histórica en streaming (se puede llamar página a página).
+        Solo guarda flujos por mercado y contadores, nunca la lista de items.
+        """
+        flows = self.market_flows
+        invested, returned = flows.invested, flows.returned
+        stats = self.stats
+        for activity in items:
+            i = flows.indice(self.get_market_key(activity), activity.get('title', 'Unknown'))
             ts = activity.get('timestamp')
-            if ts: 
-                self.timestamps.append(ts)
-            
+            if ts:
+                if self.ts_min is None or ts < self.ts_min: self.ts_min = ts
+                if self.ts_max is None or ts > self.ts_max: self.ts_max = ts
+
             tipo = activity.get('type')
             usdc = float(activity.get('usdcSize', 0))
-            title = activity.get('title', 'Unknown')
-            sector = self.detect_sector(title)
-            
-            self.stats['total_items'] += 1
-            
-            # Inicializar si no existe
-            if key not in market_flows:
-                market_flows[key] = {
-                    'invested': 0,
-                    'returned': 0,
-                    'title': title
-                }
-            
-            # Actualizar título si es mejor
-            if len(title) > len(market_flows[key]['title']):
-                market_flows[key]['title'] = title
-            
+            stats['total_items'] += 1
+
             # Contabilizar flujos
             if tipo == 'TRADE':
-                self.stats['volume'] += usdc
+                stats['volume'] += usdc
                 side_action = activity.get('side')
                 if side_action == 'BUY':
-                    market_flows[key]['invested'] += usdc
-                    self.stats['invested'] += usdc
-                    self.stats['buy_count'] += 1
+                    invested[i] += usdc
+                    stats['invested'] += usdc
+                    stats['buy_count'] += 1
                 elif side_action == 'SELL':
-                    market_flows[key]['returned'] += usdc
-                    self.stats['returned'] += usdc
-                    self.stats['sell_count'] += 1
-                
+                    returned[i] += usdc
+                    stats['returned'] += usdc
+                    stats['sell_count'] += 1
+
                 # Tracking de sectores
-                self.market_count[title] += 1
-                
+                self.market_count[activity.get('title', 'Unknown')] += 1
+
             elif tipo == 'REDEEM':
-                market_flows[key]['returned'] += usdc
-                self.stats['returned'] += usdc
+                returned[i] += usdc
+                stats['returned'] += usdc
             elif tipo == 'MERGE':
-                market_flows[key]['returned'] += usdc
-                self.stats['returned'] += usdc
-                self.stats['merge_count'] += 1
+                returned[i] += usdc
+                stats['returned'] += usdc
+                stats['merge_count'] += 1
             elif tipo == 'SPLIT':
-                market_flows[key]['invested'] += usdc
-                self.stats['invested'] += usdc
-                self.stats['split_count'] += 1
-        
+                invested[i] += usdc
+                stats['invested'] += usdc
+                stats['split_count'] += 1
+
+    def cerrar_analisis(self):
+        """Pasos 3-4: PnL por mercado, sectores y wins/losses"""
+        market_flows = self.market_flows
+        position_map = self.position_map
+
         # 3. Calcular PnL por mercado usando cashPnl (método más preciso)
         processed_keys = set()
         
         # 3A. Procesar posiciones CON cashPnl (datos más confiables)
         for key, pos in position_map.items():
             if key in market_flows:
-                flows = market_flows[key]
-                title = flows['title']
+                i = market_flows.indices[key]
+                title = market_flows.titles[i]
+                invested, returned = market_flows.invested[i], market_flows.returned[i]
                 sector = self.detect_sector(title)
                 
                 # Usar cashPnl de la posición (incluye TODO el PnL histórico)
@@ -515,7 +580,7 @@ except Exception as e:
                     self.market_status[title] = 'OPEN'
                 else:
                     # Posición cerrada/liquidada
-                    pnl = pos['cash_pnl'] if pos['cash_pnl'] != 0 else (flows['returned'] - flows['invested'])
+                    pnl = pos['cash_pnl'] if pos['cash_pnl'] != 0 else (returned - invested)
                     self.market_status[title] = 'CLOSED'
                 
                 self.market_pnl[title] = pnl
@@ -523,9 +588,9 @@ except Exception as e:
                 processed_keys.add(key)
                 
                 # Detectar flujos residuales (posiciones cerradas no reportadas)
-                expected_investment = pos['initial_value'] if pos['initial_value'] > 0 else flows['invested']
-                residual_invested = flows['invested'] - expected_investment
-                residual_returned = flows['returned'] - pos['cash_pnl'] if pos['cash_pnl'] < 0 else flows['returned']
+                expected_investment = pos['initial_value'] if pos['initial_value'] > 0 else invested
+                residual_invested = invested - expected_investment
+                residual_returned = returned - pos['cash_pnl'] if pos['cash_pnl'] < 0 else returned
                 
                 if residual_invested > 100:
                     residual_pnl = residual_returned - residual_invested
@@ -535,13 +600,13 @@ except Exception as e:
                     self.sectors[sector] += residual_pnl  # ✅ Acumular residual también
         
         # 3B. Procesar mercados SOLO en actividad (no en positions)
-        for key, flows in market_flows.items():
+        for key, i in market_flows.items():
             if key in processed_keys:
                 continue
                 
-            title = flows['title']
-            invested = flows['invested']
-            returned = flows['returned']
+            title = market_flows.titles[i]
+            invested = market_flows.invested[i]
+            returned = market_flows.returned[i]
             pnl = returned - invested
             sector = self.detect_sector(title)
             
@@ -595,12 +660,13 @@ except Exception as e:
     def run_analysis(self):
         """Análisis principal - actualizado con sistema de scoring V2.2"""
         curr_val = self.get_current_portfolio()
-        self.get_full_activity_threaded()
+        self.sync_activity()
         self.analyze_data()
         
         # Intento de scraping (solo si está disponible)
-        if USE_SCRAPING:
-            self.scrape_polymarketanalytics()
+        if _scraping_disponible():
+            with _scrape_semaphore:
+                self.scrape_polymarketanalytics()
         
         # Calcular métricas de scoring V5 ADJUSTED
         if self.scraped_data:
@@ -695,25 +761,141 @@ except Exception as e:
 def get_targets_from_file(filename):
     path = os.path.join(INPUT_DIR, filename)
     if not os.path.exists(path): return []
-    with open(path, 'r', encoding='utf-8') as f: content = f.read()
-    pattern = r"Nombre:\s+(.+?)\n\s+Wallet:\s+(0x[a-fA-F0-9]{40})"
-    matches = re.findall(pattern, content)
+    if es_archivo_eventos(path):
+        # Log estructurado (whale_events): wallet y nombre sin regex
+        matches = [(ev.get('display_name', ''), ev.get('wallet', '')) for ev in leer_eventos(path)
+                   if re.fullmatch(r"0x[a-fA-F0-9]{40}", ev.get('wallet') or '')]
+    else:
+        with open(path, 'r', encoding='utf-8') as f: content = f.read()
+        pattern = r"Nombre:\s+(.+?)\n\s+Wallet:\s+(0x[a-fA-F0-9]{40})"
+        matches = re.findall(pattern, content)
     targets = {}
     for name, wallet in matches:
         if wallet.lower() not in targets: targets[wallet.lower()] = name.strip()
     return list(targets.items())
 
+def _ruta_checkpoint(final_path):
+    return final_path + ".checkpoint.jsonl"
+
+
+def cargar_checkpoint(final_path):
+    """Wallets ya analizadas en una ejecución anterior (wallet → resultado)"""
+    hechos = {}
+    path = _ruta_checkpoint(final_path)
+    if not os.path.exists(path):
+        return hechos
+    with open(path, 'r', encoding='utf-8') as f:
+        for linea in f:
+            try:
+                r = json.loads(linea)
+                hechos[r['wallet']] = r
+            except (ValueError, KeyError):
+                continue  # Línea cortada por un crash a mitad de escritura
+    return hechos
+
+
+def analizar_wallet(wallet, name, backfill=False, usar_store=True):
+    analyzer = PolyWhaleIntelligence(wallet, name, backfill, usar_store)
+    report_text, is_bot = analyzer.run_analysis()
+    return {
+        'wallet': wallet,
+        'name': name,
+        'report': report_text,
+        'is_bot': bool(is_bot),
+        'tier': analyzer.scores['tier'],
+        'analizado': datetime.now().isoformat(),
+    }
+
+
+def escribir_maestro(final_path, fuente, resultados, total=None, en_progreso=False):
+    """Reporte maestro con resumen ejecutivo (reescritura atómica)"""
+    count_bots = sum(1 for r in resultados if r['is_bot'])
+    count_humans = len(resultados) - count_bots
+    tier_counts = Counter(r['tier'] for r in resultados)
+
+    tmp_path = final_path + ".tmp"
+    with open(tmp_path, 'w', encoding='utf-8') as f:
+        f.write("="*80 + "\n")
+        f.write(f"REPORTE INTELIGENCIA V17.0 (V5 ADJUSTED) - {datetime.now()}\n")
+        f.write(f"Fuente: {fuente}\n")
+        if en_progreso:
+            f.write(f"⏳ EN PROGRESO: {len(resultados)}/{total} wallets\n")
+        f.write("-" * 80 + "\n")
+        f.write(f"📊 RESUMEN EJECUTIVO:\n")
+        f.write(f"   🐋 TOTAL ANALIZADOS: {len(resultados)}\n")
+        f.write(f"   👤 HUMANOS:          {count_humans} (Alpha Potencial)\n")
+        f.write(f"   🤖 BOTS / MM:        {count_bots} (Descartados)\n")
+        f.write(f"\n   🏆 DISTRIBUCIÓN POR TIER:\n")
+        for tier, count in sorted(tier_counts.items(), key=lambda x: x[1], reverse=True):
+            f.write(f"      {tier}: {count}\n")
+        f.write("="*80 + "\n\n")
+        for r in resultados:
+            f.write(r['report'] + "\n")
+    os.replace(tmp_path, final_path)
+    return count_humans, count_bots, tier_counts
+
+
+def analizar_lote(targets, final_path, fuente, workers=BATCH_WORKERS, backfill=False, usar_store=True):
+    """
+    Analiza las wallets en paralelo (tope global HTTP + slots de scraping).
+    Cada wallet terminada se añade al checkpoint JSONL y al reporte maestro;
+    si el proceso muere, la siguiente ejecución con el mismo reporte reanuda.
+    """
+    hechos = cargar_checkpoint(final_path)
+    pendientes = [(w, n) for w, n in targets if w not in hechos]
+    if hechos:
+        print(f"♻️  Reanudando: {len(targets) - len(pendientes)}/{len(targets)} wallets ya en el checkpoint")
+
+    lock = threading.Lock()
+    completados = [hechos[w] for w, _ in targets if w in hechos]
+    total = len(targets)
+
+    with open(_ruta_checkpoint(final_path), 'a', encoding='utf-8') as checkpoint, \
+            concurrent.futures.ThreadPoolExecutor(max_workers=workers) as executor:
+        futures = {executor.submit(analizar_wallet, w, n, backfill, usar_store): (w, n) for w, n in pendientes}
+        for future in concurrent.futures.as_completed(futures):
+            wallet, name = futures[future]
+            try:
+                resultado = future.result()
+            except Exception as e:
+                print(f"❌ Error analizando {name}: {e} (se reintentará al reanudar)")
+                continue
+            with lock:
+                checkpoint.write(json.dumps(resultado, ensure_ascii=False) + "\n")
+                checkpoint.flush()
+                completados.append(resultado)
+                print(f"🔹 [{len(completados)}/{total}] {name}: {resultado['tier']}")
+                escribir_maestro(final_path, fuente, completados, total, en_progreso=True)
+
+    # Reconstrucción final en el orden original del log
+    orden = {w: i for i, (w, _) in enumerate(targets)}
+    completados.sort(key=lambda r: orden.get(r['wallet'], len(orden)))
+    return completados
+
+
 def main():
+    parser = argparse.ArgumentParser(description="Análisis forense por lotes de las ballenas de un log")
+    parser.add_argument('log', nargs='?', help="Log de trades_live a analizar (si falta, se pregunta)")
+    parser.add_argument('salida', nargs='?', help="Nombre del reporte de salida (si falta, se pregunta)")
+    parser.add_argument('--workers', type=int, default=BATCH_WORKERS, help="Wallets analizadas en paralelo")
+    parser.add_argument('--backfill', action='store_true',
+                        help=f"Descargar el historial completo de cada wallet (más allá de {ANALYSIS_LIMIT} ops)")
+    parser.add_argument('--no-store', action='store_true',
+                        help="Ignorar el almacén local de actividad y descargar todo de nuevo")
+    args = parser.parse_args()
+
     print("\n🦈 POLYWHALE BATCH V17.0 - INTEGRADO CON POLYWHALE V5 ADJUSTED")
     print("Scraping + scoring ajustado (35/25/20/20) + detección de bots avanzada\n")
-    try:
-        files = [f for f in os.listdir(INPUT_DIR) if f.endswith('.txt')]
-        if files:
-            print(f"📂 Logs disponibles:")
-            for f in files[-3:]: print(f"   - {f}")
-    except: pass
-
-    in_name = input("\n📝 Archivo de log a analizar: ").strip()
+    if not args.log:
+        try:
+            files = [f for f in os.listdir(INPUT_DIR) if f.endswith('.txt')]
+            files += [os.path.relpath(str(p), INPUT_DIR) for p in archivos_eventos(os.path.join(INPUT_DIR, 'events'))]
+            if files:
+                print(f"📂 Logs disponibles:")
+                for f in files[-3:]: print(f"   - {f}")
+        except: pass
+
+    in_name = args.log or input("\n📝 Archivo de log a analizar: ").strip()
     targets = get_targets_from_file(in_name)
     if not targets: 
         print("❌ No se encontraron wallets en el archivo")
@@ -722,51 +904,26 @@ def main():
     today = datetime.now().strftime("%Y-%m-%d")
     out_dir = os.path.join(OUTPUT_ROOT, today)
     os.makedirs(out_dir, exist_ok=True)
-    out_name = input(f"💾 Nombre reporte salida: ").strip()
+    out_name = args.salida or input(f"💾 Nombre reporte salida: ").strip()
     if not out_name.endswith('.txt'): out_name += ".txt"
     final_path = os.path.join(out_dir, out_name)
 
-    print(f"\n🚀 Analizando {len(targets)} ballenas con sistema V5 ADJUSTED...")
-    
-    final_reports = []
-    count_bots = 0
-    count_humans = 0
-    tier_counts = defaultdict(int)
-    
-    for i, (wallet, name) in enumerate(targets, 1):
-        print(f"🔹 [{i}/{len(targets)}] Analizando: {name}...")
-        analyzer = PolyWhaleIntelligence(wallet, name)
-        report_text, is_bot = analyzer.run_analysis()
-        
-        if is_bot: 
-            count_bots += 1
-        else: 
-            count_humans += 1
-        
-        tier_counts[analyzer.scores['tier']] += 1
-        final_reports.append(report_text)
-        time.sleep(0.5)
+    print(f"\n🚀 Analizando {len(targets)} ballenas con sistema V5 ADJUSTED "
+          f"({args.workers} en paralelo, HTTP ≤{HTTP_CONCURRENCY}, scraping ≤{SCRAPE_SLOTS})...")
+
+    resultados = analizar_lote(targets, final_path, in_name, args.workers,
+                               backfill=args.backfill, usar_store=not args.no_store)
 
     print(f"\n💾 Guardando archivo maestro...")
-    with open(final_path, 'w', encoding='utf-8') as f:
-        f.write("="*80 + "\n")
-        f.write(f"REPORTE INTELIGENCIA V17.0 (V5 ADJUSTED) - {datetime.now()}\n")
-        f.write(f"Fuente: {in_name}\n")
-        f.write("-" * 80 + "\n")
-        f.write(f"📊 RESUMEN EJECUTIVO:\n")
-        f.write(f"   🐋 TOTAL ANALIZADOS: {len(targets)}\n")
-        f.write(f"   👤 HUMANOS:          {count_humans} (Alpha Potencial)\n")
-        f.write(f"   🤖 BOTS / MM:        {count_bots} (Descartados)\n")
-        f.write(f"\n   🏆 DISTRIBUCIÓN POR TIER:\n")
-        for tier, count in sorted(tier_counts.items(), key=lambda x: x[1], reverse=True):
-            f.write(f"      {tier}: {count}\n")
-        f.write("="*80 + "\n\n")
-        for rep in final_reports:
-            f.write(rep + "\n")
+    count_humans, count_bots, tier_counts = escribir_maestro(final_path, in_name, resultados)
+    if len(resultados) == len(targets):
+        os.remove(_ruta_checkpoint(final_path))
+    else:
+        print(f"⚠️ {len(targets) - len(resultados)} wallets fallaron: vuelve a ejecutar con el mismo reporte para reanudar")
 
     print(f"✨ COMPLETADO: {final_path}")
     print(f"\n📊 Resumen:")
-    print(f"   • Total: {len(targets)}")
+    print(f"   • Total: {len(resultados)}")
     print(f"   • Humanos: {count_humans}")
     print(f"   • Bots: {count_bots}")
     for tier, count in sorted(tier_counts.items(), key=lambda x: x[1], reverse=True):
@@ -0,0 +1,16 @@
+#!/usr/bin/env python3
+"""
+Punto de entrada ligero del CLI de gold_all_claude.py (mismos argumentos).
+
+`python gold_all_claude.py ...` compila las ~2000 líneas del módulo en cada
+arranque (el script principal nunca usa __pycache__); desde aquí se importa
+gold_all_claude desde su .pyc cacheado. Para llamadas sueltas como --single.
+
+Uso:
+    python gold.py --single "Lakers vs Celtics" GOLD 0.55 5000
+"""
+
+from gold_all_claude import main
+
+if __name__ == "__main__":
+    main()
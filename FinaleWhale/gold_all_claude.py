@@ -37,9 +37,6 @@ CHANGELOG:
 """
 
 import re
-from unittest import signals
-
-import requests
 import json
 import time
 import signal as signal_module
@@ -52,13 +49,16 @@ import threading
 from datetime import datetime
 from pathlib import Path
 from collections import deque
-from concurrent.futures import ThreadPoolExecutor
-from requests.adapters import HTTPAdapter
-from urllib3.util.retry import Retry
 from dotenv import load_dotenv
 from whale_scorer import WHALE_TIERS
-from sports_edge_detector import SportsEdgeDetector
-from supabase import create_client, Client
+from whale_metrics import RegistroMetricas, iniciar_servidor, rss_bytes
+from http_replay import url_base, montar_grabador
+from signal_rules import motor as motor_senales
+
+# requests, supabase, sports_edge_detector, whale_stats, whale_events y
+# market_resolution se importan donde se usan (monitor live): --single,
+# replay y el bench no pagan su coste de arranque. Para llamadas sueltas en
+# frío, gold.py lanza este mismo CLI importando el módulo desde su .pyc.
 
 load_dotenv()
 
@@ -67,19 +67,55 @@ TELEGRAM_TOKEN = os.getenv('API_GOLD')
 TELEGRAM_CHAT_ID = os.getenv('CHAT_ID')
 TELEGRAM_ENABLED = bool(TELEGRAM_TOKEN and TELEGRAM_CHAT_ID)
 
+# Canal aparte para las alertas de la watchlist (wallets seguidas)
+TELEGRAM_WATCHLIST_TOKEN = os.getenv('API_WATCHLIST') or TELEGRAM_TOKEN
+TELEGRAM_WATCHLIST_CHAT_ID = os.getenv('CHAT_ID_WATCHLIST')
+TELEGRAM_WATCHLIST_ENABLED = bool(TELEGRAM_WATCHLIST_TOKEN and TELEGRAM_WATCHLIST_CHAT_ID)
+
 # Configuración de Supabase (Gold usa sus propias credenciales)
-SUPABASE_URL = os.getenv('SUPA_GOLD_URL')
+SUPABASE_URL = url_base('supabase', os.getenv('SUPA_GOLD_URL'))
 SUPABASE_KEY = os.getenv('SUPA_GOLD_KEY')
 SUPABASE_ENABLED = bool(SUPABASE_URL and SUPABASE_KEY)
 
 # --- CONFIGURACIÓN ---
-GAMMA_API = "https://gamma-api.polymarket.com"
-DATA_API = "https://data-api.polymarket.com"
+# Con WHALE_STANDIN, todos los upstreams apuntan al stand-in de http_replay.py
+GAMMA_API = url_base('gamma-api', "https://gamma-api.polymarket.com")
+DATA_API = url_base('data-api', "https://data-api.polymarket.com")
+TELEGRAM_API = url_base('telegram', "https://api.telegram.org")
 LIMIT_TRADES = 1000
-INTERVALO_NORMAL = 3
+INTERVALO_NORMAL = float(os.getenv('WHALE_INTERVALO', '3'))  # < 3 solo para replays acelerados
 MAX_CACHE_SIZE = 5000
 VENTANA_TIEMPO = 1800  # 30 minutos
 
+# Métricas del modo live (whale_metrics.py): endpoint Prometheus local (0 = desactivado)
+METRICS_PORT = int(os.getenv('WHALE_METRICS_PORT', '9108'))
+METRICAS = RegistroMetricas(prefijo='whale_')
+for _nombre, _ayuda in (
+    ('trade_age_seconds', 'Edad del trade (timestamp on-chain) al ingerirlo'),
+    ('fetch_seconds', 'Descarga de /trades por ciclo'),
+    ('filter_seconds', 'TradeFilter.is_worth_copying (incluye Gamma API)'),
+    ('edge_seconds', 'SportsEdgeDetector.check_edge'),
+    ('classify_seconds', 'classify()'),
+    ('supabase_seconds', 'Llamadas a Supabase'),
+    ('telegram_seconds', 'Envio a Telegram'),
+    ('alert_latency_seconds', 'Desde el timestamp on-chain hasta enviar la alerta de Telegram'),
+):
+    METRICAS.histograma(_nombre, _ayuda)
+for _nombre, _ayuda, _etiquetas in (
+    ('cycles_total', 'Ciclos de polling completados', ()),
+    ('trades_ingested_total', 'Trades recibidos de /trades', ()),
+    ('trades_total', 'Trades por estado tras deduplicar', ('estado',)),
+    ('fetch_errors_total', 'Errores descargando /trades', ()),
+    ('whales_total', 'Ballenas detectadas por tier de tamano y resultado del filtro', ('tier', 'resultado')),
+    ('signals_total', 'Clasificaciones por categoria, signal_id y accion', ('category', 'signal_id', 'action')),
+    ('cache_requests_total', 'Consultas a caches (hit/miss)', ('cache', 'result')),
+    ('supabase_errors_total', 'Errores de Supabase', ()),
+    ('telegram_errors_total', 'Errores enviando a Telegram', ()),
+    ('watchlist_alerts_total', 'Alertas de la watchlist', ()),
+    ('config_reloads_total', 'Configs aplicadas desde live_config.json', ()),
+):
+    METRICAS.contador(_nombre, _ayuda, _etiquetas)
+
 # Configuración de Logging
 logging.basicConfig(
     level=logging.INFO,
@@ -153,97 +189,59 @@ WHITELIST_B = ['elkmonkey', 'gmanas', 'swisstony', 'synnet']
 BLACKLIST = ['sovereign2013', 'BITCOINTO500K', '432614799197', 'xdoors']
 TRADER_MIN_TRADES_FOR_SIGNAL = 15
 
-# Keywords para detección de categorías
-NBA_KEYWORDS = [
-    'nba', 'ncaa', 'cougars', 'cyclones', 'wolverines', 'boilermakers', 'cornhuskers',
-    'hawkeyes', 'wildcats', 'tigers', 'cowboys', 'buffaloes', 'owls',
-    'mean green', 'seminoles', 'tar heels', 'hoosiers', 'gamecocks',
-    'bulldogs', 'longhorns', 'sooners', 'jayhawks', 'ncaab',
-    'college basketball', 'lakers', 'celtics', 'bulls', 'warriors', 'nets', 'knicks',
-    'bucks', 'heat', 'suns', 'nuggets', 'grizzlies', 'jazz', 'spurs',
-    'pistons', 'pacers', 'wizards', 'hawks', 'hornets', 'cavaliers',
-    'magic', 'raptors', 'thunder', 'clippers', 'kings', 'rockets',
-    'mavericks', 'timberwolves', 'blazers', 'pelicans', '76ers', 'sixers',
-]
-
-NHL_KEYWORDS = [
-    'nhl', 'oilers', 'ducks', 'bruins', 'rangers', 'penguins',
-    'maple leafs', 'canadiens', 'flames', 'canucks', 'sharks',
-    'golden knights', 'avalanche', 'blues', 'blackhawks', 'red wings',
-    'hurricanes', 'panthers', 'lightning', 'capitals', 'flyers',
-    'devils', 'islanders', 'sabres', 'senators', 'predators',
-    'stars', 'wild ', 'jets', 'kraken',
-]
-CRICKET_KEYWORDS = ['cricket', 't20 world cup', 'ipl', 'test match', 'odi', 't20']
-
-SOCCER_KEYWORDS = [
-    'fc ', ' fc', 'barcelona', 'madrid', 'bayern', 'dortmund', 'juventus',
-    'inter', 'milan', 'psg', 'lyon', 'lille', 'chelsea', 'arsenal',
-    'liverpool', 'tottenham', 'manchester', 'premier', 'liga', 'serie a',
-    'bundesliga', 'ligue', 'milan', 'roma', 'napoli', 'atletico', 'sevilla', 'valencia',
-    'real sociedad', 'ajax', 'porto', 'benfica', 'feyenoord', 'celtic', 'rangers', 'galatasaray',
-    'fenerbahce', 'besiktas', 'marseille', 'monaco', 'olympiacos', 'anderlecht', 'brugge',
-    'shakhtar', 'dynamo kiev', 'dortmund', 'leipzig', 'wolfsburg', 'frankfurt', 'leverkusen', 'schalke', 'ucl', 'uel',
-]
-
-CRYPTO_KEYWORDS = [
-    'bitcoin', 'btc', 'ethereum', 'eth', 'crypto', 'solana', 'sol',
-    'dogecoin', 'doge', 'xrp', 'cardano', 'ada',
-]
-
-ESPORTS_KEYWORDS = [
-    'esports', 'league of legends', 'dota', 'csgo', 'cs2', 'valorant', 'dota2', 'counter-strike',     'lol:', 'lck', 'lec', 'lpl', 'bnk fearx', 'gen.g', 'dplus kia',
-    'kt rolster', 'natus vincere', 'giantx', 'team heretics', 'karmine corp',
-    'team vitality', 'bo3', 'bo5', 'game winner', 'game handicap',
-    'counter-strike:', 'cs2:', 'pgl', 'furia', 'parivision', 'mouz',
-    'dreamleague', 'aurora', 'tundra', 'liquid', 'team spirit', 'mouz',
-    ]
-
-TENNIS_KEYWORDS = ['tennis', 'atp', 'wta', 'grand slam', 'wimbledon', 'roland garros']
-MMA_KEYWORDS = [
-    'ufc', 'mma', 'boxing', 'bellator', 'one fc', 'fight night',
-    'flyweight', 'bantamweight', 'featherweight', 'lightweight',
-    'welterweight', 'middleweight', 'heavyweight', 'knockout', ' ko ',
-]
-
-
-def _detect_category(market_title: str) -> str:
-    """Detecta la categoría del mercado basándose en el título."""
-    title_lower = market_title.lower()
-
-    # NHL antes que NBA (evita que 'blues', 'predators', etc. caigan al fallback vs+o/u NBA)
-    if any(kw in title_lower for kw in NHL_KEYWORDS):
-        return "NHL"
-
-    # NBA primero (más específico que "sports" genérico)
-    if any(kw in title_lower for kw in NBA_KEYWORDS):
-        return "NBA"
-
-    if any(kw in title_lower for kw in CRYPTO_KEYWORDS):
-        return "CRYPTO"
-
-    if any(kw in title_lower for kw in SOCCER_KEYWORDS):
-        return "SOCCER"
+# Umbrales de classify() / _es_ballena / consenso. sweep.py barre variantes de este dict;
+# classify(params=...) acepta un dict con las mismas claves (por defecto, estos valores).
+SIGNAL_PARAMS = {
+    'capital_min': 3000,            # Capital mínimo para señal
+    's1_precio_max': 0.45,          # S1: Counter HIGH RISK por debajo de este precio
+    's1_zona_fuerte': 0.40,         # S1: zona fuerte [s1_zona_fuerte, s1_precio_max)
+    's1b_precio_max': 0.40,         # S1B: Counter Soccer por debajo de este precio
+    's2_precio_min': 0.50,          # S2: Follow NBA [s2_precio_min, s2_precio_max]
+    's2_precio_max': 0.60,
+    's2b_precio_max': 0.80,         # S2B: Follow NBA (s2_precio_max, s2b_precio_max]
+    's3_precio_min': 0.50,          # S3: Follow Nicho [s3_precio_min, s3_precio_max)
+    's3_precio_max': 0.85,
+    's5_precio_min': 0.60,          # S5: Follow Soccer [s5_precio_min, s5_precio_max)
+    's5_precio_max': 0.80,
+    'zona_muerta_min': 0.45,        # Zona muerta sin señal [min, max]
+    'zona_muerta_max': 0.49,
+    'precio_trap': 0.85,            # Por encima: payout trap → IGNORE
+    'ballena_pct_mercado': 0.03,    # _es_ballena: % del volumen del mercado
+    'ballena_min_relativa': 500,    # _es_ballena: capital mínimo de la ballena relativa
+    'consenso_ventana_min': 30,     # Ventana de ConsensusTracker (minutos)
+}
 
-    if any(kw in title_lower for kw in ESPORTS_KEYWORDS):
-        return "ESPORTS"
+# Keywords y taxonomía compartidas (taxonomy.py); re-exportadas por compatibilidad
+from taxonomy import (
+    NBA_KEYWORDS, NHL_KEYWORDS, CRICKET_KEYWORDS, SOCCER_KEYWORDS, CRYPTO_KEYWORDS,
+    ESPORTS_KEYWORDS, TENNIS_KEYWORDS, MMA_KEYWORDS, detectar_categoria, es_deportivo_trader,
+    KEYWORDS_CATEGORIAS, configurar_categorias,
+)
+from live_config import ConfigLive, VigilanteConfig, CONFIG_PATH
+
+# Snapshot de la config en uso (listas en minúsculas ya precalculadas). Las
+# constantes de arriba son los valores por defecto; con --live, live_config.json
+# puede sustituir el snapshot entero en caliente (aplicar_config).
+CONFIG_DEFECTO = ConfigLive(
+    WHITELIST_A, WHITELIST_B, BLACKLIST, TRADER_MIN_TRADES_FOR_SIGNAL,
+    LIMIT_TRADES, VENTANA_TIEMPO, SIGNAL_PARAMS, KEYWORDS_CATEGORIAS,
+)
+CONFIG = CONFIG_DEFECTO
 
-    if any(kw in title_lower for kw in TENNIS_KEYWORDS):
-        return "TENNIS"
 
-    if any(kw in title_lower for kw in MMA_KEYWORDS):
-        return "MMA"
+def aplicar_config(cfg):
+    """Publica un snapshot de config: keywords primero (taxonomía ya compilada), luego umbrales"""
+    global CONFIG, SIGNAL_PARAMS
+    if cfg.keywords != CONFIG.keywords:
+        configurar_categorias(cfg.keywords)
+    if cfg.signal_params != SIGNAL_PARAMS:
+        SIGNAL_PARAMS = cfg.signal_params   # dict nuevo: signal_rules recompila su motor
+    CONFIG = cfg
 
-    # Fallback 'vs' solo si tiene indicadores típicos de mercados NBA
-    # No usar para cualquier "vs" genérico (evita MMA/boxeo activando S2)
-    nba_vs_indicators = ['spread:', 'o/u', 'over/under', 'moneyline']
-    if (' vs' in title_lower or ' vs.' in title_lower):
-        if any(ind in title_lower for ind in nba_vs_indicators):
-            return "NBA"
-        # "X vs Y" sin contexto claro → OTHER, no NBA
-        return "OTHER"
 
-    return "OTHER"
+def _detect_category(market_title: str) -> str:
+    """Detecta la categoría del mercado basándose en el título (taxonomy.CATEGORIAS, memoizado)."""
+    return detectar_categoria(market_title)
 
 
 def _is_crypto_intraday(market_title: str) -> bool:
@@ -261,6 +259,8 @@ def classify(
     display_name: str = "Unknown",
     edge_pct: float = 0.0,
     opposite_tier: str = "",
+    explain: bool = True,
+    params: dict = None,
 ) -> dict:
     """
     Clasifica una señal de ballena y determina la acción recomendada.
@@ -275,6 +275,8 @@ def classify(
         display_name: Nombre del trader
         edge_pct: Edge porcentual vs Pinnacle (convención sports_edge_detector: pinnacle-poly)
         opposite_tier: Tier de una ballena del lado contrario (para conflicto HIGH RISK)
+        explain: Si False, omite el diagnóstico de "sin señal" (replay/backtests masivos)
+        params: Umbrales alternativos (mismas claves que SIGNAL_PARAMS; None = SIGNAL_PARAMS)
 
     Returns:
         dict con action, signal_id, confidence, win_rate_hist, expected_roi,
@@ -292,12 +294,11 @@ def classify(
         "category": "OTHER",
     }
 
+    p = SIGNAL_PARAMS if params is None else params
+    cfg = CONFIG   # una sola lectura: un hot-reload sustituye el snapshot entero
     tier_upper = tier.upper()
-    # FIX 8: Normalizar case para comparaciones con listas
+    # FIX 8: Normalizar case para comparaciones con listas (precalculadas en CONFIG)
     display_name_lower = display_name.lower()
-    whitelist_a_lower = [w.lower() for w in WHITELIST_A]
-    whitelist_b_lower = [w.lower() for w in WHITELIST_B]
-    blacklist_lower = [b.lower() for b in BLACKLIST]
 
     category = _detect_category(market_title)
     result["category"] = category
@@ -314,170 +315,46 @@ def classify(
     # y se muestra explícitamente en el output de Telegram.
 
     # Warning: precio > 0.85
-    if poly_price > 0.85:
+    if poly_price > p['precio_trap']:
         result["warnings"].append(
             "Precio >0.85: WR bueno (78.6%) pero payout destruye EV. "
             f"$10 a {poly_price:.2f} gana solo ${(1/poly_price - 1)*10:.2f}."
         )
 
     # Warning: zona muerta 0.45-0.49
-    if 0.45 <= poly_price <= 0.49:
+    if p['zona_muerta_min'] <= poly_price <= p['zona_muerta_max']:
         result["warnings"].append(
             "Precio en zona 0.45-0.49: underdog sin señal activa. No activa S1 ni S2."
         )
 
     # Warning: trader en blacklist
-    if display_name_lower in blacklist_lower:
+    if display_name_lower in cfg.blacklist_lower:
         result["warnings"].append(
             f"Trader {display_name} está en BLACKLIST. Evaluar counter."
         )
 
     # --- FILTRO MÍNIMO DE CAPITAL ---
-    if valor_usd < 3000:
+    if valor_usd < p['capital_min']:
         result["reasoning"].append(
             f"Capital ${valor_usd:,.0f} < $3K mínimo para señal. "
             f"Ballena registrada pero sin acción recomendada."
         )
         return result
 
-    # --- DETECCIÓN DE SEÑALES ---
-    signals = []
-
-    # S1: Counter HIGH RISK (precio < 0.45)
-    if 'HIGH RISK' in tier_upper and poly_price < 0.45:
-        if 0.40 <= poly_price < 0.45:
-            signals.append({
-                "id": "S1",
-                "action": "COUNTER",
-                "confidence": "HIGH",
-                "win_rate": 88.2,
-                "reasoning": f"S1 zona fuerte: Counter HIGH RISK a {poly_price:.2f} (WR 88.2%, N=17)",
-            })
-        elif poly_price < 0.40:  # poly_price < 0.40
-            signals.append({
-                "id": "S1",
-                "action": "COUNTER",
-                "confidence": "LOW",
-                "win_rate": 60.0,
-                "reasoning": f"S1 zona baja: Counter HIGH RISK a {poly_price:.2f} (WR 60.0%, N=14, mezcla deportes)",
-            })
-
-    # S1B: Counter Soccer cualquier tier, precio < 0.40 (WR 75.0%, N=24)
-    # Las ballenas comprando Soccer a precio muy bajo son malas predictorias.
-    # No requiere ser HIGH RISK — el patrón aplica a todos los tiers en Soccer.
-    if category == "SOCCER" and poly_price < 0.40:
-        signals.append({
-            "id": "S1B",
-            "action": "COUNTER",
-            "confidence": "MEDIUM",
-            "win_rate": 75.0,
-            "reasoning": f"S1B: Counter Fútbol a {poly_price:.2f} cualquier tier (WR 75.0%, N=24)",
-        })
-
-    # S2: Follow NBA 0.50-0.60, excluir HIGH RISK (zona core, datos sólidos)
-    # HIGH RISK NBA: WR 49.4%, PnL -818 → destruye el alpha de la categoría.
-    # Zona 0.50-0.60: WR 72%, rango validado con mayor volumen de señales.
-    if category == "NBA" and 0.50 <= poly_price <= 0.60 and 'HIGH RISK' not in tier_upper:
-        confidence = "MEDIUM"
-        reasoning = f"S2: Follow NBA a {poly_price:.2f} (WR 72%, rango 0.50-0.60, excl. HIGH RISK)"
-
-        # Whitelist A boost
-        if display_name_lower in whitelist_a_lower:
-            confidence = "HIGH"
-            reasoning += f" | Whitelist A ({display_name}) → stake 1.5x"
-        elif display_name_lower in whitelist_b_lower:
-            reasoning += f" | Whitelist B ({display_name}) → ejecutar normal"
-
-        signals.append({
-            "id": "S2",
-            "action": "FOLLOW",
-            "confidence": confidence,
-            "win_rate": 72.0,
-            "reasoning": reasoning,
-        })
-
-    # S2B: Follow NBA 0.60-0.80, excluir HIGH RISK (zona extendida, pendiente más datos)
-    # Prometedor (WR 69.6%) pero la muestra por tier se fragmenta en este rango.
-    # Tratar con stake reducido (0.5x) hasta consolidar n suficiente.
-    if category == "NBA" and 0.60 < poly_price <= 0.80 and 'HIGH RISK' not in tier_upper:
-        confidence = "LOW"
-        reasoning = f"S2B: Follow NBA a {poly_price:.2f} (WR 69.6%, rango 0.60-0.80, stake 0.5x, excl. HIGH RISK)"
-
-        if display_name_lower in whitelist_a_lower:
-            confidence = "MEDIUM"
-            reasoning += f" | Whitelist A ({display_name}) → stake normal"
-        elif display_name_lower in whitelist_b_lower:
-            reasoning += f" | Whitelist B ({display_name})"
-
-        signals.append({
-            "id": "S2B",
-            "action": "FOLLOW",
-            "confidence": confidence,
-            "win_rate": 69.6,
-            "reasoning": reasoning,
-        })
-
-    # S3: Follow Nicho — solo Esports y categorías no-core (excluye NBA, Soccer, Crypto)
-    # Datos confirman que Nicho Soccer WR 43.5% (PnL -618) y Nicho Crypto WR 33.3% (PnL -200).
-    # El filtro nicho solo tiene valor predictivo real en NBA (cubierto por S2) y Esports.
-    # Soccer nicho tiene reglas propias en S5/S6.
-    _S3_EXCLUDED = ("NBA", "SOCCER", "CRYPTO")
-    if is_nicho and category not in _S3_EXCLUDED and 0.50 <= poly_price < 0.85:
-        signals.append({
-            "id": "S3",
-            "action": "FOLLOW",
-            "confidence": "LOW",
-            "win_rate": 56.5,
-            "reasoning": f"S3: Follow Nicho ({category}) a {poly_price:.2f} (stake 0.5x, WR 56.5%)",
-        })
-
-    # S4: Counter Crypto (solo intraday Up/Down automático)
-    if category == "CRYPTO":
-        if _is_crypto_intraday(market_title):
-            signals.append({
-                "id": "S4",
-                "action": "COUNTER",
-                "confidence": "MEDIUM",
-                "win_rate": 65.0,
-                "reasoning": f"S4: Counter Crypto intraday Up/Down a {poly_price:.2f}",
-            })
-        else:
-            result["warnings"].append(
-                "S4 aplica solo a crypto intraday Up/Down. Para crypto largo plazo, validar manualmente."
-            )
-
-    # S5 (REFACTORIZADA v4.0): Follow Soccer 0.60-0.80, excluir GOLD y RISKY
-    # CORRECCIÓN CRÍTICA: la señal anterior estaba invertida. El dato real muestra que
-    # Soccer SILVER en 0.50-0.65 la ballena GANA el 58.3% (WR follow, no counter).
-    # Con el rango ampliado 0.60-0.80 excl. GOLD/RISKY: WR 75.9%, N=29.
-    # GOLD destruye el grupo (GOLD Soccer tiene WR negativo en 0.60-0.80).
-    # RISKY Soccer también tiene WR negativo en ese rango.
-    if category == "SOCCER" and 0.60 <= poly_price < 0.80:
-        if 'GOLD' not in tier_upper and 'RISKY' not in tier_upper:
-            signals.append({
-                "id": "S5",
-                "action": "FOLLOW",
-                "confidence": "MEDIUM",
-                "win_rate": 75.9,
-                "reasoning": (
-                    f"S5: Follow Fútbol {tier} a {poly_price:.2f} "
-                    f"(WR 75.9%, N=29, excl. GOLD/RISKY)"
-                ),
-            })
-
-    # S6 — HIPÓTESIS PENDIENTE DE VALIDACIÓN (no implementada)
-    # Follow Soccer nicho GOLD/SILVER precio ≥ 0.65: WR 80%, pero N=5.
-    # Con n<20 el dato es estadísticamente irrelevante. Implementar cuando n≥20.
+    # --- DETECCIÓN DE SEÑALES (S1-S5 declaradas en signal_rules.json) ---
+    motor = motor_senales(p)
+    signals = motor.evaluar(category, poly_price, tier, tier_upper, is_nicho, market_title,
+                            display_name, cfg.whitelist_a_lower, cfg.whitelist_b_lower, result["warnings"])
 
     # --- IGNORAR si precio > 0.85 (payout trap) ---
-    if poly_price > 0.85:
+    if poly_price > p['precio_trap']:
         result["action"] = "IGNORE"
         result["signal_id"] = "NONE"
         result["reasoning"].append("Precio >0.85: payout insuficiente. IGNORAR.")
         return result
 
     # --- IGNORAR zona muerta 0.45-0.49 (no activa ninguna señal) ---
-    if 0.45 <= poly_price <= 0.49 and not signals:
+    if p['zona_muerta_min'] <= poly_price <= p['zona_muerta_max'] and not signals:
         result["action"] = "IGNORE"
         result["signal_id"] = "NONE"
         result["reasoning"].append("Zona muerta 0.45-0.49 sin señal activa. IGNORAR.")
@@ -487,6 +364,8 @@ def classify(
     if not signals:
         result["action"] = "IGNORE"
         result["signal_id"] = "NONE"
+        if not explain:
+            return result
         # Diagnóstico agrupado por acción: qué impidió COUNTER y qué impidió FOLLOW
         counter_blocks = []
         follow_blocks = []
@@ -553,7 +432,7 @@ def classify(
         result["win_rate_hist"] = s["win_rate"]
         result["reasoning"].append(s["reasoning"])
     else:
-        result = _resolve_conflicts(signals, result, tier_upper, poly_price, opposite_tier)
+        result = motor.resolver(signals, result, tier_upper, poly_price, opposite_tier)
 
     # --- AJUSTES POST-SEÑAL ---
 
@@ -570,83 +449,9 @@ def classify(
 
 def _resolve_conflicts(signals: list, result: dict, tier_upper: str, poly_price: float,
                        opposite_tier: str = "") -> dict:
-    """Resuelve conflictos entre múltiples señales según el árbol de decisión v4.0."""
-    s1   = next((s for s in signals if s["id"] == "S1"),   None)
-    s1b  = next((s for s in signals if s["id"] == "S1B"),  None)
-    s2   = next((s for s in signals if s["id"] == "S2"),   None)
-    s2b  = next((s for s in signals if s["id"] == "S2B"),  None)
-    s3   = next((s for s in signals if s["id"] == "S3"),   None)
-    s4   = next((s for s in signals if s["id"] == "S4"),   None)
-    s5   = next((s for s in signals if s["id"] == "S5"),   None)
-
-    # CASO 0: S1 + S1B ambas en Soccer precio <0.40 — S1B prevalece (más datos, mejor WR)
-    if s1 and s1b:
-        result["action"] = "COUNTER"
-        result["signal_id"] = "S1B"
-        result["confidence"] = "MEDIUM"
-        result["win_rate_hist"] = s1b["win_rate"]
-        result["reasoning"].append(
-            f"S1+S1B Soccer <0.40: S1B prevalece (WR {s1b['win_rate']}% N=24 vs S1 {s1['win_rate']}%)"
-        )
-        return result
-
-    # CASO 1: S1 + S2 — S1 (COUNTER) prevalece sobre S2 (FOLLOW)
-    # Los rangos son exclusivos (S1 precio<0.45, S2 precio 0.50-0.60), pero puede haber
-    # solapamiento teórico si lógica cambia. S1 siempre gana a cualquier FOLLOW.
-    if s1 and s2:
-        result["action"] = "COUNTER"
-        result["signal_id"] = "S1"
-        result["confidence"] = "HIGH"
-        result["win_rate_hist"] = s1["win_rate"]
-        result["reasoning"].append(
-            f"Conflicto S1 vs S2: S1 prevalece (WR {s1['win_rate']}% vs {s2['win_rate']}%)"
-        )
-        return result
-
-    # CASO 1B: S1B + S5 — S1B (COUNTER Soccer <0.40) prevalece sobre S5 (FOLLOW Soccer 0.60-0.80)
-    # Rangos no se solapan pero se mantiene el caso por claridad del árbol de decisión.
-    if s1b and s5:
-        result["action"] = "COUNTER"
-        result["signal_id"] = "S1B"
-        result["confidence"] = "MEDIUM"
-        result["win_rate_hist"] = s1b["win_rate"]
-        result["reasoning"].append(
-            "S1B COUNTER prevalece sobre S5 FOLLOW (precio <0.40 es zona de error ballena en Soccer)"
-        )
-        return result
-
-    # CASO 2: S4 + S3 — S4 (COUNTER crypto intraday) prevalece sobre S3 (FOLLOW nicho)
-    if s4 and s3:
-        result["action"] = "COUNTER"
-        result["signal_id"] = "S4"
-        result["confidence"] = s4["confidence"]
-        result["win_rate_hist"] = s4["win_rate"]
-        result["reasoning"].append(
-            f"S4 prevalece sobre S3 (WR {s4['win_rate']}% vs {s3['win_rate']}%)"
-        )
-        return result
-
-    # CASO 3: Dos HIGH RISK en lados opuestos → IGNORAR
-    if 'HIGH RISK' in tier_upper and 'HIGH RISK' in opposite_tier.upper():
-        result["action"] = "IGNORE"
-        result["signal_id"] = "NONE"
-        result["confidence"] = "—"
-        result["reasoning"].append(
-            "Conflicto HIGH RISK en ambos lados — IGNORAR (ver árbol de decisión v4.0)"
-        )
-        return result
-
-    # CASO 4: Conflicto sin HIGH RISK — prevalece señal con precio más cercano a 0.55
-    best = min(signals, key=lambda s: abs(poly_price - 0.55))
-    result["action"] = best["action"]
-    result["signal_id"] = best["id"]
-    result["confidence"] = best["confidence"]
-    result["win_rate_hist"] = best["win_rate"]
-    result["reasoning"].append(best["reasoning"])
-    result["reasoning"].append(
-        f"Resolución de conflicto: precio {poly_price:.2f} más cercano a 0.55"
-    )
-    return result
+    """Resuelve conflictos entre múltiples señales según el árbol de decisión v4.0
+    (sección 'conflictos' de signal_rules.json)."""
+    return motor_senales(SIGNAL_PARAMS).resolver(signals, result, tier_upper, poly_price, opposite_tier)
 
 
 # ============================================================================
@@ -763,9 +568,10 @@ def classify_consensus_counter(whale_entries: list) -> dict:
 
 class TradeFilter:
     """Filtro de calidad de apuesta para descartar trades no copiables"""
-    def __init__(self, session):
+    def __init__(self, session, markets_cache=None):
         self.session = session
-        self.markets_cache = {}
+        # Volumen por slug/condition_id. El replay lo precarga con el volumen registrado (sin HTTP).
+        self.markets_cache = markets_cache if markets_cache is not None else {}
 
     def is_worth_copying(self, trade, valor) -> tuple:
         price = float(trade.get('price', 0))
@@ -776,7 +582,9 @@ class TradeFilter:
 
         slug = trade.get('slug', '')
         cache_key = slug or trade.get('conditionId', trade.get('market', ''))
-        if cache_key and cache_key not in self.markets_cache:
+        hit = not cache_key or cache_key in self.markets_cache
+        METRICAS.contador('cache_requests_total').inc(etiquetas=('volumen', 'hit' if hit else 'miss'))
+        if not hit:
             try:
                 url = f"{GAMMA_API}/markets"
                 if slug:
@@ -802,33 +610,49 @@ def send_telegram_notification(mensaje):
     """Envía notificación por Telegram"""
     if not TELEGRAM_ENABLED:
         return False
+    return _enviar_telegram(TELEGRAM_TOKEN, TELEGRAM_CHAT_ID, mensaje)
+
+
+def send_watchlist_notification(mensaje):
+    """Envía una alerta de la watchlist a su canal propio (API_WATCHLIST / CHAT_ID_WATCHLIST)"""
+    if not TELEGRAM_WATCHLIST_ENABLED:
+        return False
+    return _enviar_telegram(TELEGRAM_WATCHLIST_TOKEN, TELEGRAM_WATCHLIST_CHAT_ID, mensaje)
+
 
+def _enviar_telegram(token, chat_id, mensaje):
     try:
-        url = f"https://api.telegram.org/bot{TELEGRAM_TOKEN}/sendMessage"
+        import requests
+        url = f"{TELEGRAM_API}/bot{token}/sendMessage"
         data = {
-            'chat_id': TELEGRAM_CHAT_ID,
+            'chat_id': chat_id,
             'text': mensaje,
             'parse_mode': 'HTML',
             'disable_web_page_preview': True
         }
-        response = requests.post(url, data=data, timeout=10)
+        with METRICAS.medir('telegram_seconds'):
+            response = requests.post(url, data=data, timeout=10)
+        if response.status_code != 200:
+            METRICAS.contador('telegram_errors_total').inc()
         return response.status_code == 200
     except Exception as e:
+        METRICAS.contador('telegram_errors_total').inc()
         logger.warning(f"Error enviando notificación Telegram: {e}")
         return False
 
 
 class ConsensusTracker:
     """Rastrea consenso multi-ballena por mercado en ventana de 30 minutos"""
-    def __init__(self, window_minutes=30):
+    def __init__(self, window_minutes=30, clock=time.time):
         self.window = window_minutes * 60
         self.trades = {}
+        self.clock = clock  # Inyectable: el replay usa un reloj simulado
 
     def add(self, market_id, side, value, wallet='', price=0.0, tier='', display_name=''):
         if market_id not in self.trades:
             self.trades[market_id] = []
         self.trades[market_id].append({
-            'timestamp': time.time(),
+            'timestamp': self.clock(),
             'side': side,
             'value': value,
             'wallet': wallet,
@@ -839,7 +663,7 @@ class ConsensusTracker:
         self._cleanup(market_id)
 
     def _cleanup(self, market_id):
-        now = time.time()
+        now = self.clock()
         self.trades[market_id] = [
             e for e in self.trades[market_id]
             if now - e['timestamp'] <= self.window
@@ -893,16 +717,17 @@ class ConsensusTracker:
 
 class CoordinationDetector:
     """Detecta ballenas coordinadas operando juntas"""
-    def __init__(self, coordination_window=300):
+    def __init__(self, coordination_window=300, clock=time.time):
         self.coordination_window = coordination_window
         self.market_trades = {}
+        self.clock = clock
 
     def add_trade(self, market_id, wallet, side, value):
         if market_id not in self.market_trades:
             self.market_trades[market_id] = []
 
         self.market_trades[market_id].append({
-            'timestamp': time.time(),
+            'timestamp': self.clock(),
             'wallet': wallet,
             'side': side,
             'value': value
@@ -910,7 +735,7 @@ class CoordinationDetector:
         self._cleanup(market_id)
 
     def _cleanup(self, market_id):
-        now = time.time()
+        now = self.clock()
         one_hour = 3600
         self.market_trades[market_id] = [
             t for t in self.market_trades[market_id]
@@ -922,7 +747,7 @@ class CoordinationDetector:
             return False, 0, "", []
 
         trades = self.market_trades[market_id]
-        now = time.time()
+        now = self.clock()
 
         recent_trades = [
             t for t in trades
@@ -944,13 +769,81 @@ class CoordinationDetector:
         return False, 0, "", []
 
 
+class WatchlistSubscriptions:
+    """
+    Wallets y traders seguidos, comprobados en O(1) contra cada trade del stream
+    global /trades que ya descarga el detector (sin peticiones extra por wallet).
+    Incluye WHITELIST_A/WHITELIST_B (por nombre, de CONFIG) y las entradas de un
+    archivo de watchlist (formato de individual_whale.py: wallet o nombre + alias opcional).
+    """
+    def __init__(self, entradas=(), incluir_whitelists=True):
+        self.entradas = list(entradas)
+        self.incluir_whitelists = incluir_whitelists
+        self.wallets = {}   # wallet (minúsculas) -> etiqueta
+        self.nombres = {}   # name/pseudonym (minúsculas) -> etiqueta
+        if incluir_whitelists:
+            for nombre in CONFIG.whitelist_b:
+                self.nombres[nombre.lower()] = f"{nombre} (WHITELIST_B)"
+            for nombre in CONFIG.whitelist_a:
+                self.nombres[nombre.lower()] = f"{nombre} (WHITELIST_A)"
+        for entrada, alias in self.entradas:
+            entrada = entrada.lower()
+            if entrada.startswith('0x') and len(entrada) == 42:
+                self.wallets[entrada] = alias or f"{entrada[:10]}...{entrada[-6:]}"
+            else:
+                self.nombres[entrada] = alias or entrada
+
+    @classmethod
+    def desde_archivo(cls, path, incluir_whitelists=True):
+        from individual_whale import cargar_watchlist
+        return cls(cargar_watchlist(path, permitir_nombres=True), incluir_whitelists)
+
+    def renovada(self):
+        """Copia con las whitelists de la CONFIG actual (tras un hot-reload)"""
+        return WatchlistSubscriptions(self.entradas, self.incluir_whitelists)
+
+    def __len__(self):
+        return len(self.wallets) + len(self.nombres)
+
+    def coincide(self, trade):
+        """Etiqueta de la suscripción que sigue al autor del trade, o None"""
+        if self.wallets:
+            etiqueta = self.wallets.get((trade.get('proxyWallet') or '').lower())
+            if etiqueta:
+                return etiqueta
+        if self.nombres:
+            for campo in ('name', 'pseudonym'):
+                etiqueta = self.nombres.get((trade.get(campo) or '').lower())
+                if etiqueta:
+                    return etiqueta
+        return None
+
+
+def es_ballena(valor: float, market_volume: float, umbral: float, params: dict = None) -> tuple:
+    """(es_ballena, mostrar_concentracion, pct_mercado): absoluta por umbral o relativa al volumen"""
+    p = SIGNAL_PARAMS if params is None else params
+    es_ballena_absoluta = valor >= umbral
+    es_ballena_relativa = (
+        market_volume > 0 and
+        (valor / market_volume) >= p['ballena_pct_mercado'] and
+        valor >= p['ballena_min_relativa']
+    )
+
+    pct_mercado = (valor / market_volume * 100) if market_volume > 0 else 0
+    mostrar_concentracion = es_ballena_relativa
+
+    return (es_ballena_absoluta or es_ballena_relativa), mostrar_concentracion, pct_mercado
+
+
 # ============================================================================
 # DETECTOR PRINCIPAL (GOLD EDITION)
 # ============================================================================
 
 class GoldWhaleDetector:
-    def __init__(self, umbral):
+    def __init__(self, umbral, watchlist=None):
         self.umbral = umbral
+        self.watchlist = watchlist if watchlist is not None else WatchlistSubscriptions()
+        self.alertas_watchlist = 0
 
         self.trades_vistos_ids = set()
         self.trades_vistos_deque = deque(maxlen=5000)
@@ -968,21 +861,29 @@ class GoldWhaleDetector:
         self.session = self._crear_session_con_retry()
 
         self.trade_filter = TradeFilter(self.session)
-        self.consensus = ConsensusTracker(window_minutes=30)
+        self.consensus = ConsensusTracker(window_minutes=SIGNAL_PARAMS['consenso_ventana_min'])
         self.coordination = CoordinationDetector(coordination_window=300)
 
+        from concurrent.futures import ThreadPoolExecutor
+        from sports_edge_detector import SportsEdgeDetector
+        from whale_stats import WhaleStatsStore
+        from whale_events import WhaleEventWriter
+
         odds_api_key = os.getenv("ODDS_API_KEY", "")
         self.sports_edge = SportsEdgeDetector(odds_api_key, self.session)
 
         self.analysis_executor = ThreadPoolExecutor(max_workers=3, thread_name_prefix="trader_analysis")
+        # Un solo hilo: las alertas de la watchlist salen en orden sin bloquear el ciclo
+        self.watchlist_executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="watchlist_alert")
         self.scrape_semaphore = threading.Semaphore(1)  # Solo 1 Chrome activo a la vez
         self.analysis_cache = {}
         self._pending_reclassification = {}  # wallet -> trade pendiente de re-clasificar cuando llegue tier
         self._pending_tier_supabase_ids = {}  # wallet -> supabase row id con tier='' para actualizar cuando llegue tier
 
-        self.supabase: Client | None = None
+        self.supabase = None   # supabase.Client si hay credenciales
         if SUPABASE_ENABLED and SUPABASE_URL and SUPABASE_KEY:
             try:
+                from supabase import create_client
                 self.supabase = create_client(SUPABASE_URL, SUPABASE_KEY)
                 logger.info("Supabase conectado para tracking de ballenas deportivas")
             except Exception as e:
@@ -995,32 +896,77 @@ class GoldWhaleDetector:
         self.historial_path = trades_live_dir / "historial_trades.json"
 
         self._cargar_historial()
+        self.stats_store = WhaleStatsStore()
+        self.event_writer = WhaleEventWriter()
+
+        self.ultimo_ciclo = 0.0
+        self._registrar_gauges()
+
+        # live_config.json: se relee en caliente sin perder consenso, caches ni trades vistos
+        self.vigilante_config = VigilanteConfig(CONFIG_PATH, CONFIG_DEFECTO, self._aplicar_config)
+        self.vigilante_config.revisar(forzar=True)
 
         signal_module.signal(signal_module.SIGINT, self.signal_handler)
         signal_module.signal(signal_module.SIGTERM, self.signal_handler)
 
         logger.info(f"Monitor GOLD iniciado. Umbral: ${self.umbral:,.2f}")
 
+    def _aplicar_config(self, cfg):
+        anterior = CONFIG
+        cambios = cfg.diferencias(anterior)
+        aplicar_config(cfg)
+        if cfg.whitelist_a != anterior.whitelist_a or cfg.whitelist_b != anterior.whitelist_b:
+            self.watchlist = self.watchlist.renovada()
+        self.consensus.window = SIGNAL_PARAMS['consenso_ventana_min'] * 60
+        METRICAS.contador('config_reloads_total').inc()
+        logger.info(f"🔧 Config aplicada desde {cfg.origen}"
+                    + (f" (cambia: {', '.join(cambios)})" if cambios else " (sin cambios)"))
+
+    def _registrar_gauges(self):
+        """Gauges de /metrics: se calculan al servir, sin coste en el ciclo"""
+        def hit_ratio():
+            por_cache = {}
+            for (cache, resultado), n in list(METRICAS.contador('cache_requests_total').valores.items()):
+                hits, total = por_cache.get(cache, (0, 0))
+                por_cache[cache] = (hits + (n if resultado == 'hit' else 0), total + n)
+            return {(cache,): hits / total for cache, (hits, total) in por_cache.items() if total}
+
+        METRICAS.gauge('last_cycle_timestamp_seconds', lambda: self.ultimo_ciclo,
+                       'Epoch del ultimo ciclo completado (alertar si deja de avanzar)')
+        METRICAS.gauge('uptime_seconds', lambda: time.time() - self.tiempo_inicio, 'Tiempo en marcha')
+        METRICAS.gauge('seen_trades', lambda: len(self.trades_vistos_ids), 'Trades en la ventana de deduplicacion')
+        METRICAS.gauge('cache_entries', lambda: {
+            ('mercados',): len(self.markets_cache),
+            ('volumen',): len(self.trade_filter.markets_cache),
+            ('tiers',): len(self.analysis_cache),
+        }, 'Entradas por cache', ('cache',))
+        METRICAS.gauge('cache_hit_ratio', hit_ratio, 'Proporcion de aciertos por cache', ('cache',))
+        METRICAS.gauge('executor_queue_depth', lambda: {
+            ('trader_analysis',): self.analysis_executor._work_queue.qsize(),
+            ('watchlist_alert',): self.watchlist_executor._work_queue.qsize(),
+        }, 'Tareas en cola por executor', ('executor',))
+        METRICAS.gauge('pending_reclassifications', lambda: len(self._pending_reclassification),
+                       'Trades esperando tier para re-clasificar')
+        METRICAS.gauge('pending_tier_updates', lambda: len(self._pending_tier_supabase_ids),
+                       'Filas de Supabase esperando tier')
+        METRICAS.gauge('process_resident_memory_bytes', rss_bytes, 'Memoria residente del proceso')
+
     def _crear_session_con_retry(self):
+        import requests
+        from requests.adapters import HTTPAdapter
+        from urllib3.util.retry import Retry
+
         session = requests.Session()
         retry = Retry(total=3, backoff_factor=1, status_forcelist=[429, 500, 502, 503, 504])
+        if montar_grabador(session, max_retries=retry):   # WHALE_RECORD: grabar respuestas
+            return session
         adapter = HTTPAdapter(max_retries=retry)
         session.mount('http://', adapter)
         session.mount('https://', adapter)
         return session
 
     def _es_ballena(self, valor: float, market_volume: float) -> tuple:
-        es_ballena_absoluta = valor >= self.umbral
-        es_ballena_relativa = (
-            market_volume > 0 and
-            (valor / market_volume) >= 0.03 and
-            valor >= 500
-        )
-
-        pct_mercado = (valor / market_volume * 100) if market_volume > 0 else 0
-        mostrar_concentracion = es_ballena_relativa
-
-        return (es_ballena_absoluta or es_ballena_relativa), mostrar_concentracion, pct_mercado
+        return es_ballena(valor, market_volume, self.umbral)
 
     def _cargar_historial(self):
         if self.historial_path.exists():
@@ -1057,6 +1003,8 @@ class GoldWhaleDetector:
             logger.info(f"Historial guardado: {len(self.trades_vistos_ids)} trades")
         except Exception as e:
             logger.error(f"Error al guardar historial: {e}")
+        self.stats_store.guardar()
+        self.event_writer.flush()
 
     def signal_handler(self, sig, frame):
         print("\n\nDeteniendo monitor...")
@@ -1076,6 +1024,7 @@ class GoldWhaleDetector:
         resumen += f"Total de ballenas:       {self.ballenas_detectadas}\n"
         resumen += f"Ballenas capturadas:     {self.ballenas_capturadas}\n"
         resumen += f"Ballenas ignoradas:      {self.ballenas_ignoradas}\n"
+        resumen += f"Alertas de watchlist:    {self.alertas_watchlist}\n"
 
         if self.ballenas_detectadas > 0:
             promedio = self.suma_valores_ballenas / self.ballenas_detectadas
@@ -1095,6 +1044,10 @@ class GoldWhaleDetector:
             for i, (mercado, count) in enumerate(top_mercados, 1):
                 resumen += f"   {i}. {mercado[:60]}... ({count} ballenas)\n"
 
+        latencias = METRICAS.resumen()
+        if latencias:
+            resumen += f"\nLATENCIAS POR ETAPA:\n{latencias}\n"
+
         resumen += f"\n{'='*80}\n"
 
         print(resumen)
@@ -1135,16 +1088,19 @@ class GoldWhaleDetector:
         return datetime.now()
 
     def obtener_trades(self):
+        import requests
         try:
             url = f"{DATA_API}/trades"
-            params = {"limit": LIMIT_TRADES}
+            params = {"limit": CONFIG.limit_trades}
             response = self.session.get(url, params=params, timeout=30)
             response.raise_for_status()
             return response.json()
         except requests.exceptions.RequestException as e:
+            METRICAS.contador('fetch_errors_total').inc()
             logger.error(f"Error de red/API: {e}")
             return []
         except json.JSONDecodeError:
+            METRICAS.contador('fetch_errors_total').inc()
             logger.error("Error decodificando JSON de la respuesta")
             return []
 
@@ -1152,7 +1108,9 @@ class GoldWhaleDetector:
         condition_id = trade.get('conditionId', trade.get('market', 'N/A'))
 
         if condition_id in self.markets_cache:
+            METRICAS.contador('cache_requests_total').inc(etiquetas=('mercados', 'hit'))
             return self.markets_cache[condition_id]
+        METRICAS.contador('cache_requests_total').inc(etiquetas=('mercados', 'miss'))
 
         info = {
             'question': trade.get('title', 'N/A'),
@@ -1196,22 +1154,59 @@ class GoldWhaleDetector:
                 'expected_roi': classification.get('expected_roi', 0.0) if classification else 0.0,
             }
 
-            result = self.supabase.table('whale_signals').insert(data).execute()
+            with METRICAS.medir('supabase_seconds'):
+                result = self.supabase.table('whale_signals').insert(data).execute()
 
             market_type = "deportiva" if edge_result.get('is_sports', False) else "general"
             logger.info(f"Ballena {market_type} registrada en Supabase: {data['market_title'][:50]}")
 
+            row_id = None
+            if result.data and isinstance(result.data[0], dict):
+                row_id = result.data[0].get('id')
+            self.stats_store.registrar_senal({**data, 'id': row_id})
+            from market_resolution import notificar_nueva_senal
+            notificar_nueva_senal()  # Despierta al validador si corre con --daemon
+
             # Devolver row ID si el tier está vacío, para poder actualizar cuando llegue el análisis
-            if not tier and result.data:
-                row = result.data[0]
-                if isinstance(row, dict):
-                    return row.get('id')
+            if not tier:
+                return row_id
 
         except Exception as e:
+            METRICAS.contador('supabase_errors_total').inc()
             logger.warning(f"Error registrando en Supabase: {e}", exc_info=True)
 
         return None
 
+    def _alerta_watchlist(self, trade, valor, etiqueta):
+        """Alerta de un trade de la watchlist: consola, log y canal de Telegram propio"""
+        self.alertas_watchlist += 1
+        METRICAS.contador('watchlist_alerts_total').inc()
+        side = (trade.get('side') or 'N/A').upper()
+        price = float(trade.get('price', 0) or 0)
+        title = trade.get('title', 'N/A')
+        outcome = trade.get('outcome', 'N/A')
+        wallet = trade.get('proxyWallet', 'N/A')
+
+        linea = f"[WATCHLIST] {etiqueta} | {side} {outcome} @ {price:.4f} | ${valor:,.2f} | {title[:70]}"
+        print(linea)
+        try:
+            with open(self.filename_log, "a", encoding="utf-8") as f:
+                f.write(f"{datetime.now().strftime('%Y-%m-%d %H:%M:%S')} {linea}\n")
+        except Exception as e:
+            logger.error(f"Error al escribir alerta de watchlist: {e}")
+
+        if TELEGRAM_WATCHLIST_ENABLED:
+            side_emoji = "📈" if side == "BUY" else "📉"
+            msg = f"<b>👁️ WATCHLIST — {etiqueta}</b>\n\n"
+            msg += f"{side_emoji} <b>{side}</b> {outcome} @ ${price:.4f}\n"
+            msg += f"💸 <b>Valor:</b> ${valor:,.2f}\n"
+            msg += f"📊 <b>Mercado:</b> {title[:80]}\n"
+            slug = trade.get('eventSlug') or trade.get('slug')
+            if slug:
+                msg += f"🔗 https://polymarket.com/event/{slug}\n"
+            msg += f"📍 <code>{wallet}</code>"
+            self.watchlist_executor.submit(send_watchlist_notification, msg)
+
     def _log_ballena(self, trade, valor, es_nicho=False, pct_mercado=0.0):
         self.suma_valores_ballenas += valor
         if valor > self.ballena_maxima['valor']:
@@ -1227,7 +1222,8 @@ class GoldWhaleDetector:
                 emoji, categoria = tier_emoji, tier_cat
                 break
 
-        is_valid, reason = self.trade_filter.is_worth_copying(trade, valor)
+        with METRICAS.medir('filter_seconds'):
+            is_valid, reason = self.trade_filter.is_worth_copying(trade, valor)
 
         slug = trade.get('slug', '')
         cache_key = slug or trade.get('conditionId', trade.get('market', ''))
@@ -1235,21 +1231,42 @@ class GoldWhaleDetector:
 
         if not is_valid:
                 self.ballenas_ignoradas += 1
+                METRICAS.contador('whales_total').inc(etiquetas=(categoria, 'ignorada'))
                 hora = datetime.now().strftime('%H:%M:%S')
                 print(f"[{hora}] BALLENA IGNORADA — {categoria} ${valor:,.0f} — Razon: {reason} | Volumen: ${market_volume:,.0f}")
+                self.event_writer.emitir({
+                    'detected_at': datetime.now().isoformat(),
+                    'timestamp': trade.get('timestamp') or trade.get('createdAt'),
+                    'categoria': categoria,
+                    'valor': valor,
+                    'market_title': trade.get('title', ''),
+                    'condition_id': trade.get('conditionId', trade.get('market', '')),
+                    'outcome': trade.get('outcome', ''),
+                    'side': trade.get('side', '').upper(),
+                    'price': float(trade.get('price', 0)),
+                    'volumen': market_volume,
+                    'wallet': trade.get('proxyWallet', 'N/A'),
+                    'display_name': trade.get('name') or trade.get('pseudonym') or 'Anonimo',
+                    'tx_hash': trade.get('transactionHash', 'N/A'),
+                    'es_nicho': es_nicho,
+                    'pct_mercado': pct_mercado,
+                    'filtro': {'valido': False, 'razon': reason},
+                })
                 return
 
+        METRICAS.contador('whales_total').inc(etiquetas=(categoria, 'capturada'))
         market_info = self._obtener_info_mercado(trade)
         ts = self._parsear_timestamp(trade.get('timestamp') or trade.get('createdAt'))
         side = trade.get('side', 'N/A').upper()
         price = float(trade.get('price', 0))
         outcome = trade.get('outcome', 'N/A')
 
-        edge_result = self.sports_edge.check_edge(
-            market_title=trade.get('title', ''),
-            poly_price=price,
-            side=side
-        )
+        with METRICAS.medir('edge_seconds'):
+            edge_result = self.sports_edge.check_edge(
+                market_title=trade.get('title', ''),
+                poly_price=price,
+                side=side
+            )
 
         self.ballenas_capturadas += 1
 
@@ -1274,6 +1291,7 @@ class GoldWhaleDetector:
         # Obtener tier del trader (del cache si ya fue analizado antes)
         cached_analysis = self.analysis_cache.get(wallet, None)
         trader_tier = cached_analysis.get('tier', '') if cached_analysis else ''
+        METRICAS.contador('cache_requests_total').inc(etiquetas=('tiers', 'hit' if cached_analysis else 'miss'))
 
         # Consenso multi-ballena (antes de classify para obtener opposite_tier)
         self.consensus.add(condition_id, side, valor, wallet, price, trader_tier, display_name)
@@ -1286,17 +1304,20 @@ class GoldWhaleDetector:
         opposite_tier_for_conflict = opposite_entries[0]['tier'] if opposite_entries else ""
 
         # --- CLASIFICACIÓN v3.0 (con tier real si está disponible) ---
-        classification = classify(
-            market_title=trade.get('title', ''),
-            tier=trader_tier,
-            poly_price=price,
-            is_nicho=es_nicho,
-            valor_usd=valor,
-            side=side,
-            display_name=display_name,
-            edge_pct=edge_result.get('edge_pct', 0.0),
-            opposite_tier=opposite_tier_for_conflict,
-        )
+        with METRICAS.medir('classify_seconds'):
+            classification = classify(
+                market_title=trade.get('title', ''),
+                tier=trader_tier,
+                poly_price=price,
+                is_nicho=es_nicho,
+                valor_usd=valor,
+                side=side,
+                display_name=display_name,
+                edge_pct=edge_result.get('edge_pct', 0.0),
+                opposite_tier=opposite_tier_for_conflict,
+            )
+        METRICAS.contador('signals_total').inc(etiquetas=(
+            classification.get('category', ''), classification['signal_id'], classification['action']))
 
         # Si tier es desconocido y la acción es IGNORE, guardar trade para re-clasificación retroactiva
         # (el análisis async se lanza más abajo y llenará analysis_cache → disparará el check)
@@ -1429,6 +1450,37 @@ class GoldWhaleDetector:
         with open(self.filename_log, "a", encoding="utf-8") as f:
             f.write(msg + "\n")
 
+        self.event_writer.emitir({
+            'detected_at': datetime.now().isoformat(),
+            'timestamp': ts.isoformat(),
+            'categoria': categoria,
+            'valor': valor,
+            'market_title': market_info.get('question', trade.get('title', '')),
+            'condition_id': condition_id,
+            'market_slug': market_slug,
+            'outcome': outcome,
+            'side': side,
+            'price': price,
+            'volumen': market_volume,
+            'wallet': wallet,
+            'display_name': display_name,
+            'tx_hash': tx_hash,
+            'es_nicho': es_nicho,
+            'pct_mercado': pct_mercado,
+            'filtro': {'valido': True, 'razon': reason},
+            'trader_tier': trader_tier,
+            'classification': classification,
+            'consensus': {
+                'activo': is_consensus, 'count': count,
+                'side': consensus_side, 'total_value': total_value,
+            },
+            'coordination': {
+                'activo': is_coordinated, 'count': coord_count,
+                'descripcion': coord_desc, 'wallets': coord_wallets,
+            },
+            'edge': edge_result,
+        })
+
         # === FILTRO ESTRATEGIA v3.0: solo notificar/analizar FOLLOW/COUNTER ===
         if classification['action'] == 'IGNORE':
             return
@@ -1504,7 +1556,8 @@ class GoldWhaleDetector:
             telegram_msg += f"\n🔗 <a href='{market_url}'>Ver mercado</a>"
 
             # 1) Enviar alerta del trade PRIMERO
-            send_telegram_notification(telegram_msg)
+            if send_telegram_notification(telegram_msg):
+                METRICAS.observar('alert_latency_seconds', max((datetime.now() - ts).total_seconds(), 0.0))
 
             # 2) Lanzar análisis del trader en background (enviará su propio mensaje después)
             self._analizar_trader_async(
@@ -1513,18 +1566,30 @@ class GoldWhaleDetector:
             )
 
     def _obtener_historial_trader(self, display_name: str) -> dict:
-        """Consulta Supabase para obtener historial de trades capturados de un trader."""
+        """
+        Historial de trades capturados de un trader.
+        Se lee de las estadísticas materializadas (O(1)) cuando el store ya se
+        reconstruyó desde Supabase; si no (solo tiene lo posterior al despliegue),
+        o el trader no está en él, se consulta Supabase.
+        """
+        self.stats_store.refrescar()
+        if self.stats_store.reconstruido:
+            historial = self.stats_store.historial_trader(display_name)
+            if historial:
+                return historial
+
         if not self.supabase:
             return {}
         try:
-            response = (
-                self.supabase.table('whale_signals')
-                .select('detected_at,market_title,side,poly_price,result,pnl_teorico,outcome')
-                .eq('display_name', display_name)
-                .order('detected_at', desc=True)
-                .limit(20)
-                .execute()
-            )
+            with METRICAS.medir('supabase_seconds'):
+                response = (
+                    self.supabase.table('whale_signals')
+                    .select('detected_at,market_title,side,poly_price,result,pnl_teorico,outcome')
+                    .eq('display_name', display_name)
+                    .order('detected_at', desc=True)
+                    .limit(20)
+                    .execute()
+                )
             trades = response.data if response.data else []
             if not trades:
                 return {}
@@ -1545,6 +1610,7 @@ class GoldWhaleDetector:
                 'recent': trades[:5],
             }
         except Exception as e:
+            METRICAS.contador('supabase_errors_total').inc()
             logger.warning(f"Error consultando historial de {display_name}: {e}")
             return {}
 
@@ -1650,9 +1716,11 @@ class GoldWhaleDetector:
                     pending_row_id = self._pending_tier_supabase_ids.pop(wallet, None)
                     if pending_row_id:
                         try:
-                            self.supabase.table('whale_signals').update({'tier': tier}).eq('id', pending_row_id).execute()
+                            with METRICAS.medir('supabase_seconds'):
+                                self.supabase.table('whale_signals').update({'tier': tier}).eq('id', pending_row_id).execute()
                             logger.info(f"Tier actualizado en Supabase (id={pending_row_id}): {tier} para {display_name}")
                         except Exception as _e:
+                            METRICAS.contador('supabase_errors_total').inc()
                             logger.warning(f"Error actualizando tier en Supabase (id={pending_row_id}): {_e}")
 
                 # === RECLASIFICACIÓN RETROACTIVA ===
@@ -1738,10 +1806,11 @@ class GoldWhaleDetector:
 
                 # FIX 5: Verificar umbral mínimo de trades para señal confiable
                 total_resolved = d.get('total_trades', 0)
-                if total_resolved < TRADER_MIN_TRADES_FOR_SIGNAL:
+                min_trades = CONFIG.trader_min_trades_for_signal
+                if total_resolved < min_trades:
                     low_trades_warning = (
                         f"\n⚠️ <b>MUESTRA INSUFICIENTE</b>: {total_resolved} trades resueltos "
-                        f"(mínimo recomendado: {TRADER_MIN_TRADES_FOR_SIGNAL})\n"
+                        f"(mínimo recomendado: {min_trades})\n"
                         f"WR histórico no es señal confiable todavía."
                     )
                 else:
@@ -1758,9 +1827,7 @@ class GoldWhaleDetector:
                 categories = d.get('categories', [])
                 if categories:
                     tg += f"\n<b>ESPECIALIZACION:</b>\n"
-                    sports_kw = ['win', 'vs', ' fc', 'nba', 'nfl', 'liga', 'premier',
-                                 'serie a', 'bundesliga', 'ligue', 'ufc', 'nhl', 'mlb', 'tennis', 'cup']
-                    is_current_sports = any(kw in title_lower for kw in sports_kw)
+                    is_current_sports = es_deportivo_trader(title_lower)
 
                     for cat in categories[:5]:
                         pnl = cat['pnl']
@@ -1828,16 +1895,19 @@ class GoldWhaleDetector:
 
     def ejecutar(self):
         telegram_status = "ACTIVO" if TELEGRAM_ENABLED else "DESACTIVADO"
+        watchlist_status = "ACTIVO" if TELEGRAM_WATCHLIST_ENABLED else "DESACTIVADO"
         resumen = f"""\n{'='*80}
 MONITOR GOLD v3.0 INICIADO
 {'='*80}
 Umbral de ballena:        ${self.umbral:,.2f} USD
 Intervalo de polling:     {INTERVALO_NORMAL} segundos
-Limite de trades/ciclo:   {LIMIT_TRADES}
-Ventana de tiempo:        {VENTANA_TIEMPO//60} minutos (solo trades recientes)
+Limite de trades/ciclo:   {CONFIG.limit_trades}
+Ventana de tiempo:        {CONFIG.ventana_tiempo//60} minutos (solo trades recientes)
+Config:                   {CONFIG.origen} (recarga en caliente: {CONFIG_PATH.name})
 Archivo de log:           {self.filename_log}
 Trades en memoria:        {len(self.trades_vistos_ids)}
 Notificaciones Telegram:  {telegram_status}
+Watchlist:                {len(self.watchlist.wallets)} wallets + {len(self.watchlist.nombres)} traders (canal {watchlist_status})
 Esperando trades...
 {'='*80}\n"""
 
@@ -1853,8 +1923,13 @@ Esperando trades...
         while self.running:
             start_time = time.time()
             ciclo += 1
+            self.vigilante_config.revisar()
+            ventana_tiempo = CONFIG.ventana_tiempo
 
-            trades = self.obtener_trades()
+            with METRICAS.medir('fetch_seconds'):
+                trades = self.obtener_trades()
+            METRICAS.contador('trades_ingested_total').inc(len(trades))
+            trades_por_estado = METRICAS.contador('trades_total')
 
             nuevos = 0
             ballenas_ciclo = 0
@@ -1871,12 +1946,14 @@ Esperando trades...
                     trade_id = f"{trade_internal_id}_{outcome}"
 
                     if trade_id in self.trades_vistos_ids:
+                        trades_por_estado.inc(etiquetas=('duplicado',))
                         continue
 
                     ts = self._parsear_timestamp(trade.get('timestamp') or trade.get('createdAt'))
                     edad_trade = (datetime.now() - ts).total_seconds()
 
-                    if edad_trade > VENTANA_TIEMPO:
+                    if edad_trade > ventana_tiempo:
+                        trades_por_estado.inc(etiquetas=('antiguo',))
                         if len(self.trades_vistos_deque) >= self.trades_vistos_deque.maxlen:
                             oldest_id = self.trades_vistos_deque[0]
                             self.trades_vistos_ids.discard(oldest_id)
@@ -1885,6 +1962,8 @@ Esperando trades...
                         continue
 
                     nuevos += 1
+                    trades_por_estado.inc(etiquetas=('nuevo',))
+                    METRICAS.observar('trade_age_seconds', max(edad_trade, 0.0))
 
                     try:
                         size = float(trade.get('size', 0))
@@ -1900,6 +1979,11 @@ Esperando trades...
                     self.trades_vistos_ids.add(trade_id)
                     self.trades_vistos_deque.append(trade_id)
 
+                    # Watchlist: cualquier trade de una wallet seguida, sin umbral de ballena
+                    etiqueta = self.watchlist.coincide(trade)
+                    if etiqueta:
+                        self._alerta_watchlist(trade, valor, etiqueta)
+
                     slug = trade.get('slug', '')
                     cache_key = slug or trade.get('conditionId', trade.get('market', ''))
                     market_volume = self.trade_filter.markets_cache.get(cache_key, 0)
@@ -1911,6 +1995,11 @@ Esperando trades...
                         ballenas_ciclo += 1
                         self.ballenas_detectadas += 1
 
+            METRICAS.contador('cycles_total').inc()
+            self.ultimo_ciclo = time.time()
+            # Sin ballenas nuevas emitir() no se llama: el tope de FLUSH_SEGUNDOS se revisa aquí
+            self.event_writer.volcar_si_vencido()
+
             hora_actual = datetime.now().strftime("%H:%M:%S")
             print(f"[{hora_actual}] Ciclo #{ciclo} | Trades: {len(trades)} | Nuevos: {nuevos} | Sobre umbral: {trades_sobre_umbral} | Totales: {self.ballenas_detectadas} | Capturadas: {self.ballenas_capturadas} | Ignoradas: {self.ballenas_ignoradas}")
 
@@ -1918,7 +2007,10 @@ Esperando trades...
                 self._guardar_historial()
 
             if ciclo % 100 == 0:
-                logger.info(f"Heartbeat: {len(self.trades_vistos_ids)} trades en memoria. Cache: {len(self.markets_cache)} | Capturadas: {self.ballenas_capturadas} | Ignoradas: {self.ballenas_ignoradas}")
+                logger.info(f"Heartbeat: {len(self.trades_vistos_ids)} trades en memoria. Cache: {len(self.markets_cache)} | Capturadas: {self.ballenas_capturadas} | Ignoradas: {self.ballenas_ignoradas} | RSS: {rss_bytes() / 1e6:.0f} MB")
+                latencias = METRICAS.resumen()
+                if latencias:
+                    logger.info(f"Latencias:\n{latencias}")
                 # BUG-7: Limpiar pending trades sin resolver (análisis falló o tardó > 10 min)
                 ahora = datetime.now()
                 expirados = [w for w, p in self._pending_reclassification.items()
@@ -1937,7 +2029,7 @@ Esperando trades...
                     logger.info(f"Cache cleanup: {len(caducados)} tiers caducados eliminados")
 
             elapsed = time.time() - start_time
-            sleep_time = max(0.5, INTERVALO_NORMAL - elapsed)
+            sleep_time = max(min(0.5, INTERVALO_NORMAL), INTERVALO_NORMAL - elapsed)
             time.sleep(sleep_time)
 
 
@@ -2116,6 +2208,13 @@ def main():
     parser.add_argument('--single', nargs='*', help='Clasificar un mercado: "titulo" tier precio valor [side] [nombre]')
     parser.add_argument('--demo', action='store_true', help='Ejecutar test cases de demo')
     parser.add_argument('--live', action='store_true', help='Modo live (monitor de ballenas)')
+    parser.add_argument('--serve', nargs='?', const='', metavar='DIRECCION',
+                        help='Servidor de clasificación JSON: host:puerto (HTTP) o unix:/ruta (NDJSON); '
+                             'por defecto WHALE_CLASSIFY_ADDR o 127.0.0.1:8790')
+    parser.add_argument('--metrics-port', type=int, default=METRICS_PORT,
+                        help='Con --live: puerto local del endpoint Prometheus /metrics (0 = desactivado)')
+    parser.add_argument('--watchlist', metavar='PATH',
+                        help='Con --live: alertar de todo trade de estas wallets/traders (además de WHITELIST_A/B)')
     args = parser.parse_args()
 
     if args.csv:
@@ -2135,6 +2234,9 @@ def main():
             side=parts[4] if len(parts) > 4 else "BUY",
             name=parts[5] if len(parts) > 5 else "Unknown",
         )
+    elif args.serve is not None:
+        from classify_server import servir, DIRECCION_DEFECTO
+        servir(classify, args.serve or DIRECCION_DEFECTO)
     elif args.demo:
         _run_demo()
     elif args.live:
@@ -2148,7 +2250,10 @@ def main():
             except ValueError:
                 print("Numero invalido")
 
-        detector = GoldWhaleDetector(umbral)
+        if args.metrics_port:
+            iniciar_servidor(METRICAS, args.metrics_port)
+        watchlist = WatchlistSubscriptions.desde_archivo(args.watchlist) if args.watchlist else None
+        detector = GoldWhaleDetector(umbral, watchlist)
         detector.ejecutar()
     else:
         # Por defecto: demo
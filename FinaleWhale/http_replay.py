@@ -0,0 +1,400 @@
+#!/usr/bin/env python3
+"""
+📼 GRABACIÓN Y REPLAY DE TRÁFICO HTTP (data-api, gamma-api, Odds API, Supabase, Telegram)
+
+Grabar (durante un --live real):
+    WHALE_RECORD=grabacion.jsonl.gz python gold_all_claude.py --live
+  Las sesiones de requests del detector montan un adaptador grabador: cada respuesta
+  (upstream, método, ruta, query, status, latencia, cuerpo) se añade al archivo
+  (JSONL comprimido con gzip, varios miembros concatenados).
+
+Reproducir sin red:
+    python http_replay.py servir grabacion.jsonl.gz --velocidad 10 --errores 0.01 --rate-429 0.02
+    WHALE_STANDIN=http://127.0.0.1:8787 WHALE_INTERVALO=0.3 python gold_all_claude.py --live
+
+  Con WHALE_STANDIN, url_base() redirige cada upstream a <standin>/<nombre>/...
+  El servidor avanza un reloj virtual (velocidad × tiempo real) y sirve, para cada
+  petición, la última respuesta grabada antes de ese instante. Los timestamps de
+  los trades de data-api se desplazan para que parezcan recientes. Supabase y
+  Telegram tienen respuestas sintéticas si no hay nada grabado.
+"""
+
+import os
+import sys
+import json
+import gzip
+import time
+import atexit
+import random
+import argparse
+import threading
+from bisect import bisect_right
+from collections import Counter
+from urllib.parse import urlsplit, parse_qsl, urlencode
+
+STANDIN_URL = os.getenv('WHALE_STANDIN', '').rstrip('/')
+RECORD_PATH = os.getenv('WHALE_RECORD', '')
+PUERTO = 8787
+FLUSH_CADA = 50   # Registros entre flush del gzip
+
+# Upstream → host real
+UPSTREAMS = {
+    'data-api': 'data-api.polymarket.com',
+    'gamma-api': 'gamma-api.polymarket.com',
+    'clob': 'clob.polymarket.com',
+    'polymarket': 'polymarket.com',
+    'odds-api': 'api.the-odds-api.com',
+    'telegram': 'api.telegram.org',
+}
+_HOSTS = {host: nombre for nombre, host in UPSTREAMS.items()}
+
+
+def url_base(nombre, defecto):
+    """URL base de un upstream: la real, o <WHALE_STANDIN>/<nombre><ruta> si hay stand-in"""
+    if not STANDIN_URL:
+        return defecto
+    ruta = urlsplit(defecto).path.rstrip('/') if defecto else ''
+    return f"{STANDIN_URL}/{nombre}{ruta}"
+
+
+def upstream_de(url):
+    """(nombre del upstream, ruta) de una URL real o del stand-in"""
+    partes = urlsplit(url)
+    if STANDIN_URL and url.startswith(STANDIN_URL):
+        nombre, _, resto = partes.path.lstrip('/').partition('/')
+        return nombre, '/' + resto
+    host = partes.hostname or ''
+    if host.endswith('.supabase.co'):
+        return 'supabase', partes.path
+    return _HOSTS.get(host, host), partes.path
+
+
+def _query_normalizada(query, descartar=('apiKey',)):
+    """Query ordenada y sin credenciales (clave de búsqueda estable)"""
+    return urlencode(sorted((k, v) for k, v in parse_qsl(query, keep_blank_values=True) if k not in descartar))
+
+
+# --- Grabación ---
+
+class Grabador:
+    """Escritor thread-safe del archivo de grabación (gzip en modo append)"""
+    def __init__(self, path):
+        self.path = path
+        self._lock = threading.Lock()
+        self._f = gzip.open(path, 'at', encoding='utf-8')
+        self._pendientes = 0
+        self.n = 0
+        atexit.register(self.cerrar)
+
+    def registrar(self, metodo, url, status, cuerpo, latencia, content_type=''):
+        nombre, ruta = upstream_de(url)
+        registro = {
+            't': round(time.time(), 3),
+            'up': nombre,
+            'm': metodo,
+            'p': ruta,
+            'q': _query_normalizada(urlsplit(url).query),
+            's': status,
+            'lat': round(latencia, 4),
+            'ct': content_type,
+            'b': cuerpo,
+        }
+        linea = json.dumps(registro, ensure_ascii=False) + "\n"
+        with self._lock:
+            if self._f is None:
+                return
+            self._f.write(linea)
+            self.n += 1
+            self._pendientes += 1
+            if self._pendientes >= FLUSH_CADA:
+                self._f.flush()
+                self._pendientes = 0
+
+    def cerrar(self):
+        with self._lock:
+            if self._f is not None:
+                self._f.close()
+                self._f = None
+
+
+_GRABADOR = None
+_GRABADOR_LOCK = threading.Lock()
+
+
+def grabador_global():
+    """Grabador compartido por todas las sesiones del proceso (WHALE_RECORD), o None"""
+    global _GRABADOR
+    if not RECORD_PATH:
+        return None
+    with _GRABADOR_LOCK:
+        if _GRABADOR is None:
+            _GRABADOR = Grabador(RECORD_PATH)
+    return _GRABADOR
+
+
+def _clase_adaptador():
+    """HTTPAdapter que además guarda cada respuesta en el Grabador (requests se importa aquí)"""
+    from requests.adapters import HTTPAdapter
+
+    class AdaptadorGrabador(HTTPAdapter):
+        def __init__(self, grabador, **kwargs):
+            self.grabador = grabador
+            super().__init__(**kwargs)
+
+        def send(self, request, **kwargs):
+            inicio = time.perf_counter()
+            respuesta = super().send(request, **kwargs)
+            if not kwargs.get('stream'):
+                try:
+                    self.grabador.registrar(
+                        request.method, request.url, respuesta.status_code, respuesta.text,
+                        time.perf_counter() - inicio, respuesta.headers.get('Content-Type', ''),
+                    )
+                except Exception:
+                    pass   # La grabación nunca debe romper el detector
+            return respuesta
+
+    return AdaptadorGrabador
+
+
+def montar_grabador(session, max_retries=0, pool_maxsize=10):
+    """Si WHALE_RECORD está definido, monta un adaptador grabador en la sesión. Devuelve si se montó"""
+    grabador = grabador_global()
+    if grabador is None:
+        return False
+    adapter = _clase_adaptador()(grabador, max_retries=max_retries, pool_maxsize=pool_maxsize)
+    session.mount('http://', adapter)
+    session.mount('https://', adapter)
+    return True
+
+
+# --- Archivo ---
+
+def leer_grabacion(path):
+    """Registros de un archivo de grabación (tolera una última línea truncada)"""
+    registros = []
+    with gzip.open(path, 'rt', encoding='utf-8') as f:
+        try:
+            for linea in f:
+                if linea.strip():
+                    try:
+                        registros.append(json.loads(linea))
+                    except json.JSONDecodeError:
+                        break
+        except EOFError:
+            pass   # Miembro gzip sin cerrar (proceso interrumpido)
+    registros.sort(key=lambda r: r['t'])
+    return registros
+
+
+# --- Stand-in ---
+
+class _Serie:
+    """Respuestas grabadas de una misma petición, ordenadas por tiempo"""
+    __slots__ = ('ts', 'registros')
+
+    def __init__(self):
+        self.ts = []
+        self.registros = []
+
+    def en(self, t):
+        i = bisect_right(self.ts, t) - 1
+        return self.registros[max(i, 0)]
+
+
+class Reproductor:
+    """
+    Índice de la grabación + reloj virtual + inyección de fallos.
+
+    latencia: 'registrada' (la grabada / velocidad) o milisegundos fijos.
+    """
+    def __init__(self, registros, velocidad=1.0, latencia='registrada', errores=0.0,
+                 rate_429=0.0, bucle=False, seed=None):
+        self.exactas = {}
+        self.por_ruta = {}
+        for r in registros:
+            for indice, clave in ((self.exactas, (r['up'], r['m'], r['p'], r['q'])),
+                                  (self.por_ruta, (r['up'], r['m'], r['p']))):
+                serie = indice.setdefault(clave, _Serie())
+                serie.ts.append(r['t'])
+                serie.registros.append(r)
+        self.t_inicio = registros[0]['t'] if registros else time.time()
+        self.duracion = (registros[-1]['t'] - self.t_inicio) if registros else 0.0
+        self.velocidad = velocidad
+        self.latencia = latencia
+        self.errores = errores
+        self.rate_429 = rate_429
+        self.bucle = bucle
+        self.rng = random.Random(seed)
+        self.arranque = time.time()
+        self.stats = Counter()
+        self._supabase_id = 0
+        self._lock = threading.Lock()
+
+    def reloj_virtual(self):
+        transcurrido = (time.time() - self.arranque) * self.velocidad
+        if self.bucle and self.duracion > 0:
+            transcurrido %= self.duracion
+        return self.t_inicio + transcurrido
+
+    def _sintetica(self, up, metodo, cuerpo):
+        if up == 'telegram':
+            return 200, 'application/json', json.dumps({'ok': True, 'result': {'message_id': 1}})
+        if up == 'supabase':
+            if metodo == 'POST':
+                with self._lock:
+                    self._supabase_id += 1
+                    fila_id = self._supabase_id
+                try:
+                    fila = json.loads(cuerpo or '{}')
+                except json.JSONDecodeError:
+                    fila = {}
+                fila = fila[0] if isinstance(fila, list) and fila else fila
+                return 201, 'application/json', json.dumps([{**(fila if isinstance(fila, dict) else {}), 'id': fila_id}])
+            return 200, 'application/json', '[]'
+        return None
+
+    def _desplazar_timestamps(self, cuerpo, desfase):
+        try:
+            datos = json.loads(cuerpo)
+        except (json.JSONDecodeError, TypeError):
+            return cuerpo
+        if not isinstance(datos, list):
+            return cuerpo
+        for item in datos:
+            if isinstance(item, dict) and isinstance(item.get('timestamp'), (int, float)):
+                item['timestamp'] = int(item['timestamp'] + desfase)
+        return json.dumps(datos)
+
+    def responder(self, metodo, up, ruta, query, cuerpo=b''):
+        """(status, content_type, cuerpo, espera_s, cabeceras_extra)"""
+        tirada = self.rng.random()
+        if tirada < self.rate_429:
+            self.stats[(up, 429)] += 1
+            return 429, 'application/json', '{"error": "rate limited"}', 0.0, {'Retry-After': '1'}
+        if tirada < self.rate_429 + self.errores:
+            self.stats[(up, 500)] += 1
+            return 500, 'application/json', '{"error": "injected"}', 0.0, {}
+
+        virtual = self.reloj_virtual()
+        serie = (self.exactas.get((up, metodo, ruta, _query_normalizada(query)))
+                 or self.por_ruta.get((up, metodo, ruta)))
+        if serie is None:
+            sintetica = self._sintetica(up, metodo, cuerpo.decode('utf-8', 'replace') if cuerpo else '')
+            if sintetica is None:
+                self.stats[(up, 404)] += 1
+                return 404, 'application/json', '{"error": "sin grabación"}', 0.0, {}
+            status, ct, texto = sintetica
+            self.stats[(up, status)] += 1
+            return status, ct, texto, self._espera(None), {}
+
+        r = serie.en(virtual)
+        texto = r['b']
+        if up == 'data-api':
+            texto = self._desplazar_timestamps(texto, time.time() - virtual)
+        self.stats[(up, r['s'])] += 1
+        return r['s'], r.get('ct') or 'application/json', texto, self._espera(r), {}
+
+    def _espera(self, registro):
+        if self.latencia == 'registrada':
+            return (registro['lat'] / self.velocidad) if registro else 0.0
+        return float(self.latencia) / 1000.0
+
+
+class _StandinHandlerMixin:
+    reproductor = None
+    protocol_version = 'HTTP/1.1'
+
+    def _atender(self):
+        partes = urlsplit(self.path)
+        up, _, resto = partes.path.lstrip('/').partition('/')
+        longitud = int(self.headers.get('Content-Length') or 0)
+        cuerpo = self.rfile.read(longitud) if longitud else b''
+        status, ct, texto, espera, extra = self.reproductor.responder(
+            self.command, up, '/' + resto, partes.query, cuerpo)
+        if espera > 0:
+            time.sleep(espera)
+        datos = texto.encode('utf-8')
+        self.send_response(status)
+        self.send_header('Content-Type', ct)
+        self.send_header('Content-Length', str(len(datos)))
+        for k, v in extra.items():
+            self.send_header(k, v)
+        self.end_headers()
+        self.wfile.write(datos)
+
+    do_GET = do_POST = do_PATCH = do_PUT = do_DELETE = _atender
+
+    def log_message(self, format, *args):
+        pass
+
+
+def servir(reproductor, puerto=PUERTO, host='127.0.0.1'):
+    """Crea el servidor stand-in (serve_forever lo arranca el llamador)"""
+    from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+    handler = type('StandinHandler', (_StandinHandlerMixin, BaseHTTPRequestHandler), {'reproductor': reproductor})
+    servidor = ThreadingHTTPServer((host, puerto), handler)
+    servidor.daemon_threads = True
+    return servidor
+
+
+def _info(registros):
+    if not registros:
+        print("📼 Grabación vacía")
+        return
+    duracion = registros[-1]['t'] - registros[0]['t']
+    print(f"📼 {len(registros):,} respuestas en {duracion / 60:.1f} min")
+    por_ruta = Counter((r['up'], r['m'], r['p']) for r in registros)
+    for (up, m, p), n in por_ruta.most_common(20):
+        print(f"   {n:>7,}  {up:<10} {m:<6} {p}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Stand-in HTTP que reproduce tráfico grabado")
+    sub = parser.add_subparsers(dest='comando', required=True)
+
+    p_servir = sub.add_parser('servir', help="Servir una grabación")
+    p_servir.add_argument('archivo')
+    p_servir.add_argument('--puerto', type=int, default=PUERTO)
+    p_servir.add_argument('--velocidad', type=float, default=1.0, help="Factor del reloj virtual (10 = 10× tiempo real)")
+    p_servir.add_argument('--latencia', default='registrada', help="'registrada' o milisegundos fijos")
+    p_servir.add_argument('--errores', type=float, default=0.0, help="Proporción de respuestas 500")
+    p_servir.add_argument('--rate-429', type=float, default=0.0, help="Proporción de respuestas 429")
+    p_servir.add_argument('--bucle', action='store_true', help="Volver al inicio al acabar la grabación")
+    p_servir.add_argument('--seed', type=int, default=None)
+
+    p_info = sub.add_parser('info', help="Resumen de una grabación")
+    p_info.add_argument('archivo')
+    args = parser.parse_args()
+
+    registros = leer_grabacion(args.archivo)
+    if args.comando == 'info':
+        _info(registros)
+        return
+
+    if args.latencia != 'registrada':
+        try:
+            float(args.latencia)
+        except ValueError:
+            parser.error("--latencia debe ser 'registrada' o un número de milisegundos")
+    reproductor = Reproductor(registros, args.velocidad, args.latencia, args.errores,
+                              args.rate_429, args.bucle, args.seed)
+    servidor = servir(reproductor, args.puerto)
+    _info(registros)
+    print(f"🎬 Stand-in en http://127.0.0.1:{servidor.server_port} (velocidad {args.velocidad:g}×)")
+    print(f"   WHALE_STANDIN=http://127.0.0.1:{servidor.server_port} python gold_all_claude.py --live")
+    try:
+        servidor.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        servidor.server_close()
+        print("\n📊 Respuestas servidas:")
+        for (up, status), n in sorted(reproductor.stats.items()):
+            print(f"   {up:<10} {status}: {n:,}")
+        sys.exit(0)
+
+
+if __name__ == "__main__":
+    main()
@@ -2,29 +2,90 @@
 """
 Script para monitorear trades de un usuario específico de Polymarket.
 Uso: python3 individual_whale.py <wallet_address>
+     python3 individual_whale.py --watchlist watchlist.txt   (varias wallets, un solo proceso)
 """
 
 import sys
+import random
+import asyncio
+import argparse
 import requests
 import time
 import os
+from collections import deque
 from datetime import datetime
+from concurrent.futures import ThreadPoolExecutor
+from requests.adapters import HTTPAdapter
 from dotenv import load_dotenv
+from http_replay import url_base
 
 load_dotenv()
 
 # Configuración
-DATA_API = "https://data-api.polymarket.com"
+DATA_API = url_base('data-api', "https://data-api.polymarket.com")
 TELEGRAM_TOKEN = os.getenv('API_INDIVIDUAL')
 CHAT_ID = os.getenv('CHAT_ID')
 CHECK_INTERVAL = 10  # Segundos entre checks
 
+# Modo multi-wallet (--watchlist)
+WATCHLIST_PATH = "watchlist.txt"
+INTERVALO_MIN = 5          # Wallet con actividad reciente
+INTERVALO_MAX = 120        # Wallet dormida
+FACTOR_ENFRIAMIENTO = 1.5  # Cada poll sin trades nuevos alarga el intervalo
+MAX_CONCURRENCIA = 8       # Peticiones simultáneas (pool de conexiones compartido)
+LIMIT_POLL = 25            # Trades por poll (la dedup cubre el solape)
+MAX_VISTOS = 500           # Trades recordados por wallet para deduplicar
+
+
+def _trade_id(trade):
+    """ID único de un trade (transactionHash o, si falta, timestamp + mercado + lado + tamaño)"""
+    tx_hash = trade.get('transactionHash')
+    if tx_hash:
+        return tx_hash
+    timestamp = trade.get('timestamp', '')
+    side = trade.get('side', '').upper()
+    size = float(trade.get('size', 0))
+    return f"{timestamp}_{trade.get('conditionId', '')}_{side}_{size}"
+
+
+def _ts_trade(trade):
+    """Timestamp epoch de un trade (0 si falta o no es numérico)"""
+    try:
+        return float(trade.get('timestamp', 0) or 0)
+    except (TypeError, ValueError):
+        return 0
+
+
+class VistosRecientes:
+    """Conjunto acotado: olvida los IDs más antiguos al superar maxlen"""
+    def __init__(self, maxlen=MAX_VISTOS):
+        self._orden = deque()
+        self._ids = set()
+        self.maxlen = maxlen
+
+    def __contains__(self, trade_id):
+        return trade_id in self._ids
+
+    def __len__(self):
+        return len(self._ids)
+
+    def add(self, trade_id):
+        if trade_id in self._ids:
+            return
+        self._ids.add(trade_id)
+        self._orden.append(trade_id)
+        if len(self._orden) > self.maxlen:
+            self._ids.discard(self._orden.popleft())
+
+
 class IndividualWhaleMonitor:
-    def __init__(self, wallet_address):
+    def __init__(self, wallet_address, session=None):
         self.wallet = wallet_address
-        self.session = requests.Session()
-        self.session.headers.update({'User-Agent': 'Mozilla/5.0'})
-        self.last_seen_trades = set()
+        if session is None:
+            session = requests.Session()
+            session.headers.update({'User-Agent': 'Mozilla/5.0'})
+        self.session = session
+        self.last_seen_trades = VistosRecientes()
         self.username = None
 
     def get_user_info(self):
@@ -72,13 +133,13 @@ class IndividualWhaleMonitor:
             self.username = 'Anónimo'
             return self.username
 
-    def get_recent_trades(self, limit=5):
+    def get_recent_trades(self, limit=5, fetch_limit=100):
         """Obtiene los últimos N trades del usuario"""
         try:
             url = f"{DATA_API}/trades"
             params = {
                 'user': self.wallet,  # Parámetro correcto (no 'maker')
-                '_limit': 100  # Obtener más para poder ordenar correctamente
+                '_limit': fetch_limit  # Obtener más para poder ordenar correctamente
             }
             response = self.session.get(url, params=params, timeout=10)
             trades = response.json()
@@ -123,12 +184,7 @@ class IndividualWhaleMonitor:
             hora = 'N/A'
 
         # Crear ID único usando múltiples campos (por si no hay transactionHash)
-        tx_hash = trade.get('transactionHash')
-        if tx_hash:
-            unique_id = tx_hash
-        else:
-            # Fallback: crear ID único con timestamp + conditionId + side + size
-            unique_id = f"{timestamp}_{trade.get('conditionId', '')}_{side}_{size}"
+        unique_id = _trade_id(trade)
 
         return {
             'market': market,
@@ -202,15 +258,7 @@ class IndividualWhaleMonitor:
 
         # Inicializar el set con TODOS los trades existentes
         for trade in all_trades:
-            tx_hash = trade.get('transactionHash')
-            if tx_hash:
-                self.last_seen_trades.add(tx_hash)
-            else:
-                timestamp = trade.get('timestamp', '')
-                side = trade.get('side', '').upper()
-                size = float(trade.get('size', 0))
-                trade_id = f"{timestamp}_{trade.get('conditionId', '')}_{side}_{size}"
-                self.last_seen_trades.add(trade_id)
+            self.last_seen_trades.add(_trade_id(trade))
 
         # Mostrar solo los primeros 5
         trades_info = []
@@ -231,30 +279,26 @@ class IndividualWhaleMonitor:
         # Enviar resumen por Telegram
         self.send_initial_summary(username, trades_info)
 
-    def check_new_trades(self):
-        """Verifica si hay nuevos trades"""
+    def check_new_trades(self, fetch_limit=100, limit=10):
+        """Verifica si hay nuevos trades; devuelve la lista de trades nuevos"""
+        nuevos = []
         try:
-            # Obtener últimos 10 trades (para asegurar que capturamos todos los nuevos)
-            recent_trades = self.get_recent_trades(10)
+            # Obtener los últimos `limit` trades (para asegurar que capturamos todos los nuevos)
+            recent_trades = self.get_recent_trades(limit, fetch_limit)
 
             for trade in recent_trades:
                 # Crear el mismo ID que en format_trade_info
-                tx_hash = trade.get('transactionHash')
-                if tx_hash:
-                    trade_id = tx_hash
-                else:
-                    timestamp = trade.get('timestamp', '')
-                    side = trade.get('side', '').upper()
-                    size = float(trade.get('size', 0))
-                    trade_id = f"{timestamp}_{trade.get('conditionId', '')}_{side}_{size}"
+                trade_id = _trade_id(trade)
 
                 # Si es un trade nuevo (no visto antes)
                 if trade_id and trade_id not in self.last_seen_trades:
                     self.last_seen_trades.add(trade_id)
                     self.notify_new_trade(trade)
+                    nuevos.append(trade)
 
         except Exception as e:
             print(f"⚠️ Error verificando nuevos trades: {e}")
+        return nuevos
 
     def notify_new_trade(self, trade):
         """Notifica un nuevo trade por consola y Telegram"""
@@ -310,17 +354,209 @@ class IndividualWhaleMonitor:
             self.send_telegram_alert(stop_msg)
 
 
+def cargar_watchlist(path, permitir_nombres=False):
+    """
+    Lee la watchlist: una wallet por línea, opcionalmente seguida de un alias.
+    Las líneas vacías y lo que va tras '#' se ignoran.
+    Devuelve [(wallet, alias|None)] sin duplicados, en el orden del archivo.
+
+    permitir_nombres=True acepta también nombres de usuario en lugar de wallets
+    (la suscripción de gold_all_claude compara con name/pseudonym del trade).
+    """
+    wallets = []
+    vistas = set()
+    with open(path, 'r', encoding='utf-8') as f:
+        for linea in f:
+            linea = linea.split('#', 1)[0].strip()
+            if not linea:
+                continue
+            partes = linea.split(None, 1)
+            wallet = partes[0].lower()
+            if not permitir_nombres and (not wallet.startswith('0x') or len(wallet) != 42):
+                print(f"⚠️ Watchlist: wallet con formato incorrecto ignorada: {partes[0]}")
+                continue
+            if wallet in vistas:
+                continue
+            vistas.add(wallet)
+            wallets.append((wallet, partes[1].strip() if len(partes) > 1 else None))
+    return wallets
+
+
+class _EstadoWallet:
+    """Estado de polling de una wallet dentro de MultiWalletMonitor"""
+    def __init__(self, monitor):
+        self.monitor = monitor          # IndividualWhaleMonitor (formato, dedup y alertas)
+        self.intervalo = CHECK_INTERVAL
+        self.ultimo_trade_ts = 0
+        self.polls = 0
+        self.trades_nuevos = 0
+
+    def ajustar_intervalo(self, hubo_nuevos):
+        """Con actividad → INTERVALO_MIN; sin ella el intervalo crece hasta INTERVALO_MAX"""
+        if hubo_nuevos:
+            self.intervalo = INTERVALO_MIN
+        else:
+            self.intervalo = min(self.intervalo * FACTOR_ENFRIAMIENTO, INTERVALO_MAX)
+
+    def intervalo_inicial(self, ahora):
+        """Cadencia de arranque según la antigüedad del último trade conocido"""
+        antiguedad = ahora - self.ultimo_trade_ts
+        if antiguedad < 3600:
+            self.intervalo = INTERVALO_MIN
+        elif antiguedad < 86400:
+            self.intervalo = CHECK_INTERVAL
+        else:
+            self.intervalo = INTERVALO_MAX
+
+
+class MultiWalletMonitor:
+    """
+    Monitorea varias wallets en un solo proceso.
+
+    Un único event loop de asyncio programa los polls de todas las wallets; las
+    peticiones HTTP (bloqueantes, requests) se ejecutan en un pool de hilos de
+    MAX_CONCURRENCIA sobre una Session compartida, así que el número de conexiones
+    abiertas no crece con el tamaño de la watchlist. Cada wallet ajusta su cadencia
+    a su actividad reciente (INTERVALO_MIN..INTERVALO_MAX) y deduplica con un
+    conjunto acotado (MAX_VISTOS).
+    """
+
+    def __init__(self, wallets, alertas=True, concurrencia=MAX_CONCURRENCIA):
+        self.session = requests.Session()
+        self.session.headers.update({'User-Agent': 'Mozilla/5.0'})
+        adapter = HTTPAdapter(pool_connections=4, pool_maxsize=concurrencia)
+        self.session.mount('https://', adapter)
+        self.session.mount('http://', adapter)
+        self.concurrencia = concurrencia
+        self.alertas = alertas
+        self.estados = {}
+        for wallet, alias in wallets:
+            monitor = IndividualWhaleMonitor(wallet, session=self.session)
+            monitor.username = alias
+            if not alertas:
+                monitor.send_telegram_alert = lambda message: None
+            self.estados[wallet] = _EstadoWallet(monitor)
+        self._loop = None
+        self._detener = None
+
+    @classmethod
+    def desde_archivo(cls, path=WATCHLIST_PATH, **kwargs):
+        return cls(cargar_watchlist(path), **kwargs)
+
+    # --- Trabajo bloqueante (se ejecuta en el pool de hilos) ---
+
+    def _inicializar_wallet(self, estado):
+        """Resuelve el username y marca como vistos los trades existentes (sin alertar)"""
+        monitor = estado.monitor
+        if not monitor.username:
+            monitor.get_user_info()
+        trades = monitor.get_recent_trades(MAX_VISTOS, MAX_VISTOS)
+        for trade in reversed(trades):
+            monitor.last_seen_trades.add(_trade_id(trade))
+        if trades:
+            estado.ultimo_trade_ts = _ts_trade(trades[0])
+        estado.intervalo_inicial(time.time())
+        return len(trades)
+
+    def _poll_wallet(self, estado):
+        monitor = estado.monitor
+        # Se revisa la página entera: el conjunto de vistos descarta el solape
+        nuevos = monitor.check_new_trades(LIMIT_POLL, limit=LIMIT_POLL)
+        for trade in nuevos:
+            estado.ultimo_trade_ts = max(estado.ultimo_trade_ts, _ts_trade(trade))
+        return nuevos
+
+    # --- Event loop ---
+
+    async def _vigilar(self, estado, executor):
+        loop = asyncio.get_running_loop()
+        # Arranque escalonado: evita que todas las wallets pidan a la vez
+        await self._esperar(random.uniform(0, estado.intervalo))
+        while not self._detener.is_set():
+            nuevos = await loop.run_in_executor(executor, self._poll_wallet, estado)
+            estado.polls += 1
+            estado.trades_nuevos += len(nuevos)
+            estado.ajustar_intervalo(bool(nuevos))
+            await self._esperar(estado.intervalo)
+
+    async def _esperar(self, segundos):
+        try:
+            await asyncio.wait_for(self._detener.wait(), timeout=segundos)
+        except asyncio.TimeoutError:
+            pass
+
+    async def _principal(self):
+        self._loop = asyncio.get_running_loop()
+        self._detener = asyncio.Event()
+        with ThreadPoolExecutor(max_workers=self.concurrencia, thread_name_prefix='watchlist') as executor:
+            estados = list(self.estados.values())
+            totales = await asyncio.gather(*(
+                self._loop.run_in_executor(executor, self._inicializar_wallet, e) for e in estados
+            ))
+            print(f"\n🐋 Watchlist: {len(estados)} wallets, {sum(totales)} trades previos marcados como vistos")
+            for e in estados:
+                print(f"   👤 {e.monitor.username:<25} {e.monitor.wallet}  ⏱️ {e.intervalo:.0f}s")
+            self._resumen_inicio()
+            await asyncio.gather(*(self._vigilar(e, executor) for e in estados))
+
+    def _resumen_inicio(self):
+        if not self.alertas or not self.estados:
+            return
+        msg = f"<b>🐋 Monitor Multi-Wallet Iniciado</b>\n\n"
+        msg += f"👥 <b>Wallets:</b> {len(self.estados)}\n"
+        for e in self.estados.values():
+            msg += f"• {e.monitor.username} <code>{e.monitor.wallet[:10]}...</code>\n"
+        msg += f"\n🔍 <b>Estado:</b> Monitoreando activamente"
+        next(iter(self.estados.values())).monitor.send_telegram_alert(msg)
+
+    def ejecutar(self):
+        """Bloquea hasta Ctrl+C"""
+        if not self.estados:
+            print("❌ La watchlist está vacía")
+            return
+        try:
+            asyncio.run(self._principal())
+        except KeyboardInterrupt:
+            print("\n\n⛔ Monitoreo detenido por el usuario.")
+
+    def estadisticas(self):
+        return {
+            wallet: {'username': e.monitor.username, 'intervalo': e.intervalo,
+                     'polls': e.polls, 'trades_nuevos': e.trades_nuevos}
+            for wallet, e in self.estados.items()
+        }
+
+
 def main():
+    parser = argparse.ArgumentParser(description="Monitor de trades de wallets de Polymarket")
+    parser.add_argument('wallet', nargs='?', help="Wallet a monitorear (0x...)")
+    parser.add_argument('--watchlist', metavar='PATH',
+                        help=f"Archivo con varias wallets (una por línea, alias opcional). Ej: {WATCHLIST_PATH}")
+    parser.add_argument('--concurrencia', type=int, default=MAX_CONCURRENCIA,
+                        help="Peticiones simultáneas en modo watchlist")
+    args = parser.parse_args()
+
     # Verificar argumentos
-    if len(sys.argv) < 2:
-        print("❌ Error: Debes proporcionar una wallet address")
+    if not args.wallet and not args.watchlist:
+        print("❌ Error: Debes proporcionar una wallet address o --watchlist")
         print("\nUso:")
         print("  python3 individual_whale.py <wallet_address>")
+        print("  python3 individual_whale.py --watchlist watchlist.txt")
         print("\nEjemplo:")
         print("  python3 individual_whale.py 0x1234567890abcdef...")
         sys.exit(1)
 
-    wallet_address = sys.argv[1]
+    # Verificar configuración de Telegram
+    if not TELEGRAM_TOKEN or not CHAT_ID:
+        print("\n⚠️ Advertencia: Telegram no configurado")
+        print("   Asegúrate de tener API_INDIVIDUAL y CHAT_ID en tu .env")
+        print("   El script funcionará, pero sin alertas por Telegram.\n")
+
+    if args.watchlist:
+        MultiWalletMonitor.desde_archivo(args.watchlist, concurrencia=args.concurrencia).ejecutar()
+        return
+
+    wallet_address = args.wallet
 
     # Validar formato básico de wallet
     if not wallet_address.startswith('0x') or len(wallet_address) != 42:
@@ -331,12 +567,6 @@ def main():
             print("Operación cancelada.")
             sys.exit(0)
 
-    # Verificar configuración de Telegram
-    if not TELEGRAM_TOKEN or not CHAT_ID:
-        print("\n⚠️ Advertencia: Telegram no configurado")
-        print("   Asegúrate de tener API_INDIVIDUAL y CHAT_ID en tu .env")
-        print("   El script funcionará, pero sin alertas por Telegram.\n")
-
     # Iniciar monitor
     monitor = IndividualWhaleMonitor(wallet_address)
     monitor.run()
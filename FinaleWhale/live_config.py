@@ -0,0 +1,233 @@
+#!/usr/bin/env python3
+"""
+🔧 CONFIGURACIÓN EN CALIENTE DEL DETECTOR LIVE (gold_all_claude.py --live)
+
+Whitelists, blacklist, umbrales del ciclo, SIGNAL_PARAMS y keywords de
+categoría se leen de un JSON opcional (live_config.json junto al script o
+WHALE_LIVE_CONFIG). El detector revisa su mtime en cada ciclo; si cambia, el
+archivo se valida entero y, solo si es correcto, se publica un snapshot nuevo
+(ConfigLive) con una única asignación. Consenso, caches de análisis y trades
+vistos no se tocan. Si el archivo es inválido se mantiene la config anterior.
+
+Las claves ausentes vuelven al valor por defecto del código (borrar una clave
+deshace su cambio). Formato (todas las claves son opcionales):
+
+    {
+      "whitelist_a": ["hioa", "KeyTransporter"],
+      "whitelist_b": ["elkmonkey", "gmanas"],
+      "blacklist": ["sovereign2013"],
+      "trader_min_trades_for_signal": 15,
+      "limit_trades": 1000,
+      "ventana_tiempo": 1800,
+      "signal_params": {"capital_min": 2500},
+      "keywords": {"NBA": ["nba", "lakers", ...]}
+    }
+
+Uso:
+    python live_config.py validar [ruta]   # comprobar antes de guardar
+    python live_config.py volcar           # config por defecto como JSON de partida
+"""
+
+import os
+import sys
+import json
+import time
+import logging
+import argparse
+from pathlib import Path
+
+logger = logging.getLogger(__name__)
+
+CONFIG_PATH = Path(os.getenv('WHALE_LIVE_CONFIG', Path(__file__).with_name('live_config.json')))
+INTERVALO_REVISION = 2.0   # segundos mínimos entre dos stat() del archivo
+
+_LISTAS = ('whitelist_a', 'whitelist_b', 'blacklist')
+_ENTEROS = {  # clave -> mínimo admitido
+    'trader_min_trades_for_signal': 0,
+    'limit_trades': 1,
+    'ventana_tiempo': 1,
+}
+
+
+class ConfigInvalida(ValueError):
+    pass
+
+
+class ConfigLive:
+    """Snapshot inmutable (por convención) de la configuración del detector.
+
+    Las listas se guardan como tuplas (orden original, para mostrarlas) y como
+    frozensets en minúsculas (para comparar en classify sin reconstruirlas).
+    """
+    __slots__ = ('whitelist_a', 'whitelist_b', 'blacklist',
+                 'whitelist_a_lower', 'whitelist_b_lower', 'blacklist_lower',
+                 'trader_min_trades_for_signal', 'limit_trades', 'ventana_tiempo',
+                 'signal_params', 'keywords', 'origen')
+
+    def __init__(self, whitelist_a, whitelist_b, blacklist, trader_min_trades_for_signal,
+                 limit_trades, ventana_tiempo, signal_params, keywords, origen='código'):
+        self.whitelist_a = tuple(whitelist_a)
+        self.whitelist_b = tuple(whitelist_b)
+        self.blacklist = tuple(blacklist)
+        self.whitelist_a_lower = frozenset(w.lower() for w in self.whitelist_a)
+        self.whitelist_b_lower = frozenset(w.lower() for w in self.whitelist_b)
+        self.blacklist_lower = frozenset(b.lower() for b in self.blacklist)
+        self.trader_min_trades_for_signal = trader_min_trades_for_signal
+        self.limit_trades = limit_trades
+        self.ventana_tiempo = ventana_tiempo
+        self.signal_params = signal_params
+        self.keywords = keywords
+        self.origen = origen
+
+    def como_dict(self):
+        return {
+            'whitelist_a': list(self.whitelist_a),
+            'whitelist_b': list(self.whitelist_b),
+            'blacklist': list(self.blacklist),
+            'trader_min_trades_for_signal': self.trader_min_trades_for_signal,
+            'limit_trades': self.limit_trades,
+            'ventana_tiempo': self.ventana_tiempo,
+            'signal_params': dict(self.signal_params),
+            'keywords': {c: list(kws) for c, kws in self.keywords.items()},
+        }
+
+    def diferencias(self, otra):
+        """Claves cuyo valor cambia respecto a otra config (para el log)"""
+        a, b = self.como_dict(), otra.como_dict()
+        return [k for k in a if a[k] != b[k]]
+
+
+def _lista_textos(valor, clave):
+    if not isinstance(valor, list) or not all(isinstance(x, str) and x.strip() for x in valor):
+        raise ConfigInvalida(f"'{clave}' debe ser una lista de nombres no vacíos")
+    return valor
+
+
+def _lista_nombres(valor, clave):
+    return [x.strip() for x in _lista_textos(valor, clave)]
+
+
+def _lista_keywords(valor, clave):
+    """Keywords en minúsculas SIN strip: los espacios forman parte de la keyword ('wild ', ' ko ', 'fc ')"""
+    return tuple(kw.lower() for kw in _lista_textos(valor, clave))
+
+
+def validar(datos, defecto):
+    """dict leído del JSON → ConfigLive nueva (claves ausentes = valores de `defecto`)"""
+    if not isinstance(datos, dict):
+        raise ConfigInvalida("la raíz debe ser un objeto JSON")
+    desconocidas = set(datos) - set(_LISTAS) - set(_ENTEROS) - {'signal_params', 'keywords'}
+    if desconocidas:
+        raise ConfigInvalida(f"claves desconocidas: {', '.join(sorted(desconocidas))}")
+
+    valores = {k: (_lista_nombres(datos[k], k) if k in datos else getattr(defecto, k)) for k in _LISTAS}
+    for clave, minimo in _ENTEROS.items():
+        v = datos.get(clave, getattr(defecto, clave))
+        if isinstance(v, bool) or not isinstance(v, int) or v < minimo:
+            raise ConfigInvalida(f"'{clave}' debe ser un entero >= {minimo}")
+        valores[clave] = v
+
+    params = dict(defecto.signal_params)
+    for clave, v in (datos.get('signal_params') or {}).items():
+        if clave not in params:
+            raise ConfigInvalida(f"signal_params: clave desconocida '{clave}'")
+        if isinstance(v, bool) or not isinstance(v, (int, float)):
+            raise ConfigInvalida(f"signal_params.{clave} debe ser numérico")
+        params[clave] = v
+    valores['signal_params'] = params
+
+    keywords = dict(defecto.keywords)
+    for categoria, kws in (datos.get('keywords') or {}).items():
+        if categoria not in keywords:
+            raise ConfigInvalida(f"keywords: categoría desconocida '{categoria}' "
+                                 f"(válidas: {', '.join(keywords)})")
+        keywords[categoria] = _lista_keywords(kws, f"keywords.{categoria}")
+    valores['keywords'] = keywords
+
+    solapadas = ({b.lower() for b in valores['blacklist']}
+                 & {w.lower() for clave in ('whitelist_a', 'whitelist_b') for w in valores[clave]})
+    if solapadas:
+        raise ConfigInvalida(f"traders en whitelist y blacklist a la vez: {', '.join(sorted(solapadas))}")
+    return ConfigLive(**valores)
+
+
+def cargar(path, defecto):
+    try:
+        with open(path, 'r', encoding='utf-8') as f:
+            datos = json.load(f)
+    except json.JSONDecodeError as e:
+        raise ConfigInvalida(f"JSON inválido: {e}") from None
+    cfg = validar(datos, defecto)
+    cfg.origen = str(path)
+    return cfg
+
+
+class VigilanteConfig:
+    """Revisa el archivo (como mucho cada `intervalo` s) y llama a aplicar(cfg) si cambió y es válido"""
+
+    def __init__(self, path, defecto, aplicar, intervalo=INTERVALO_REVISION, reloj=time.monotonic):
+        self.path = Path(path)
+        self.defecto = defecto
+        self.aplicar = aplicar
+        self.intervalo = intervalo
+        self.reloj = reloj
+        self._firma = None
+        self._ultima_revision = None
+
+    def _firma_actual(self):
+        try:
+            st = self.path.stat()
+        except FileNotFoundError:
+            return None
+        return (st.st_mtime_ns, st.st_size)
+
+    def revisar(self, forzar=False):
+        """True si se aplicó una config nueva"""
+        ahora = self.reloj()
+        if not forzar and self._ultima_revision is not None and ahora - self._ultima_revision < self.intervalo:
+            return False
+        self._ultima_revision = ahora
+        firma, anterior = self._firma_actual(), self._firma
+        if firma == anterior and not forzar:
+            return False
+        self._firma = firma
+        if firma is None:
+            if anterior is None:
+                return False   # nunca hubo archivo: se sigue con la config del código
+            logger.info(f"🔧 {self.path} eliminado: se vuelve a la config por defecto")
+            self.aplicar(self.defecto)
+            return True
+        try:
+            cfg = cargar(self.path, self.defecto)
+        except (OSError, ConfigInvalida) as e:
+            logger.warning(f"🔧 Config {self.path} rechazada, se mantiene la anterior: {e}")
+            return False
+        self.aplicar(cfg)
+        return True
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Config en caliente del detector live")
+    sub = parser.add_subparsers(dest='comando', required=True)
+    p_validar = sub.add_parser('validar', help="Validar un archivo de config")
+    p_validar.add_argument('ruta', nargs='?', default=str(CONFIG_PATH))
+    sub.add_parser('volcar', help="Imprimir la config por defecto como JSON")
+    args = parser.parse_args()
+
+    # Import diferido: los valores por defecto viven en gold_all_claude
+    from gold_all_claude import CONFIG_DEFECTO
+
+    if args.comando == 'volcar':
+        print(json.dumps(CONFIG_DEFECTO.como_dict(), indent=2, ensure_ascii=False))
+        return
+    try:
+        cfg = cargar(args.ruta, CONFIG_DEFECTO)
+    except (OSError, ConfigInvalida) as e:
+        print(f"❌ {args.ruta}: {e}")
+        sys.exit(1)
+    cambios = cfg.diferencias(CONFIG_DEFECTO)
+    print(f"✅ {args.ruta} válida" + (f" (cambia: {', '.join(cambios)})" if cambios else " (igual al código)"))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,186 @@
+#!/usr/bin/env python3
+"""
+Cache local del estado de resolución de mercados de Polymarket.
+
+Lo usa validate_whale_results.py para no consultar la CLOB API en cada
+ejecución por mercados que no pueden haberse resuelto todavía:
+- Mercados resueltos: se guarda el outcome ganador de forma permanente.
+- Mercados abiertos: se guarda la próxima fecha de consulta, derivada de la
+  fecha de cierre del mercado (end_date_iso) o de un backoff exponencial
+  cuando el mercado ya debería haber cerrado y sigue sin ganador.
+
+También define el socket de aviso entre el detector y el validador en modo daemon.
+"""
+
+import os
+import json
+import socket
+import logging
+from datetime import datetime, timezone
+
+logger = logging.getLogger(__name__)
+
+CACHE_PATH = "market_resolution_cache.json"
+BACKOFF_BASE = 3600           # 1 hora (frecuencia del cron)
+BACKOFF_MAX = 24 * 3600       # Nunca esperar más de 24h entre consultas
+MARGEN_CIERRE = 3600          # Resolución típica: ~1h después del cierre del evento
+TOLERANCIA = 300              # El cron corre cada hora: no saltar un mercado por segundos
+
+# Socket Unix por el que el detector avisa al validador (modo --daemon) de señales nuevas
+VALIDATOR_SOCKET = os.getenv('WHALE_VALIDATOR_SOCKET', '/tmp/whale_validator.sock')
+
+
+def _parsear_fecha(valor):
+    """Convierte end_date_iso ('2026-02-20T00:00:00Z') a epoch. None si no se puede."""
+    if not valor:
+        return None
+    try:
+        dt = datetime.fromisoformat(str(valor).replace('Z', '+00:00'))
+        if dt.tzinfo is None:
+            dt = dt.replace(tzinfo=timezone.utc)
+        return dt.timestamp()
+    except ValueError:
+        return None
+
+
+def calcular_resultado(side, whale_outcome, poly_price, winning_outcome):
+    """
+    Resultado de la ballena con $100 de capital teórico.
+
+    Returns:
+        tuple (result, pnl_teorico)
+    """
+    side = side.upper()
+    poly_price = float(poly_price)
+
+    # Normalizar outcomes (YES/Yes/yes → YES, NO/No/no → NO)
+    whale_outcome_norm = whale_outcome.upper() if whale_outcome else ''
+    winning_outcome_norm = winning_outcome.upper() if winning_outcome else ''
+
+    if side == 'BUY':
+        # Si compró, ganó si su outcome coincide con el ganador
+        if whale_outcome_norm == winning_outcome_norm:
+            return 'WIN', 100 * (1 / poly_price - 1)
+        return 'LOSS', -100.0
+
+    # SELL: ganó si su outcome NO coincide con el ganador
+    if whale_outcome_norm != winning_outcome_norm:
+        # Al vender (short), si gana se queda con lo que recibió
+        return 'WIN', 100 * poly_price
+    # Al vender, si pierde, pierde lo que NO recibió (el complemento)
+    return 'LOSS', -(100 - 100 * poly_price)
+
+
+class ResolutionCache:
+    """Estado de resolución por condition_id persistido en JSON"""
+
+    def __init__(self, path=CACHE_PATH):
+        self.path = path
+        self.resueltos = {}   # condition_id -> {winning_outcome, market_title, resolved_at}
+        self.abiertos = {}    # condition_id -> {next_check, checks, end_date}
+        self._cargar()
+
+    def _cargar(self):
+        if not os.path.exists(self.path):
+            return
+        try:
+            with open(self.path, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+            self.resueltos = data.get('resueltos', {})
+            self.abiertos = data.get('abiertos', {})
+            logger.info(f"💾 Cache de resolución cargada: {len(self.resueltos)} resueltos, "
+                        f"{len(self.abiertos)} abiertos")
+        except Exception as e:
+            logger.warning(f"⚠️ No se pudo cargar cache de resolución ({self.path}): {e}")
+
+    def guardar(self):
+        """Escritura atómica (tmp + rename) para no corromper la cache si el proceso muere"""
+        tmp_path = f"{self.path}.tmp"
+        try:
+            with open(tmp_path, 'w', encoding='utf-8') as f:
+                json.dump({
+                    'resueltos': self.resueltos,
+                    'abiertos': self.abiertos,
+                    'ultima_actualizacion': datetime.now().isoformat(),
+                }, f)
+            os.replace(tmp_path, self.path)
+        except Exception as e:
+            logger.error(f"❌ Error guardando cache de resolución: {e}")
+
+    def resultado(self, condition_id):
+        """Devuelve el resultado cacheado (mismo formato que consultar_resultado_mercado) o None"""
+        entry = self.resueltos.get(condition_id)
+        if not entry:
+            return None
+        return {
+            'closed': True,
+            'winning_outcome': entry['winning_outcome'],
+            'market_title': entry.get('market_title', 'N/A'),
+        }
+
+    def debe_consultar(self, condition_id, now=None):
+        """True si el mercado puede haberse resuelto desde la última consulta"""
+        if condition_id in self.resueltos:
+            return False
+        entry = self.abiertos.get(condition_id)
+        if not entry:
+            return True
+        now = now if now is not None else datetime.now(timezone.utc).timestamp()
+        return entry['next_check'] <= now + TOLERANCIA
+
+    def proxima_consulta(self, condition_id):
+        """Epoch de la próxima consulta programada (None si no hay estado o ya está resuelto)"""
+        entry = self.abiertos.get(condition_id)
+        return entry['next_check'] if entry else None
+
+    def registrar_resuelto(self, condition_id, winning_outcome, market_title='N/A'):
+        self.abiertos.pop(condition_id, None)
+        self.resueltos[condition_id] = {
+            'winning_outcome': winning_outcome,
+            'market_title': market_title,
+            'resolved_at': datetime.now().isoformat(),
+        }
+
+    def registrar_abierto(self, condition_id, end_date=None, now=None):
+        """
+        Programa la próxima consulta de un mercado aún sin ganador.
+
+        - Cierre en el futuro: la consulta siguiente es cierre + MARGEN_CIERRE, pero
+          como mucho a BACKOFF_MAX de ahora: los mercados "by <fecha>" pueden
+          resolverse antes del cierre (un futuro de temporada cuesta 1 consulta/día).
+        - Cierre pasado o desconocido: backoff exponencial BACKOFF_BASE * 2^n,
+          limitado a BACKOFF_MAX.
+        """
+        now = now if now is not None else datetime.now(timezone.utc).timestamp()
+        prev = self.abiertos.get(condition_id, {})
+        checks = prev.get('checks', 0) + 1
+        end_ts = _parsear_fecha(end_date) or prev.get('end_date')
+
+        if end_ts and end_ts > now:
+            next_check = min(end_ts + MARGEN_CIERRE, now + BACKOFF_MAX)
+        else:
+            next_check = now + min(BACKOFF_BASE * (2 ** (checks - 1)), BACKOFF_MAX)
+
+        self.abiertos[condition_id] = {
+            'next_check': next_check,
+            'checks': checks,
+            'end_date': end_ts,
+        }
+        return next_check
+
+
+def notificar_nueva_senal(path=None):
+    """
+    Avisa (best-effort) al validador en modo daemon de que hay señales nuevas en
+    whale_signals. Es un datagrama vacío por socket Unix: si el daemon no está
+    corriendo no pasa nada y el cron/daemon las recogerá en su próximo recorrido.
+    """
+    path = path or VALIDATOR_SOCKET
+    sock = socket.socket(socket.AF_UNIX, socket.SOCK_DGRAM)
+    try:
+        sock.sendto(b'nueva', path)
+        return True
+    except OSError:
+        return False
+    finally:
+        sock.close()
@@ -22,25 +22,29 @@ import os
 import time
 import re
 import subprocess
+import shutil
+import importlib.util
 import json
 from datetime import datetime
+from functools import lru_cache
 from collections import defaultdict
 from requests.adapters import HTTPAdapter
 from urllib3.util.retry import Retry
 from whale_scorer import WhaleScorer
-
-# Verificar dependencias
-XVFB_AVAILABLE = subprocess.run(['which', 'xvfb-run'], capture_output=True).returncode == 0
-SELENIUM_AVAILABLE = False
-try:
-    import undetected_chromedriver as uc
-    from selenium.webdriver.common.by import By
-    SELENIUM_AVAILABLE = True
-except ImportError:
-    pass
+from taxonomy import subtipo_deporte
+from http_replay import url_base
+
+# Verificar dependencias del scraping (perezoso: el navegador corre en un
+# subproceso, así que basta con saber si selenium/xvfb existen, sin importarlos)
+@lru_cache(maxsize=None)
+def _scraping_disponible():
+    return (shutil.which('xvfb-run') is not None
+            and importlib.util.find_spec('undetected_chromedriver') is not None
+            and importlib.util.find_spec('selenium') is not None
+            and os.path.exists(CHROME_PATH))
 
 # --- CONFIGURACIÓN ---
-DATA_API = "https://data-api.polymarket.com"
+DATA_API = url_base('data-api', "https://data-api.polymarket.com")
 ANALYTICS_URL = "https://polymarketanalytics.com/traders"
 CHROME_PATH = os.path.expanduser("~/.cache/ms-playwright/chromium-1200/chrome-linux64/chrome")
 OUTPUT_DIR = "TraderAnalysis"
@@ -118,7 +122,7 @@ class TraderAnalyzer(WhaleScorer):
     # --- SCRAPING DE POLYMARKETANALYTICS ---
     def scrape_polymarketanalytics(self):
         """Extrae TODOS los datos disponibles de polymarketanalytics.com"""
-        if not SELENIUM_AVAILABLE or not XVFB_AVAILABLE or not os.path.exists(CHROME_PATH):
+        if not _scraping_disponible():
             print("   ⚠️  Scraping no disponible. Verificar dependencias.")
             return False
 
@@ -405,28 +409,6 @@ except Exception as e:
 
     def _detect_sport_subtypes(self, d):
         """Analiza biggest_wins y biggest_losses para detectar deportes específicos"""
-        sport_keywords = {
-            'NBA / Basketball': ['nba', 'lakers', 'celtics', 'bulls', 'warriors', 'nets', 'bucks',
-                                  'knicks', 'sixers', 'suns', 'nuggets', 'heat', 'basketball'],
-            'NFL / Football': ['nfl', 'chiefs', 'eagles', 'cowboys', 'packers', 'patriots',
-                                '49ers', 'ravens', 'bills', 'football', 'super bowl', 'touchdown'],
-            'Soccer / Premier League': ['premier', 'chelsea', 'arsenal', 'liverpool', 'tottenham',
-                                         'manchester', 'newcastle', 'epl'],
-            'Soccer / La Liga': ['la liga', 'barcelona', 'real madrid', 'atletico', 'sevilla',
-                                  'villarreal', 'betis'],
-            'Soccer / Ligue 1': ['ligue', 'lille', 'psg', 'lyon', 'marseille', 'monaco', 'paris'],
-            'Soccer / Serie A': ['serie a', 'inter', 'ac milan', 'juventus', 'napoli', 'roma', 'lazio'],
-            'Soccer / Bundesliga': ['bundesliga', 'bayern', 'dortmund', 'leverkusen', 'leipzig'],
-            'Soccer / Other': ['fc ', ' fc', 'united', 'city', 'cup', 'world cup', 'euro ',
-                                'champions league', 'copa'],
-            'MLB / Baseball': ['mlb', 'yankees', 'dodgers', 'astros', 'braves', 'mets', 'baseball'],
-            'NHL / Hockey': ['nhl', 'hockey', 'bruins', 'rangers', 'penguins', 'maple leafs'],
-            'UFC / MMA': ['ufc', 'mma', 'fight', 'boxing', 'bout'],
-            'Tennis': ['tennis', 'wimbledon', 'us open', 'french open', 'australian open',
-                        'roland garros', 'atp', 'wta'],
-            'Cricket': ['cricket', 'ipl', 'test match', 'odi', 't20'],
-        }
-
         subtypes = {}
         all_trades = []
         for w in d.get('biggest_wins', []):
@@ -435,13 +417,12 @@ except Exception as e:
             all_trades.append((l['market'].lower(), -l['amount']))
 
         for market, amount in all_trades:
-            for sport, keywords in sport_keywords.items():
-                if any(kw in market for kw in keywords):
-                    if sport not in subtypes:
-                        subtypes[sport] = {'pnl': 0, 'count': 0}
-                    subtypes[sport]['pnl'] += amount
-                    subtypes[sport]['count'] += 1
-                    break
+            sport = subtipo_deporte(market)
+            if sport:
+                if sport not in subtypes:
+                    subtypes[sport] = {'pnl': 0, 'count': 0}
+                subtypes[sport]['pnl'] += amount
+                subtypes[sport]['count'] += 1
 
         return subtypes
 
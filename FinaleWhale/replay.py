@@ -0,0 +1,398 @@
+#!/usr/bin/env python3
+"""
+🔁 REPLAY DE ESTRATEGIA v3.0 SOBRE TRADES ARCHIVADOS
+
+A diferencia de backtest.py (solo filtro de precio), reproduce la cadena real
+del detector GOLD trade a trade, en orden de timestamp:
+
+    TradeFilter → ConsensusTracker → classify → S2+/S1+ → CoordinationDetector
+
+con un reloj simulado (las ventanas de 30 min / 5 min usan la hora del trade,
+no time.time()) y sin red: el volumen de cada mercado sale del propio log.
+Los resultados se cruzan con la cache de resolución del validador
+(market_resolution_cache.json) y se reporta WR / ROI por señal.
+
+Uso:
+    python replay.py trades_live trades_live/events
+    python replay.py --archive trades_live/archive --desde 2026-02-01
+"""
+
+import os
+import sys
+import time
+import argparse
+from pathlib import Path
+from datetime import datetime
+from collections import defaultdict
+from concurrent.futures import ProcessPoolExecutor
+
+from market_resolution import ResolutionCache, CACHE_PATH, calcular_resultado
+
+VOLUMEN_DESCONOCIDO = 100_000  # Mismo valor que usa TradeFilter cuando falla la consulta de volumen
+
+
+class RelojSimulado:
+    """Reloj inyectable en ConsensusTracker/CoordinationDetector"""
+    def __init__(self):
+        self.ahora = 0.0
+
+    def __call__(self):
+        return self.ahora
+
+
+def _epoch(valor):
+    if not valor:
+        return None
+    try:
+        return datetime.fromisoformat(str(valor).replace('Z', '+00:00')).timestamp()
+    except ValueError:
+        return None
+
+
+def _trade_desde_log(t):
+    """Trade de backtest.py (columnas del .txt/.jsonl) → trade normalizado del replay"""
+    return {
+        'ts': _epoch(t.get('hora')),
+        'market_title': t.get('mercado', ''),
+        'condition_id': '',
+        'price': float(t.get('precio', 0)),
+        'side': 'BUY' if t.get('lado') == 'COMPRA' else 'SELL',
+        'valor': float(t.get('valor', 0)),
+        'outcome': t.get('outcome', ''),
+        'wallet': t.get('wallet', ''),
+        'display_name': t.get('nombre', '') or 'Anonimo',
+        'volumen': t.get('volumen'),
+        'tier': '',
+        'es_nicho': False,
+        'edge_pct': 0.0,
+    }
+
+
+def _trade_desde_evento(ev):
+    edge = ev.get('edge') or {}
+    return {
+        'ts': _epoch(ev.get('timestamp') or ev.get('detected_at')),
+        'market_title': ev.get('market_title', ''),
+        'condition_id': ev.get('condition_id', ''),
+        'price': float(ev.get('price', 0)),
+        'side': ev.get('side', ''),
+        'valor': float(ev.get('valor', 0)),
+        'outcome': ev.get('outcome', ''),
+        'wallet': ev.get('wallet', ''),
+        'display_name': ev.get('display_name', '') or 'Anonimo',
+        'volumen': ev.get('volumen'),
+        'tier': ev.get('trader_tier', '') or '',
+        'es_nicho': bool(ev.get('es_nicho')),
+        'edge_pct': float(edge.get('edge_pct', 0) or 0),
+    }
+
+
+def _trade_desde_archivo(fila):
+    return {
+        'ts': _epoch(fila['timestamp'] or fila['detected_at']),
+        'market_title': fila['market_title'] or '',
+        'condition_id': fila['condition_id'] or '',
+        'price': fila['price'] or 0.0,
+        'side': fila['side'] or '',
+        'valor': fila['valor'] or 0.0,
+        'outcome': fila['outcome'] or '',
+        'wallet': fila['wallet'] or '',
+        'display_name': fila['display_name'] or 'Anonimo',
+        'volumen': fila['volumen'],
+        'tier': fila['tier'] or '',
+        'es_nicho': bool(fila['es_nicho']),
+        'edge_pct': fila['edge_pct'] or 0.0,
+    }
+
+
+def cargar_trades(rutas=None, archivo=None, consulta=None):
+    """
+    Trades normalizados y ordenados por timestamp, desde logs/eventos (rutas)
+    o desde el archivo columnar (archivo + consulta de whale_archive). Las
+    ballenas de un .txt que ya están en los eventos de su día se cargan una vez.
+    """
+    trades = []
+    if archivo:
+        from whale_archive import consultar, EVENTOS
+        tabla = consultar(EVENTOS, archivo, **(consulta or {}))
+        trades = [_trade_desde_archivo(f) for f in tabla.to_pylist()]
+    else:
+        from backtest import resolver_logs, _parsear_archivo
+        from whale_events import leer_eventos, es_archivo_eventos
+        from whale_archive import _clave_whale, _eventos_del_dia
+
+        logs = resolver_logs(rutas)
+        eventos = [log for log in logs if es_archivo_eventos(log)]
+        claves_eventos = {}
+        # Los eventos traen tier/nicho/edge: mejor fidelidad que las columnas del .txt
+        for log in eventos:
+            claves = claves_eventos[log] = set()
+            for ev in leer_eventos(log):
+                trades.append(_trade_desde_evento(ev))
+                claves.add(_clave_whale({'timestamp': str(ev.get('timestamp') or ''),
+                                         'wallet': ev.get('wallet'), 'market_title': ev.get('market_title')}))
+        # Cada sesión escribe .txt y eventos: del .txt solo las ballenas que no estén
+        # en los eventos cargados de su día (misma clave que whale_archive)
+        for log in logs:
+            if es_archivo_eventos(log):
+                continue
+            ya_cargadas = set()
+            for archivo_eventos in _eventos_del_dia(log, eventos):
+                ya_cargadas |= claves_eventos.get(archivo_eventos, set())
+            columnas = _parsear_archivo(log)
+            claves = list(columnas.keys())
+            for v in zip(*columnas.values()):
+                t = dict(zip(claves, v))
+                clave = _clave_whale({'timestamp': t.get('hora') or '', 'wallet': t.get('wallet'),
+                                      'market_title': t.get('mercado')})
+                if clave not in ya_cargadas:
+                    trades.append(_trade_desde_log(t))
+
+    trades = [t for t in trades if t['ts'] is not None]
+    trades.sort(key=lambda t: t['ts'])
+    return trades
+
+
+def cargar_resoluciones(path=CACHE_PATH):
+    """condition_id → outcome ganador y título → outcome ganador (desde la cache del validador)"""
+    cache = ResolutionCache(path)
+    por_cid = {}
+    por_titulo = {}
+    for cid, entry in cache.resueltos.items():
+        por_cid[cid] = entry['winning_outcome']
+        titulo = entry.get('market_title')
+        if titulo and titulo != 'N/A':
+            por_titulo[titulo] = entry['winning_outcome']
+    return por_cid, por_titulo
+
+
+def resultado_senal(action, side, outcome, price, winning_outcome):
+    """
+    (result, pnl) de seguir la señal con $100, con la contabilidad del validador:
+    FOLLOW = mismo lado que la ballena, COUNTER = lado contrario.
+    """
+    if action == 'COUNTER':
+        side = 'SELL' if side == 'BUY' else 'BUY'
+    return calcular_resultado(side, outcome, price, winning_outcome)
+
+
+class ReplayEngine:
+    """
+    params: umbrales alternativos para classify/consenso (claves de SIGNAL_PARAMS).
+    umbral: si se indica, se re-aplica _es_ballena (umbral absoluto + regla relativa);
+    solo puede endurecer la detección, el log no contiene las no-ballenas.
+    """
+    def __init__(self, resoluciones=None, params=None, umbral=None):
+        # Import diferido: gold_all_claude trae dependencias del monitor en vivo
+        import gold_all_claude as gold
+
+        self.gold = gold
+        self.params = {**gold.SIGNAL_PARAMS, **(params or {})}
+        self.umbral = umbral
+        self.reloj = RelojSimulado()
+        self.trade_filter = gold.TradeFilter(None, markets_cache={})
+        self.consensus = gold.ConsensusTracker(window_minutes=self.params['consenso_ventana_min'],
+                                               clock=self.reloj)
+        self.coordination = gold.CoordinationDetector(coordination_window=300, clock=self.reloj)
+        self.por_cid, self.por_titulo = resoluciones or ({}, {})
+
+        self.procesados = 0
+        self.filtrados = 0
+        self.ignorados = 0
+        self.coordinados = 0
+        self.senales = defaultdict(lambda: {'count': 0, 'resolved': 0, 'wins': 0, 'losses': 0, 'pnl': 0.0})
+        self.duracion = 0.0
+
+    def _procesar(self, t):
+        gold = self.gold
+        self.reloj.ahora = t['ts']
+        self.procesados += 1
+
+        market_id = t['condition_id'] or t['market_title']
+        cache = self.trade_filter.markets_cache
+        if market_id not in cache:
+            cache[market_id] = t['volumen'] if t['volumen'] is not None else VOLUMEN_DESCONOCIDO
+
+        is_valid, _ = self.trade_filter.is_worth_copying(
+            {'price': t['price'], 'side': t['side'], 'conditionId': market_id}, t['valor']
+        )
+        if not is_valid:
+            self.filtrados += 1
+            return
+        if self.umbral is not None and not gold.es_ballena(
+                t['valor'], t['volumen'] or 0, self.umbral, self.params)[0]:
+            self.filtrados += 1
+            return
+
+        side = t['side']
+        price = t['price']
+        tier = t['tier']
+        self.consensus.add(market_id, side, t['valor'], t['wallet'], price, tier, t['display_name'])
+        is_consensus, count, _, _ = self.consensus.get_signal(market_id)
+
+        # Las entradas solo se consultan cuando cambian el resultado (misma lógica que _log_ballena):
+        # opposite_tier solo influye si el trader es HIGH RISK; S2+/S1+ solo con consenso de 3+
+        whale_entries = None
+        opposite_tier = ""
+        if 'HIGH RISK' in tier.upper():
+            whale_entries = self.consensus.get_whale_entries(market_id)
+            for e in whale_entries:
+                if e['side'] != side and 'HIGH RISK' in e.get('tier', '').upper():
+                    opposite_tier = e['tier']
+                    break
+
+        classification = gold.classify(
+            market_title=t['market_title'],
+            tier=tier,
+            poly_price=price,
+            is_nicho=t['es_nicho'],
+            valor_usd=t['valor'],
+            side=side,
+            display_name=t['display_name'],
+            edge_pct=t['edge_pct'],
+            opposite_tier=opposite_tier,
+            explain=False,
+            params=self.params,
+        )
+        action = classification['action']
+        signal_id = classification['signal_id']
+
+        # Overrides de consenso (mismo orden que GoldWhaleDetector._log_ballena)
+        if is_consensus and count >= 3:
+            if whale_entries is None:
+                whale_entries = self.consensus.get_whale_entries(market_id)
+            if gold.classify_consensus(t['market_title'], whale_entries).get('signal_id') == 'S2+':
+                action, signal_id = 'FOLLOW', 'S2+'
+            if gold.classify_consensus_counter(whale_entries).get('signal_id') == 'S1+':
+                action, signal_id = 'COUNTER', 'S1+'
+
+        self.coordination.add_trade(market_id, t['wallet'], side, t['valor'])
+        if self.coordination.detect_coordination(market_id, t['wallet'], side)[0]:
+            self.coordinados += 1
+
+        if action == 'IGNORE':
+            self.ignorados += 1
+            return
+
+        stats = self.senales[signal_id]
+        stats['count'] += 1
+        winner = self.por_cid.get(t['condition_id']) or self.por_titulo.get(t['market_title'])
+        if winner:
+            result, pnl = resultado_senal(action, side, t['outcome'], price, winner)
+            stats['resolved'] += 1
+            stats['wins' if result == 'WIN' else 'losses'] += 1
+            stats['pnl'] += pnl
+
+    def ejecutar(self, trades):
+        inicio = time.perf_counter()
+        for t in trades:
+            self._procesar(t)
+        self.duracion = time.perf_counter() - inicio
+        return self.senales
+
+    def contadores(self):
+        return {
+            'procesados': self.procesados,
+            'filtrados': self.filtrados,
+            'ignorados': self.ignorados,
+            'coordinados': self.coordinados,
+            'senales': {k: dict(v) for k, v in self.senales.items()},
+        }
+
+    def sumar(self, contadores):
+        for campo in ('procesados', 'filtrados', 'ignorados', 'coordinados'):
+            setattr(self, campo, getattr(self, campo) + contadores[campo])
+        for signal_id, s in contadores['senales'].items():
+            acc = self.senales[signal_id]
+            for k, v in s.items():
+                acc[k] += v
+
+    def reporte(self):
+        sep = "=" * 80
+        velocidad = self.procesados / self.duracion if self.duracion > 0 else 0
+        lineas = [
+            sep,
+            "🔁 REPLAY ESTRATEGIA v3.0",
+            sep,
+            f"Trades procesados:   {self.procesados:,} ({velocidad:,.0f} trades/s)",
+            f"Rechazados filtro:   {self.filtrados:,}",
+            f"Sin señal (IGNORE):  {self.ignorados:,}",
+            f"Coordinados:         {self.coordinados:,}",
+            sep,
+            f"{'Señal':<8} | {'Señales':>7} | {'Resueltas':>9} | {'W/L':>9} | {'WR':>6} | {'PnL':>10} | {'ROI':>7}",
+            "-" * 80,
+        ]
+        for signal_id in sorted(self.senales):
+            s = self.senales[signal_id]
+            wr = (s['wins'] / s['resolved'] * 100) if s['resolved'] else 0
+            roi = (s['pnl'] / (s['resolved'] * 100) * 100) if s['resolved'] else 0
+            lineas.append(
+                f"{signal_id:<8} | {s['count']:>7} | {s['resolved']:>9} | {s['wins']:>4}/{s['losses']:<4} | "
+                f"{wr:>5.1f}% | ${s['pnl']:>9.2f} | {roi:>+6.1f}%"
+            )
+        lineas.append(sep)
+        return "\n".join(lineas)
+
+
+def _replay_particion(args):
+    trades, resoluciones, params = args
+    engine = ReplayEngine(resoluciones, params)
+    engine.ejecutar(trades)
+    return engine.contadores()
+
+
+def replay_paralelo(trades, resoluciones=None, workers=None, params=None):
+    """
+    Replay repartiendo los trades por mercado entre procesos.
+    Es exacto: filtro, consenso y coordinación solo guardan estado por mercado,
+    y cada partición conserva el orden por timestamp.
+    """
+    workers = workers or os.cpu_count() or 1
+    engine = ReplayEngine(resoluciones, params)
+    if workers <= 1:
+        engine.ejecutar(trades)
+        return engine
+
+    particiones = [[] for _ in range(workers)]
+    for t in trades:
+        particiones[hash(t['condition_id'] or t['market_title']) % workers].append(t)
+
+    inicio = time.perf_counter()
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        for contadores in pool.map(_replay_particion, [(p, resoluciones, params) for p in particiones if p]):
+            engine.sumar(contadores)
+    engine.duracion = time.perf_counter() - inicio
+    return engine
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Replay de la estrategia v3.0 sobre trades archivados")
+    parser.add_argument('logs', nargs='*', help="Logs .txt, eventos .jsonl o directorios")
+    parser.add_argument('--archive', metavar='DIR', help="Leer del archivo columnar (whale_archive.py)")
+    parser.add_argument('--desde', help="Día inicial YYYY-MM-DD (con --archive)")
+    parser.add_argument('--hasta', help="Día final YYYY-MM-DD (con --archive)")
+    parser.add_argument('--categoria', help="Categoría (con --archive)")
+    parser.add_argument('--resoluciones', default=CACHE_PATH,
+                        help="Cache de resolución del validador (outcomes ganadores)")
+    parser.add_argument('--workers', type=int, default=None,
+                        help="Procesos (particionado por mercado; default: núcleos disponibles)")
+    args = parser.parse_args()
+
+    if not args.logs and not args.archive:
+        args.logs = ['trades_live']
+
+    consulta = {'desde': args.desde, 'hasta': args.hasta, 'categoria': args.categoria}
+    trades = cargar_trades(args.logs, args.archive, consulta)
+    if not trades:
+        print("❌ No se encontraron trades")
+        sys.exit(1)
+
+    engine = replay_paralelo(trades, cargar_resoluciones(args.resoluciones), args.workers)
+    print(engine.reporte())
+
+    if not Path(args.resoluciones).exists():
+        print(f"⚠️ Sin {args.resoluciones}: WR/ROI requieren ejecutar antes validate_whale_results.py")
+
+
+if __name__ == "__main__":
+    main()
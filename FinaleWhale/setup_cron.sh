@@ -23,6 +23,11 @@ echo "$CRON_ENTRY"
 echo ""
 echo "Esto ejecutará el validador cada hora en punto."
 echo ""
+echo "Alternativa (resultados casi en tiempo real, menos llamadas a la API):"
+echo "  cd $SCRIPT_DIR && nohup $PYTHON_PATH $VALIDATE_SCRIPT --daemon >> $SCRIPT_DIR/daemon_output.log 2>&1 &"
+echo "  (el detector GOLD avisa al daemon por socket Unix al registrar cada señal;"
+echo "   no combinar el daemon con el cron horario)"
+echo ""
 
 read -p "¿Deseas continuar? (s/n): " -n 1 -r
 echo
@@ -0,0 +1,288 @@
+#!/usr/bin/env python3
+"""
+📐 MOTOR DE REGLAS DE SEÑALES (signal_rules.json → classify)
+
+Las señales S1-S5 y la resolución de conflictos de gold_all_claude.classify
+viven en signal_rules.json. Aquí se compilan UNA vez por juego de umbrales
+(SIGNAL_PARAMS o el params= de classify) a una estructura indexada:
+
+    categoría → límites de precio ordenados → reglas candidatas del segmento
+
+Evaluar un trade es un dict.get por categoría, un bisect por precio y, para
+las pocas reglas del segmento, los predicados de tier / nicho / intraday.
+Una señal nueva se añade en el JSON, sin tocar código.
+
+Formato de cada regla de 'senales' (todas las claves son opcionales salvo id):
+- id, action, confidence, win_rate, reasoning: la señal (id null = solo warning)
+- categorias / excluir_categorias: lista de categorías de taxonomy
+- desde / hasta: límite de precio (número, "$clave" de SIGNAL_PARAMS o lista
+  de ellos → el más restrictivo); desde_incluido (true) / hasta_incluido (false)
+- tier_requiere / tier_excluye: subcadenas del tier en mayúsculas
+- nicho, intraday: true/false (intraday = título "Up or Down")
+- whitelist: {"A"|"B": {confidence?, reasoning (se añade al final)}}
+- warning: texto que se añade a warnings cuando la regla aplica
+
+Las plantillas de reasoning usan {precio}, {tier}, {category}, {display_name};
+las de conflictos, además, {ID[campo]} de las señales implicadas. Un conflicto
+('si' = ids presentes, o high_risk_ambos_lados) fija la señal ganadora ('gana',
+null = IGNORE) y opcionalmente su action/confidence; si ninguno aplica, gana la
+señal con precio más cercano a desempate.precio_objetivo.
+"""
+
+import os
+import json
+import threading
+from bisect import bisect_left
+from pathlib import Path
+
+REGLAS_PATH = Path(os.getenv('WHALE_SIGNAL_RULES', Path(__file__).with_name('signal_rules.json')))
+MAX_MOTORES = 64   # sweep.py compila una variante por configuración
+
+_INF = float('inf')
+
+
+class ReglasInvalidas(ValueError):
+    pass
+
+
+def cargar_reglas(path=REGLAS_PATH):
+    with open(path, 'r', encoding='utf-8') as f:
+        reglas = json.load(f)
+    if not isinstance(reglas.get('senales'), list):
+        raise ReglasInvalidas(f"{path}: falta la lista 'senales'")
+    return reglas
+
+
+def _valor(v, params, regla):
+    if isinstance(v, str) and v.startswith('$'):
+        try:
+            return params[v[1:]]
+        except KeyError:
+            raise ReglasInvalidas(f"Regla {regla.get('id')}: parámetro desconocido {v}") from None
+    if not isinstance(v, (int, float)):
+        raise ReglasInvalidas(f"Regla {regla.get('id')}: límite de precio inválido {v!r}")
+    return v
+
+
+def _limite(regla, clave, params, agregado, defecto):
+    v = regla.get(clave)
+    if v is None:
+        return defecto
+    if isinstance(v, list):
+        return agregado(_valor(x, params, regla) for x in v)
+    return _valor(v, params, regla)
+
+
+class _Regla:
+    """Regla de 'senales' con los umbrales ya resueltos"""
+    __slots__ = ('id', 'action', 'confidence', 'win_rate', 'reasoning', 'warning',
+                 'categorias', 'excluidas', 'desde', 'desde_incl', 'hasta', 'hasta_incl',
+                 'tier_requiere', 'tier_excluye', 'nicho', 'intraday', 'whitelist')
+
+    def __init__(self, regla, params):
+        self.id = regla.get('id')
+        self.action = regla.get('action')
+        self.confidence = regla.get('confidence')
+        self.win_rate = regla.get('win_rate', 0.0)
+        self.reasoning = regla.get('reasoning', '')
+        self.warning = regla.get('warning')
+        if self.id is None and self.warning is None:
+            raise ReglasInvalidas("Regla sin id ni warning")
+        if self.id is not None and not self.action:
+            raise ReglasInvalidas(f"Regla {self.id}: falta action")
+        self.categorias = frozenset(regla['categorias']) if 'categorias' in regla else None
+        self.excluidas = frozenset(regla.get('excluir_categorias', ()))
+        self.desde = _limite(regla, 'desde', params, max, -_INF)
+        self.desde_incl = regla.get('desde_incluido', True)
+        self.hasta = _limite(regla, 'hasta', params, min, _INF)
+        self.hasta_incl = regla.get('hasta_incluido', False)
+        self.tier_requiere = tuple(regla.get('tier_requiere', ()))
+        self.tier_excluye = tuple(regla.get('tier_excluye', ()))
+        self.nicho = regla.get('nicho')
+        self.intraday = regla.get('intraday')
+        self.whitelist = regla.get('whitelist') or {}
+
+    def admite_categoria(self, categoria):
+        if self.categorias is not None and categoria not in self.categorias:
+            return False
+        return categoria not in self.excluidas
+
+    def admite_precio(self, precio):
+        if precio < self.desde or (precio == self.desde and not self.desde_incl):
+            return False
+        return precio < self.hasta or (precio == self.hasta and self.hasta_incl)
+
+    def limites(self):
+        return [x for x in (self.desde, self.hasta) if x not in (_INF, -_INF)]
+
+
+class _Segmentos:
+    """Reglas de una categoría indexadas por segmento de precio.
+
+    Con límites ordenados b0 < b1 < … < bn-1, el segmento 2i+1 es el punto bi y
+    el 2i el intervalo abierto (bi-1, bi): así los límites inclusivos y
+    exclusivos se resuelven con un único bisect_left.
+    """
+    __slots__ = ('limites', 'reglas')
+
+    def __init__(self, reglas):
+        limites = sorted({x for r in reglas for x in r.limites()})
+        representantes = []
+        for i, b in enumerate(limites):
+            anterior = limites[i - 1] if i else b - 1.0
+            representantes.append((anterior + b) / 2)
+            representantes.append(b)
+        representantes.append(limites[-1] + 1.0 if limites else 0.0)
+        self.limites = limites
+        self.reglas = [tuple(r for r in reglas if r.admite_precio(x)) for x in representantes]
+
+
+class MotorSenales:
+    """Reglas compiladas para un juego de umbrales concreto"""
+
+    def __init__(self, reglas, params):
+        self.params = params
+        self.reglas = [_Regla(r, params) for r in reglas['senales']]
+        self.conflictos = []
+        for c in reglas.get('conflictos', ()):
+            self.conflictos.append((frozenset(c.get('si', ())), c.get('gana'), c.get('action'),
+                                    c.get('confidence'), c.get('reasoning', ''),
+                                    bool(c.get('high_risk_ambos_lados'))))
+        desempate = reglas.get('desempate', {})
+        self.precio_objetivo = desempate.get('precio_objetivo', 0.55)
+        self.reasoning_desempate = desempate.get('reasoning', '')
+
+        nombradas = set()
+        for r in self.reglas:
+            nombradas |= (r.categorias or set()) | r.excluidas
+        self.por_categoria = {c: _Segmentos([r for r in self.reglas if r.admite_categoria(c)])
+                              for c in nombradas}
+        # Cualquier categoría no nombrada en las reglas comparte el mismo índice
+        self.por_defecto = _Segmentos([r for r in self.reglas if r.categorias is None])
+
+    def evaluar(self, category, poly_price, tier, tier_upper, is_nicho, market_title,
+                display_name, whitelist_a, whitelist_b, warnings):
+        """Señales (en orden de reglas) que activa el trade; los warnings de reglas se añaden a `warnings`.
+        whitelist_a/whitelist_b: nombres de trader en minúsculas (gold_all_claude.CONFIG)."""
+        segmentos = self.por_categoria.get(category, self.por_defecto)
+        limites = segmentos.limites
+        i = bisect_left(limites, poly_price)
+        candidatas = segmentos.reglas[2 * i + 1 if i < len(limites) and limites[i] == poly_price else 2 * i]
+        senales = []
+        intraday = None
+        lista = False   # False = aún sin calcular
+        for r in candidatas:
+            if r.tier_requiere:
+                for t in r.tier_requiere:
+                    if t in tier_upper:
+                        break
+                else:
+                    continue
+            if r.tier_excluye:
+                for t in r.tier_excluye:
+                    if t in tier_upper:
+                        break
+                else:
+                    t = None
+                if t is not None:
+                    continue
+            if r.nicho is not None and bool(is_nicho) is not r.nicho:
+                continue
+            if r.intraday is not None:
+                if intraday is None:
+                    intraday = 'up or down' in market_title.lower()
+                if intraday is not r.intraday:
+                    continue
+            if r.id is None:
+                warnings.append(r.warning)
+                continue
+            confidence = r.confidence
+            reasoning = r.reasoning.format(precio=poly_price, tier=tier, category=category,
+                                           display_name=display_name)
+            if r.whitelist:
+                if lista is False:   # solo si la regla tiene modificador de whitelist
+                    nombre = display_name.lower()
+                    lista = 'A' if nombre in whitelist_a else 'B' if nombre in whitelist_b else None
+                extra = r.whitelist.get(lista) if lista else None
+                if extra:
+                    confidence = extra.get('confidence', confidence)
+                    reasoning += extra.get('reasoning', '').format(display_name=display_name)
+            senales.append({
+                "id": r.id,
+                "action": r.action,
+                "confidence": confidence,
+                "win_rate": r.win_rate,
+                "reasoning": reasoning,
+            })
+        return senales
+
+    def resolver(self, senales, result, tier_upper, poly_price, opposite_tier=""):
+        """Resuelve varias señales a una sola según 'conflictos' y 'desempate'"""
+        por_id = {}
+        for s in senales:
+            por_id.setdefault(s["id"], s)
+        for si, gana, action, confidence, reasoning, high_risk in self.conflictos:
+            if high_risk:
+                if not ('HIGH RISK' in tier_upper and 'HIGH RISK' in opposite_tier.upper()):
+                    continue
+            elif not si.issubset(por_id):
+                continue
+            if gana is None:
+                result["action"] = "IGNORE"
+                result["signal_id"] = "NONE"
+                result["confidence"] = "—"
+            else:
+                s = por_id[gana]
+                result["action"] = action or s["action"]
+                result["signal_id"] = gana
+                result["confidence"] = confidence or s["confidence"]
+                result["win_rate_hist"] = s["win_rate"]
+            result["reasoning"].append(reasoning.format(precio=poly_price, **por_id))
+            return result
+
+        best = min(senales, key=lambda s: abs(poly_price - self.precio_objetivo))
+        result["action"] = best["action"]
+        result["signal_id"] = best["id"]
+        result["confidence"] = best["confidence"]
+        result["win_rate_hist"] = best["win_rate"]
+        result["reasoning"].append(best["reasoning"])
+        result["reasoning"].append(self.reasoning_desempate.format(precio=poly_price))
+        return result
+
+
+_REGLAS = None
+_MOTORES = {}
+_LOCK = threading.Lock()
+
+
+def motor(params):
+    """MotorSenales para estos umbrales (compilado la primera vez y cacheado).
+
+    Se indexa por identidad del dict: los umbrales se tratan como inmutables
+    (sweep/replay pasan dicts nuevos; para cambiar SIGNAL_PARAMS, reasignarlo).
+    El motor guarda la referencia, así que el id no se reutiliza mientras viva.
+    """
+    global _REGLAS
+    m = _MOTORES.get(id(params))
+    if m is not None and m.params is params:
+        return m
+    with _LOCK:
+        if _REGLAS is None:
+            _REGLAS = cargar_reglas()
+        if len(_MOTORES) >= MAX_MOTORES:
+            _MOTORES.clear()
+        m = _MOTORES[id(params)] = MotorSenales(_REGLAS, params)
+    return m
+
+
+def recargar(path=REGLAS_PATH, params=None):
+    """Vuelve a leer el JSON (validándolo contra params si se pasan); los motores
+    se recompilan en el siguiente classify(). Si el JSON es inválido lanza
+    ReglasInvalidas y se mantienen las reglas anteriores."""
+    global _REGLAS
+    reglas = cargar_reglas(path)
+    if params is not None:
+        MotorSenales(reglas, params)
+    with _LOCK:
+        _REGLAS = reglas
+        _MOTORES.clear()
@@ -9,56 +9,11 @@ import time
 import logging
 import difflib
 
-logger = logging.getLogger(__name__)
+# Keywords compartidas (taxonomy.py); re-exportadas por compatibilidad
+from taxonomy import SPORTS_KEYWORDS, SPORT_MAP, es_deportivo, deporte_odds_api
+from http_replay import url_base
 
-SPORTS_KEYWORDS = [
-    'win', 'vs', 'match', 'game', 'score', 'beat', 'champion',
-    'nba', 'nfl', 'nhl', 'mlb', 'premier', 'liga', 'serie a',
-    'bundesliga', 'ligue', 'ufc', 'tennis', 'cup', 'tournament',
-    'fc ', ' fc', 'united', 'city', 'real ', 'atletico',
-    'lakers', 'celtics', 'bulls', 'warriors', 'nets',
-    'barcelona', 'madrid', 'bayern', 'dortmund', 'juventus',
-    'inter', 'milan', 'psg', 'lyon', 'lille', 'chelsea',
-    'arsenal', 'liverpool', 'tottenham', 'manchester',
-]
-
-# Mapeo de keywords a sport keys de The Odds API
-SPORT_MAP = {
-    'nba': 'basketball_nba',
-    'lakers': 'basketball_nba',
-    'celtics': 'basketball_nba',
-    'bulls': 'basketball_nba',
-    'warriors': 'basketball_nba',
-    'nets': 'basketball_nba',
-    'knicks': 'basketball_nba',
-    'bucks': 'basketball_nba',
-    'nfl': 'americanfootball_nfl',
-    'nhl': 'icehockey_nhl',
-    'mlb': 'baseball_mlb',
-    'premier': 'soccer_epl',
-    'chelsea': 'soccer_epl',
-    'arsenal': 'soccer_epl',
-    'liverpool': 'soccer_epl',
-    'tottenham': 'soccer_epl',
-    'manchester': 'soccer_epl',
-    'liga': 'soccer_spain_la_liga',
-    'barcelona': 'soccer_spain_la_liga',
-    'real ': 'soccer_spain_la_liga',
-    'atletico': 'soccer_spain_la_liga',
-    'ligue': 'soccer_france_ligue_one',
-    'lille': 'soccer_france_ligue_one',
-    'psg': 'soccer_france_ligue_one',
-    'lyon': 'soccer_france_ligue_one',
-    'paris': 'soccer_france_ligue_one',
-    'serie a': 'soccer_italy_serie_a',
-    'inter': 'soccer_italy_serie_a',
-    'milan': 'soccer_italy_serie_a',
-    'juventus': 'soccer_italy_serie_a',
-    'bundesliga': 'soccer_germany_bundesliga',
-    'bayern': 'soccer_germany_bundesliga',
-    'dortmund': 'soccer_germany_bundesliga',
-    'ufc': 'mma_mixed_martial_arts',
-}
+logger = logging.getLogger(__name__)
 
 CACHE_TTL = 300  # 5 minutos
 
@@ -67,7 +22,7 @@ class SportsEdgeDetector:
     def __init__(self, api_key, session):
         self.api_key = api_key
         self.session = session
-        self.base_url = "https://api.the-odds-api.com/v4"
+        self.base_url = url_base('odds-api', "https://api.the-odds-api.com/v4")
         self._cache = {}  # key -> (timestamp, result)
         self.enabled = bool(api_key)
 
@@ -94,7 +49,7 @@ class SportsEdgeDetector:
         title_lower = market_title.lower()
 
         # Paso 1: Detectar si es deportivo
-        if not any(kw in title_lower for kw in SPORTS_KEYWORDS):
+        if not es_deportivo(title_lower):
             return default_pass
 
         # Es deportivo
@@ -189,10 +144,7 @@ class SportsEdgeDetector:
 
     def _detect_sport(self, title_lower):
         """Detecta el deporte basado en keywords del titulo"""
-        for keyword, sport in SPORT_MAP.items():
-            if keyword in title_lower:
-                return sport
-        return 'soccer_epl'  # fallback
+        return deporte_odds_api(title_lower)  # fallback: soccer_epl
 
     def _get_pinnacle_odds(self, sport_key, team_name, side):
         """Busca odds de Pinnacle via The Odds API"""
@@ -0,0 +1,298 @@
+#!/usr/bin/env python3
+"""
+🧪 BARRIDO DE PARÁMETROS DE SEÑALES (grid / random search)
+
+Evalúa variantes de SIGNAL_PARAMS (zonas de precio de classify, regla 3%/$500
+de _es_ballena, ventana de consenso) con el replay de replay.py y devuelve una
+tabla ordenada por ROI / WR / nº de señales resueltas.
+
+- El dataset de trades se vuelca una sola vez a disco en columnas binarias
+  (array 'd' / 'i') y cada proceso del pool lo mapea en memoria (mmap) y lo
+  recorre sin copiarlo a una lista de dicts (ver DatasetMapeado).
+- Cada tarea del pool es una configuración completa.
+
+Uso:
+    python sweep.py trades_live --grid s2_precio_min=0.45,0.50,0.55 --grid s2_precio_max=0.60,0.65
+    python sweep.py --archive trades_live/archive --random 200 --rango s5_precio_min=0.55:0.70
+"""
+
+import os
+import sys
+import json
+import mmap
+import math
+import random
+import shutil
+import argparse
+import itertools
+import tempfile
+from array import array
+from pathlib import Path
+from concurrent.futures import ProcessPoolExecutor
+
+from market_resolution import CACHE_PATH
+from replay import ReplayEngine, cargar_trades, cargar_resoluciones
+
+COLUMNAS_NUMERICAS = ('ts', 'price', 'valor', 'volumen', 'edge_pct', 'es_nicho')
+COLUMNAS_TEXTO = ('market_title', 'condition_id', 'side', 'outcome', 'wallet', 'display_name', 'tier')
+MIN_RESUELTAS = 20
+
+# Estado por proceso del pool (lo rellena _iniciar_worker)
+_TRADES = None
+_RESOLUCIONES = None
+_UMBRAL = None
+
+
+# --- Dataset columnar compartido ---
+
+def volcar_dataset(trades, directorio):
+    """Escribe los trades en columnas binarias: numeros.f64, textos.i32 y cadenas.json"""
+    directorio = Path(directorio)
+    numeros = array('d')
+    for col in COLUMNAS_NUMERICAS:
+        for t in trades:
+            v = t[col]
+            numeros.append(math.nan if v is None else float(v))
+
+    cadenas = {}
+    textos = array('i')
+    for col in COLUMNAS_TEXTO:
+        for t in trades:
+            textos.append(cadenas.setdefault(t[col], len(cadenas)))
+
+    with open(directorio / 'numeros.f64', 'wb') as f:
+        numeros.tofile(f)
+    with open(directorio / 'textos.i32', 'wb') as f:
+        textos.tofile(f)
+    with open(directorio / 'cadenas.json', 'w', encoding='utf-8') as f:
+        json.dump({'n': len(trades), 'cadenas': list(cadenas)}, f, ensure_ascii=False)
+
+
+def _mapear(ruta, tipo):
+    with open(ruta, 'rb') as f:
+        if os.fstat(f.fileno()).st_size == 0:
+            return memoryview(b'').cast(tipo)
+        return memoryview(mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)).cast(tipo)
+
+
+class DatasetMapeado:
+    """
+    Trades del replay leídos directamente de las columnas mapeadas en memoria.
+
+    No materializa la lista de trades: cada iteración recorre las columnas y crea
+    el dict de un trade solo mientras el replay lo procesa. Los procesos del pool
+    comparten así las páginas del fichero (caché del sistema) y cada uno solo
+    guarda en su memoria la tabla de cadenas distintas.
+    """
+
+    def __init__(self, directorio):
+        directorio = Path(directorio)
+        with open(directorio / 'cadenas.json', 'r', encoding='utf-8') as f:
+            meta = json.load(f)
+        self.n, self.cadenas = meta['n'], meta['cadenas']
+        self.numeros = _mapear(directorio / 'numeros.f64', 'd')
+        self.textos = _mapear(directorio / 'textos.i32', 'i')
+
+    def __len__(self):
+        return self.n
+
+    def __iter__(self):
+        n, cadenas = self.n, self.cadenas
+        ts, price, valor, volumen, edge_pct, es_nicho = (
+            self.numeros[k * n:(k + 1) * n] for k in range(len(COLUMNAS_NUMERICAS)))
+        textos = [(col, self.textos[k * n:(k + 1) * n]) for k, col in enumerate(COLUMNAS_TEXTO)]
+        for i in range(n):
+            trade = {col: cadenas[indices[i]] for col, indices in textos}
+            vol = volumen[i]
+            trade.update({
+                'ts': ts[i],
+                'price': price[i],
+                'valor': valor[i],
+                'volumen': None if math.isnan(vol) else vol,
+                'edge_pct': edge_pct[i],
+                'es_nicho': bool(es_nicho[i]),
+            })
+            yield trade
+
+
+def cargar_dataset(directorio):
+    """Dataset columnar de volcar_dataset, iterable tantas veces como configuraciones"""
+    return DatasetMapeado(directorio)
+
+
+# --- Evaluación en el pool ---
+
+def _iniciar_worker(directorio, resoluciones, umbral):
+    global _TRADES, _RESOLUCIONES, _UMBRAL
+    _TRADES = cargar_dataset(directorio)
+    _RESOLUCIONES = resoluciones
+    _UMBRAL = umbral
+
+
+def _evaluar(params):
+    engine = ReplayEngine(_RESOLUCIONES, params, _UMBRAL)
+    engine.ejecutar(_TRADES)
+    return resumir(params, engine)
+
+
+def resumir(params, engine):
+    """Métricas agregadas (todas las señales accionables) de una configuración"""
+    total = {'count': 0, 'resolved': 0, 'wins': 0, 'losses': 0, 'pnl': 0.0}
+    for s in engine.senales.values():
+        for k in total:
+            total[k] += s[k]
+    resueltas = total['resolved']
+    return {
+        'params': params,
+        'senales': total['count'],
+        'resueltas': resueltas,
+        'wins': total['wins'],
+        'losses': total['losses'],
+        'wr': (total['wins'] / resueltas * 100) if resueltas else 0.0,
+        'pnl': total['pnl'],
+        'roi': (total['pnl'] / (resueltas * 100) * 100) if resueltas else 0.0,
+        'por_senal': {k: v['count'] for k, v in engine.senales.items()},
+    }
+
+
+def ejecutar_barrido(trades, configuraciones, resoluciones=None, workers=None, umbral=None):
+    """Evalúa cada configuración (dict parcial de SIGNAL_PARAMS) en paralelo"""
+    workers = workers or os.cpu_count() or 1
+    directorio = tempfile.mkdtemp(prefix='whale_sweep_')
+    try:
+        volcar_dataset(trades, directorio)
+        if workers <= 1:
+            _iniciar_worker(directorio, resoluciones, umbral)
+            return [_evaluar(c) for c in configuraciones]
+        chunksize = max(1, len(configuraciones) // (workers * 4))
+        with ProcessPoolExecutor(max_workers=workers, initializer=_iniciar_worker,
+                                 initargs=(directorio, resoluciones, umbral)) as pool:
+            return list(pool.map(_evaluar, configuraciones, chunksize=chunksize))
+    finally:
+        shutil.rmtree(directorio, ignore_errors=True)
+
+
+# --- Generación de configuraciones ---
+
+def _valor(clave, texto, base):
+    return int(float(texto)) if isinstance(base[clave], int) else float(texto)
+
+
+def configuraciones_grid(grid):
+    """grid: {clave: [valores]} → producto cartesiano de dicts"""
+    claves = list(grid)
+    return [dict(zip(claves, combinacion)) for combinacion in itertools.product(*grid.values())]
+
+
+def configuraciones_random(rangos, n, base, seed=None):
+    """rangos: {clave: (min, max)} → n configuraciones uniformes"""
+    rng = random.Random(seed)
+    configs = []
+    for _ in range(n):
+        config = {}
+        for clave, (lo, hi) in rangos.items():
+            if isinstance(base[clave], int):
+                config[clave] = rng.randint(int(lo), int(hi))
+            else:
+                config[clave] = round(rng.uniform(lo, hi), 2)
+        configs.append(config)
+    return configs
+
+
+def ranking(resultados, min_resueltas=MIN_RESUELTAS):
+    validos = [r for r in resultados if r['resueltas'] >= min_resueltas]
+    return sorted(validos, key=lambda r: (r['roi'], r['wr'], r['resueltas']), reverse=True)
+
+
+def tabla(resultados, top=20):
+    sep = "=" * 100
+    lineas = [
+        sep,
+        "🧪 BARRIDO DE PARÁMETROS",
+        sep,
+        f"{'#':>3} | {'Señales':>7} | {'Resueltas':>9} | {'WR':>6} | {'PnL':>10} | {'ROI':>7} | Parámetros",
+        "-" * 100,
+    ]
+    for i, r in enumerate(resultados[:top], 1):
+        params = ", ".join(f"{k}={v}" for k, v in r['params'].items()) or "(base)"
+        lineas.append(
+            f"{i:>3} | {r['senales']:>7} | {r['resueltas']:>9} | {r['wr']:>5.1f}% | "
+            f"${r['pnl']:>9.2f} | {r['roi']:>+6.1f}% | {params}"
+        )
+    lineas.append(sep)
+    return "\n".join(lineas)
+
+
+def main():
+    import gold_all_claude as gold
+
+    parser = argparse.ArgumentParser(description="Barrido de parámetros de señales sobre el replay")
+    parser.add_argument('logs', nargs='*', help="Logs .txt, eventos .jsonl o directorios")
+    parser.add_argument('--archive', metavar='DIR', help="Leer del archivo columnar (whale_archive.py)")
+    parser.add_argument('--desde', help="Día inicial YYYY-MM-DD (con --archive)")
+    parser.add_argument('--hasta', help="Día final YYYY-MM-DD (con --archive)")
+    parser.add_argument('--categoria', help="Categoría (con --archive)")
+    parser.add_argument('--resoluciones', default=CACHE_PATH,
+                        help="Cache de resolución del validador (outcomes ganadores)")
+    parser.add_argument('--grid', action='append', default=[], metavar='CLAVE=V1,V2,...',
+                        help="Valores a probar de un parámetro (repetible; producto cartesiano)")
+    parser.add_argument('--random', type=int, metavar='N', help="N configuraciones aleatorias sobre --rango")
+    parser.add_argument('--rango', action='append', default=[], metavar='CLAVE=MIN:MAX',
+                        help="Rango uniforme de un parámetro para --random (repetible)")
+    parser.add_argument('--seed', type=int, default=None, help="Semilla para --random")
+    parser.add_argument('--umbral', type=float, default=None,
+                        help="Re-aplicar _es_ballena con este umbral absoluto (para barrer ballena_*)")
+    parser.add_argument('--workers', type=int, default=None, help="Procesos (default: núcleos disponibles)")
+    parser.add_argument('--min-resueltas', type=int, default=MIN_RESUELTAS,
+                        help="Descartar configuraciones con menos señales resueltas")
+    parser.add_argument('--top', type=int, default=20, help="Filas de la tabla")
+    parser.add_argument('--json', metavar='PATH', help="Guardar todos los resultados en JSON")
+    args = parser.parse_args()
+
+    base = gold.SIGNAL_PARAMS
+    grid = {}
+    for item in args.grid:
+        clave, _, valores = item.partition('=')
+        if clave not in base or not valores:
+            parser.error(f"--grid inválido: {item} (claves: {', '.join(base)})")
+        grid[clave] = [_valor(clave, v, base) for v in valores.split(',')]
+    rangos = {}
+    for item in args.rango:
+        clave, _, rango = item.partition('=')
+        lo, _, hi = rango.partition(':')
+        if clave not in base or not lo or not hi:
+            parser.error(f"--rango inválido: {item} (claves: {', '.join(base)})")
+        rangos[clave] = (float(lo), float(hi))
+    if args.random and not rangos:
+        parser.error("--random requiere al menos un --rango")
+
+    configuraciones = [{}]   # La configuración actual siempre entra como referencia
+    if grid:
+        configuraciones += configuraciones_grid(grid)
+    if args.random:
+        configuraciones += configuraciones_random(rangos, args.random, base, args.seed)
+
+    if not args.logs and not args.archive:
+        args.logs = ['trades_live']
+    consulta = {'desde': args.desde, 'hasta': args.hasta, 'categoria': args.categoria}
+    trades = cargar_trades(args.logs, args.archive, consulta)
+    if not trades:
+        print("❌ No se encontraron trades")
+        sys.exit(1)
+
+    print(f"🧪 {len(configuraciones)} configuraciones × {len(trades):,} trades")
+    resultados = ejecutar_barrido(trades, configuraciones, cargar_resoluciones(args.resoluciones),
+                                  args.workers, args.umbral)
+    print(tabla(ranking(resultados, args.min_resueltas), args.top))
+
+    if args.json:
+        with open(args.json, 'w', encoding='utf-8') as f:
+            json.dump(resultados, f, indent=2, ensure_ascii=False)
+        print(f"💾 Resultados guardados en {args.json}")
+
+    if not Path(args.resoluciones).exists():
+        print(f"⚠️ Sin {args.resoluciones}: WR/ROI requieren ejecutar antes validate_whale_results.py")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,416 @@
+#!/usr/bin/env python3
+"""
+Taxonomía de keywords compartida por todos los clasificadores de títulos.
+
+Antes cada módulo tenía sus listas y hacía `any(kw in title for kw in ...)`
+categoría por categoría. Aquí cada taxonomía se compila UNA vez a una regex:
+
+    (?=(trie de todas las keywords))
+
+El lookahead prueba todas las posiciones del título sin consumirlo (las
+coincidencias solapadas también cuentan, como con `in`). Las keywords se
+compilan en un trie (una sola regex), y cada coincidencia se traduce al rango
+de prioridad de su regla: el mínimo rango encontrado es exactamente el
+resultado del recorrido lineal original, con una sola pasada por título.
+Encima, cache LRU título → clasificación.
+
+Compilar una taxonomía cuesta unos ms: las de solo subcadenas resuelven los
+primeros USOS_SIN_COMPILAR títulos con el recorrido lineal (mismo resultado) y
+solo se compilan si el proceso sigue clasificando. Un --single no compila nada.
+
+Taxonomías:
+- CATEGORIAS:      categoría de señal de gold_all_claude (NHL, NBA, CRYPTO, ...)
+- DEPORTES:        ¿es deportivo? (sports_edge_detector)
+- ODDS_API:        sport key de The Odds API (sports_edge_detector)
+- SUBTIPOS:        subtipo deportivo de biggest wins/losses (polywhale_v5_adjusted)
+- SECTORES:        sector de PnL (forensic_finale, con límites de palabra)
+- DEPORTES_TRADER: ¿mercado deportivo? en el perfil de trader de Telegram (gold)
+"""
+
+import re
+import threading
+from functools import lru_cache
+
+CACHE_TITULOS = 20000
+USOS_SIN_COMPILAR = 16
+
+# ============================================================================
+# KEYWORDS
+# ============================================================================
+
+# --- Categorías de señal (gold_all_claude.classify) ---
+NBA_KEYWORDS = [
+    'nba', 'ncaa', 'cougars', 'cyclones', 'wolverines', 'boilermakers', 'cornhuskers',
+    'hawkeyes', 'wildcats', 'tigers', 'cowboys', 'buffaloes', 'owls',
+    'mean green', 'seminoles', 'tar heels', 'hoosiers', 'gamecocks',
+    'bulldogs', 'longhorns', 'sooners', 'jayhawks', 'ncaab',
+    'college basketball', 'lakers', 'celtics', 'bulls', 'warriors', 'nets', 'knicks',
+    'bucks', 'heat', 'suns', 'nuggets', 'grizzlies', 'jazz', 'spurs',
+    'pistons', 'pacers', 'wizards', 'hawks', 'hornets', 'cavaliers',
+    'magic', 'raptors', 'thunder', 'clippers', 'kings', 'rockets',
+    'mavericks', 'timberwolves', 'blazers', 'pelicans', '76ers', 'sixers',
+]
+
+NHL_KEYWORDS = [
+    'nhl', 'oilers', 'ducks', 'bruins', 'rangers', 'penguins',
+    'maple leafs', 'canadiens', 'flames', 'canucks', 'sharks',
+    'golden knights', 'avalanche', 'blues', 'blackhawks', 'red wings',
+    'hurricanes', 'panthers', 'lightning', 'capitals', 'flyers',
+    'devils', 'islanders', 'sabres', 'senators', 'predators',
+    'stars', 'wild ', 'jets', 'kraken',
+]
+CRICKET_KEYWORDS = ['cricket', 't20 world cup', 'ipl', 'test match', 'odi', 't20']
+
+SOCCER_KEYWORDS = [
+    'fc ', ' fc', 'barcelona', 'madrid', 'bayern', 'dortmund', 'juventus',
+    'inter', 'milan', 'psg', 'lyon', 'lille', 'chelsea', 'arsenal',
+    'liverpool', 'tottenham', 'manchester', 'premier', 'liga', 'serie a',
+    'bundesliga', 'ligue', 'milan', 'roma', 'napoli', 'atletico', 'sevilla', 'valencia',
+    'real sociedad', 'ajax', 'porto', 'benfica', 'feyenoord', 'celtic', 'rangers', 'galatasaray',
+    'fenerbahce', 'besiktas', 'marseille', 'monaco', 'olympiacos', 'anderlecht', 'brugge',
+    'shakhtar', 'dynamo kiev', 'dortmund', 'leipzig', 'wolfsburg', 'frankfurt', 'leverkusen', 'schalke', 'ucl', 'uel',
+]
+
+CRYPTO_KEYWORDS = [
+    'bitcoin', 'btc', 'ethereum', 'eth', 'crypto', 'solana', 'sol',
+    'dogecoin', 'doge', 'xrp', 'cardano', 'ada',
+]
+
+ESPORTS_KEYWORDS = [
+    'esports', 'league of legends', 'dota', 'csgo', 'cs2', 'valorant', 'dota2', 'counter-strike',     'lol:', 'lck', 'lec', 'lpl', 'bnk fearx', 'gen.g', 'dplus kia',
+    'kt rolster', 'natus vincere', 'giantx', 'team heretics', 'karmine corp',
+    'team vitality', 'bo3', 'bo5', 'game winner', 'game handicap',
+    'counter-strike:', 'cs2:', 'pgl', 'furia', 'parivision', 'mouz',
+    'dreamleague', 'aurora', 'tundra', 'liquid', 'team spirit', 'mouz',
+    ]
+
+TENNIS_KEYWORDS = ['tennis', 'atp', 'wta', 'grand slam', 'wimbledon', 'roland garros']
+MMA_KEYWORDS = [
+    'ufc', 'mma', 'boxing', 'bellator', 'one fc', 'fight night',
+    'flyweight', 'bantamweight', 'featherweight', 'lightweight',
+    'welterweight', 'middleweight', 'heavyweight', 'knockout', ' ko ',
+]
+
+# Fallback 'vs' → NBA solo con indicadores típicos de mercados NBA
+NBA_VS_INDICATORS = ['spread:', 'o/u', 'over/under', 'moneyline']
+
+# --- Edge vs Pinnacle (sports_edge_detector) ---
+SPORTS_KEYWORDS = [
+    'win', 'vs', 'match', 'game', 'score', 'beat', 'champion',
+    'nba', 'nfl', 'nhl', 'mlb', 'premier', 'liga', 'serie a',
+    'bundesliga', 'ligue', 'ufc', 'tennis', 'cup', 'tournament',
+    'fc ', ' fc', 'united', 'city', 'real ', 'atletico',
+    'lakers', 'celtics', 'bulls', 'warriors', 'nets',
+    'barcelona', 'madrid', 'bayern', 'dortmund', 'juventus',
+    'inter', 'milan', 'psg', 'lyon', 'lille', 'chelsea',
+    'arsenal', 'liverpool', 'tottenham', 'manchester',
+]
+
+# Mapeo de keywords a sport keys de The Odds API (el orden es la prioridad)
+SPORT_MAP = {
+    'nba': 'basketball_nba',
+    'lakers': 'basketball_nba',
+    'celtics': 'basketball_nba',
+    'bulls': 'basketball_nba',
+    'warriors': 'basketball_nba',
+    'nets': 'basketball_nba',
+    'knicks': 'basketball_nba',
+    'bucks': 'basketball_nba',
+    'nfl': 'americanfootball_nfl',
+    'nhl': 'icehockey_nhl',
+    'mlb': 'baseball_mlb',
+    'premier': 'soccer_epl',
+    'chelsea': 'soccer_epl',
+    'arsenal': 'soccer_epl',
+    'liverpool': 'soccer_epl',
+    'tottenham': 'soccer_epl',
+    'manchester': 'soccer_epl',
+    'liga': 'soccer_spain_la_liga',
+    'barcelona': 'soccer_spain_la_liga',
+    'real ': 'soccer_spain_la_liga',
+    'atletico': 'soccer_spain_la_liga',
+    'ligue': 'soccer_france_ligue_one',
+    'lille': 'soccer_france_ligue_one',
+    'psg': 'soccer_france_ligue_one',
+    'lyon': 'soccer_france_ligue_one',
+    'paris': 'soccer_france_ligue_one',
+    'serie a': 'soccer_italy_serie_a',
+    'inter': 'soccer_italy_serie_a',
+    'milan': 'soccer_italy_serie_a',
+    'juventus': 'soccer_italy_serie_a',
+    'bundesliga': 'soccer_germany_bundesliga',
+    'bayern': 'soccer_germany_bundesliga',
+    'dortmund': 'soccer_germany_bundesliga',
+    'ufc': 'mma_mixed_martial_arts',
+}
+SPORT_FALLBACK = 'soccer_epl'
+
+# --- Subtipos deportivos del perfil de trader (polywhale_v5_adjusted) ---
+SPORT_SUBTYPE_KEYWORDS = {
+    'NBA / Basketball': ['nba', 'lakers', 'celtics', 'bulls', 'warriors', 'nets', 'bucks',
+                          'knicks', 'sixers', 'suns', 'nuggets', 'heat', 'basketball'],
+    'NFL / Football': ['nfl', 'chiefs', 'eagles', 'cowboys', 'packers', 'patriots',
+                        '49ers', 'ravens', 'bills', 'football', 'super bowl', 'touchdown'],
+    'Soccer / Premier League': ['premier', 'chelsea', 'arsenal', 'liverpool', 'tottenham',
+                                 'manchester', 'newcastle', 'epl'],
+    'Soccer / La Liga': ['la liga', 'barcelona', 'real madrid', 'atletico', 'sevilla',
+                          'villarreal', 'betis'],
+    'Soccer / Ligue 1': ['ligue', 'lille', 'psg', 'lyon', 'marseille', 'monaco', 'paris'],
+    'Soccer / Serie A': ['serie a', 'inter', 'ac milan', 'juventus', 'napoli', 'roma', 'lazio'],
+    'Soccer / Bundesliga': ['bundesliga', 'bayern', 'dortmund', 'leverkusen', 'leipzig'],
+    'Soccer / Other': ['fc ', ' fc', 'united', 'city', 'cup', 'world cup', 'euro ',
+                        'champions league', 'copa'],
+    'MLB / Baseball': ['mlb', 'yankees', 'dodgers', 'astros', 'braves', 'mets', 'baseball'],
+    'NHL / Hockey': ['nhl', 'hockey', 'bruins', 'rangers', 'penguins', 'maple leafs'],
+    'UFC / MMA': ['ufc', 'mma', 'fight', 'boxing', 'bout'],
+    'Tennis': ['tennis', 'wimbledon', 'us open', 'french open', 'australian open',
+                'roland garros', 'atp', 'wta'],
+    'Cricket': ['cricket', 'ipl', 'test match', 'odi', 't20'],
+}
+
+# --- Sectores de PnL (forensic_finale, palabra completa) ---
+SECTOR_KEYWORDS = [
+    ("Política 🏛️", ['trump', 'biden', 'harris', 'election', 'senate', 'vote', 'president', 'republican', 'democrat', 'cabinet', 'nominee', 'poll', 'politics', 'vance', 'presidency']),
+    ("Economía 📉", ['fed', 'rates', 'interest', 'inflation', 'cpi', 'gdp', 'recession', 'bank', 'spx', 'stocks', 'ipo', 'market', 'nasdaq', 'dow', 'rate', 'bps']),
+    ("Crypto ₿", ['bitcoin', 'ethereum', 'solana', 'price', 'etf', 'btc', 'eth', 'crypto', 'token', 'nft', 'airdrop', 'doge', 'memecoin', 'chain', 'wallet']),
+    ("Geopolítica 🌍", ['war', 'israel', 'iran', 'ukraine', 'russia', 'china', 'military', 'strike', 'border', 'ceasefire', 'gaza', 'hamas', 'weapon', 'nuclear', 'missile']),
+    ("Deportes ⚽", ['nfl', 'nba', 'soccer', 'football', 'league', 'cup', 'winner', 'vs', 'score', 'champions', 'premier', 'ufc', 'game', 'win', 'lose', 'points', 'goals', 'season', 'mvp', 'fc', 'club', 'real', 'barcelona', 'madrid', 'city', 'utd', 'united', 'spread', 'handicap', 'over', 'under']),
+    ("Ciencia/Tech 🚀", ['spacex', 'nasa', 'mars', 'ai', 'chatgpt', 'openai', 'apple', 'google', 'fda', 'temperature', 'covid', 'launch', 'tech', 'tesla']),
+    ("Pop Culture 🍿", ['movie', 'song', 'spotify', 'grammy', 'oscar', 'taylor', 'swift', 'box', 'office', 'actor', 'music', 'album', 'award']),
+]
+SECTOR_FALLBACK = "Otros 🌐"
+
+# --- Perfil de trader en Telegram (gold_all_claude._analizar_trader_async) ---
+TRADER_SPORTS_KEYWORDS = ['win', 'vs', ' fc', 'nba', 'nfl', 'liga', 'premier',
+                          'serie a', 'bundesliga', 'ligue', 'ufc', 'nhl', 'mlb', 'tennis', 'cup']
+
+
+# ============================================================================
+# MOTOR
+# ============================================================================
+
+_LOCK_COMPILACION = threading.Lock()
+
+
+def _trie_regex(keywords):
+    """Regex trie de literales; en cada posición casa la keyword MÁS LARGA posible"""
+    trie = {}
+    for kw in keywords:
+        nodo = trie
+        for ch in kw:
+            nodo = nodo.setdefault(ch, {})
+        nodo[''] = True
+
+    def emitir(nodo):
+        terminal = '' in nodo
+        ramas = [re.escape(ch) + emitir(hijo) for ch, hijo in sorted(nodo.items()) if ch]
+        if not ramas:
+            return ''
+        cuerpo = ramas[0] if len(ramas) == 1 else '(?:' + '|'.join(ramas) + ')'
+        if terminal:
+            # Opcional y codicioso: prueba primero la keyword larga y retrocede a la corta
+            return '(?:' + cuerpo + ')?'
+        return cuerpo
+
+    return emitir(trie)
+
+
+class Taxonomia:
+    """
+    Reglas (etiqueta, keywords[, palabra_completa]) en orden de prioridad.
+    Una etiqueta puede repetirse en varias reglas (p.ej. SPORT_MAP: una regla por keyword).
+
+    Keywords por subcadena: un trie con la coincidencia más larga por posición. Si en una
+    posición casa la keyword k, también casan ahí todas las keywords que son prefijo de k,
+    así que el rango de k es el mínimo entre sus prefijos (rango efectivo).
+    Reglas de palabra completa (\\b...\\b): alternancia ordenada por rango.
+
+    La regex se compila en el primer uso (importar el módulo no cuesta compilar
+    las taxonomías que el proceso no va a usar); sin reglas de palabra completa,
+    se espera a USOS_SIN_COMPILAR usos y mientras tanto se recorren las reglas.
+    """
+
+    def __init__(self, reglas, fallback=None, cache=CACHE_TITULOS):
+        self._reglas = list(reglas)
+        self.fallback = fallback
+        self.etiquetas = [regla[0] for regla in self._reglas]
+        self._compilada = False
+        self._usos = 0
+        self._solo_subcadenas = all(len(regla) < 3 or not regla[2] for regla in self._reglas)
+        self.clasificar = lru_cache(maxsize=cache)(self._clasificar)
+
+    def _compilar(self):
+        """Construye la regex en variables locales y la publica al final: los hilos que
+        clasifican en paralelo (camino lineal) nunca ven estado a medias"""
+        rango_kw = {}
+        ramas_palabra = []
+        for r, regla in enumerate(self._reglas):
+            keywords = regla[1]
+            palabra = regla[2] if len(regla) > 2 else False
+            if palabra:
+                ramas_palabra.append((r, keywords))
+            else:
+                for kw in keywords:
+                    rango_kw.setdefault(kw, r)
+
+        rango = rango_grupo = regex = None
+        if ramas_palabra:
+            # Con límites de palabra no vale el trie: una rama por regla (la primera que casa gana)
+            ramas = []
+            grupos = []
+            for r, keywords in ramas_palabra:
+                ramas.append(r'(\b(?:' + '|'.join(re.escape(kw) for kw in keywords) + r')\b)')
+                grupos.append(r)
+            for kw, r in rango_kw.items():
+                ramas.append('(' + re.escape(kw) + ')')
+                grupos.append(r)
+            orden = sorted(range(len(ramas)), key=lambda i: grupos[i])
+            rango_grupo = [grupos[i] for i in orden]
+            regex = re.compile('(?=' + '|'.join(ramas[i] for i in orden) + ')')
+        elif rango_kw:
+            rango = {
+                kw: min(rango_kw.get(kw[:i], r) for i in range(1, len(kw) + 1))
+                for kw, r in rango_kw.items()
+            }
+            regex = re.compile('(?=(' + _trie_regex(rango_kw) + '))')
+
+        self._palabras = bool(ramas_palabra)
+        self._rango_grupo = rango_grupo
+        self._rango = rango
+        self._regex = regex
+        self._compilada = True
+
+    def compilar(self):
+        """Compila la regex ya (p.ej. antes de publicar una taxonomía nueva)"""
+        if not self._compilada:
+            with _LOCK_COMPILACION:
+                if not self._compilada:
+                    self._compilar()
+
+    def _rango_lineal(self, texto_lower):
+        """Recorrido original regla a regla (solo reglas por subcadena)"""
+        for r, regla in enumerate(self._reglas):
+            if any(kw in texto_lower for kw in regla[1]):
+                return r
+        return None
+
+    def rango(self, texto_lower):
+        """Rango (prioridad) de la mejor regla que casa con un texto ya en minúsculas, o None"""
+        if not self._compilada:
+            if self._solo_subcadenas and self._usos < USOS_SIN_COMPILAR:
+                self._usos += 1
+                return self._rango_lineal(texto_lower)
+            self.compilar()
+        if self._regex is None:
+            return None
+        mejor = None
+        for m in self._regex.finditer(texto_lower):
+            if self._palabras:
+                r = self._rango_grupo[m.lastindex - 1]
+            else:
+                r = self._rango[m.group(1)]
+            if mejor is None or r < mejor:
+                mejor = r
+                if r == 0:
+                    break
+        return mejor
+
+    def _clasificar(self, titulo):
+        r = self.rango(titulo.lower())
+        return self.fallback if r is None else self.etiquetas[r]
+
+    def coincide(self, titulo):
+        """True si alguna keyword aparece en el título"""
+        return self.clasificar(titulo) is not None
+
+
+def _categoria_o_fallback(titulo):
+    """Categoría de señal: taxonomía + fallback 'vs' con indicadores NBA"""
+    categoria = CATEGORIAS.clasificar(titulo)
+    if categoria is not None:
+        return categoria
+    title_lower = titulo.lower()
+    # No usar para cualquier "vs" genérico (evita MMA/boxeo activando S2)
+    if ' vs' in title_lower or ' vs.' in title_lower:
+        if any(ind in title_lower for ind in NBA_VS_INDICATORS):
+            return "NBA"
+        # "X vs Y" sin contexto claro → OTHER, no NBA
+        return "OTHER"
+    return "OTHER"
+
+
+# NHL antes que NBA (evita que 'blues', 'predators', etc. caigan al fallback vs+o/u NBA)
+KEYWORDS_CATEGORIAS = {
+    "NHL": tuple(NHL_KEYWORDS),
+    "NBA": tuple(NBA_KEYWORDS),
+    "CRYPTO": tuple(CRYPTO_KEYWORDS),
+    "SOCCER": tuple(SOCCER_KEYWORDS),
+    "ESPORTS": tuple(ESPORTS_KEYWORDS),
+    "TENNIS": tuple(TENNIS_KEYWORDS),
+    "MMA": tuple(MMA_KEYWORDS),
+}
+CATEGORIAS = Taxonomia(list(KEYWORDS_CATEGORIAS.items()))
+DEPORTES = Taxonomia([(True, SPORTS_KEYWORDS)])
+ODDS_API = Taxonomia([(sport, [kw]) for kw, sport in SPORT_MAP.items()], fallback=SPORT_FALLBACK)
+SUBTIPOS = Taxonomia(list(SPORT_SUBTYPE_KEYWORDS.items()))
+SECTORES = Taxonomia(
+    [(sector, kws, True) for sector, kws in SECTOR_KEYWORDS[:4]]
+    + [("Deportes ⚽", SECTOR_KEYWORDS[4][1], True), ("Deportes ⚽", ['vs.'])]
+    + [(sector, kws, True) for sector, kws in SECTOR_KEYWORDS[5:]],
+    fallback=SECTOR_FALLBACK,
+)
+DEPORTES_TRADER = Taxonomia([(True, TRADER_SPORTS_KEYWORDS)])
+
+
+@lru_cache(maxsize=CACHE_TITULOS)
+def detectar_categoria(titulo):
+    """NHL / NBA / CRYPTO / SOCCER / ESPORTS / TENNIS / MMA / OTHER"""
+    return _categoria_o_fallback(titulo)
+
+
+def es_deportivo(titulo):
+    return DEPORTES.coincide(titulo)
+
+
+def deporte_odds_api(titulo):
+    return ODDS_API.clasificar(titulo)
+
+
+def subtipo_deporte(titulo):
+    """Subtipo deportivo ('Soccer / La Liga', ...) o None"""
+    return SUBTIPOS.clasificar(titulo)
+
+
+def detectar_sector(titulo):
+    return SECTORES.clasificar(titulo)
+
+
+def es_deportivo_trader(titulo):
+    return DEPORTES_TRADER.coincide(titulo)
+
+
+def configurar_categorias(keywords):
+    """Sustituye las keywords de CATEGORIAS ({categoría: keywords}, mismo orden de prioridad
+    que KEYWORDS_CATEGORIAS; las categorías ausentes conservan las por defecto).
+
+    La taxonomía nueva se compila antes de publicarla: los hilos que clasifican
+    ven la anterior o la nueva completa, nunca una a medias.
+    """
+    global CATEGORIAS
+    nueva = Taxonomia([(c, keywords.get(c, kws)) for c, kws in KEYWORDS_CATEGORIAS.items()])
+    nueva.compilar()
+    CATEGORIAS = nueva
+    limpiar_caches()
+
+
+def compilar_todas():
+    """Compila ya todas las taxonomías (servidores multihilo: arrancar con las regex listas)"""
+    for taxonomia in (CATEGORIAS, DEPORTES, ODDS_API, SUBTIPOS, SECTORES, DEPORTES_TRADER):
+        taxonomia.compilar()
+
+
+def limpiar_caches():
+    """Vacía las caches título → clasificación (si cambian las keywords en caliente)"""
+    detectar_categoria.cache_clear()
+    for taxonomia in (CATEGORIAS, DEPORTES, ODDS_API, SUBTIPOS, SECTORES, DEPORTES_TRADER):
+        taxonomia.clasificar.cache_clear()
@@ -7,12 +7,19 @@ Ejecutar cada hora con cron job para actualizar resultados de trades registrados
 import os
 import sys
 import time
+import heapq
+import signal
+import socket
+import select
 import logging
+import argparse
 from datetime import datetime, timedelta
 from pathlib import Path
 import requests
 from dotenv import load_dotenv
 from supabase import create_client, Client
+from market_resolution import ResolutionCache, VALIDATOR_SOCKET, calcular_resultado
+from whale_stats import WhaleStatsStore, EDGE_BUCKETS, PRICE_ZONES
 
 # Configurar logging
 logging.basicConfig(
@@ -32,6 +39,19 @@ SUPABASE_URL = os.getenv('SUPABASE_URL')
 SUPABASE_KEY = os.getenv('SUPABASE_KEY')
 CLOB_API = "https://clob.polymarket.com"
 
+# Paginación keyset (por id): muy por debajo del límite de filas de PostgREST (1000)
+PAGE_SIZE = 500
+COLUMNAS_PENDIENTES = ('id,condition_id,market_title,display_name,side,outcome,poly_price,'
+                       'tier,edge_pct,signal_id,detected_at')
+COLUMNAS_ESTADISTICAS = ('id,detected_at,market_title,display_name,side,poly_price,'
+                         'result,pnl_teorico,tier,edge_pct,signal_id')
+COLUMNAS_ARCHIVO = COLUMNAS_ESTADISTICAS + ',condition_id,outcome,valor_usd,is_nicho,action,confidence'
+
+# Modo daemon
+DAEMON_REFRESCO = 600        # Buscar señales nuevas aunque no llegue aviso del detector (10 min)
+DAEMON_REINTENTO = 300       # Reintento tras error HTTP/red (no cacheado en ResolutionCache)
+
+
 class WhaleResultValidator:
     def __init__(self):
         if not SUPABASE_URL or not SUPABASE_KEY:
@@ -39,37 +59,80 @@ class WhaleResultValidator:
 
         self.supabase: Client = create_client(SUPABASE_URL, SUPABASE_KEY)
         self.session = requests.Session()
+        self.resolution_cache = ResolutionCache()
+        self.stats_store = WhaleStatsStore()
         self.validaciones = 0
         self.actualizaciones = 0
         self.errores = 0
+        self.consultas_api = 0
+        self.consultas_omitidas = 0
+        self.cache_hits = 0
 
-    def obtener_trades_pendientes(self):
-        """Obtiene trades que aún no han sido validados"""
-        try:
-            # Buscar trades sin resolved_at que tengan al menos 1 hora de antigüedad
-            hace_1_hora = (datetime.now() - timedelta(hours=1)).isoformat()
+    def _paginar(self, columnas, aplicar_filtros, desde_id=None):
+        """
+        Recorre whale_signals en páginas de PAGE_SIZE filas ordenadas por id (keyset).
+        A diferencia de offset, el keyset no se desplaza cuando las filas ya leídas
+        dejan de cumplir el filtro (p.ej. al marcarlas como resueltas durante la validación).
 
-            response = self.supabase.table('whale_signals')\
-                .select('*')\
-                .is_('resolved_at', 'null')\
-                .lt('detected_at', hace_1_hora)\
-                .execute()
+        Args:
+            desde_id: empezar después de este id (recorridos incrementales del daemon)
 
-            trades = response.data
-            logger.info(f"📊 Encontrados {len(trades)} trades pendientes de validación")
-            return trades
+        Yields:
+            list de filas (solo las columnas pedidas)
+        """
+        last_id = desde_id
+        while True:
+            query = aplicar_filtros(self.supabase.table('whale_signals').select(columnas))
+            if last_id is not None:
+                query = query.gt('id', last_id)
+            response = query.order('id').limit(PAGE_SIZE).execute()
+
+            rows = response.data or []
+            if not rows:
+                return
+            yield rows
+            if len(rows) < PAGE_SIZE:
+                return
+            last_id = rows[-1]['id']
+
+    def obtener_trades_pendientes(self):
+        """Itera (en streaming) los trades que aún no han sido validados"""
+        # Buscar trades sin resolved_at que tengan al menos 1 hora de antigüedad
+        hace_1_hora = (datetime.now() - timedelta(hours=1)).isoformat()
+        total = 0
+        try:
+            paginas = self._paginar(
+                COLUMNAS_PENDIENTES,
+                lambda q: q.is_('resolved_at', 'null').lt('detected_at', hace_1_hora),
+            )
+            for pagina in paginas:
+                total += len(pagina)
+                yield from pagina
 
         except Exception as e:
             logger.error(f"❌ Error obteniendo trades pendientes: {e}")
-            return []
+
+        logger.info(f"📊 Recorridos {total} trades pendientes de validación")
 
     def consultar_resultado_mercado(self, condition_id):
         """
         Consulta Polymarket CLOB API para obtener el resultado del mercado.
+        Usa la cache de resolución: los mercados resueltos no se vuelven a consultar
+        y los abiertos solo se consultan cuando vence su próxima fecha de chequeo.
 
         Returns:
             dict con 'closed', 'winning_outcome' si está resuelto, None si no
         """
+        cached = self.resolution_cache.resultado(condition_id)
+        if cached:
+            self.cache_hits += 1
+            return cached
+
+        if not self.resolution_cache.debe_consultar(condition_id):
+            self.consultas_omitidas += 1
+            return None
+
+        self.consultas_api += 1
         try:
             # Consultar mercado directamente por condition_id usando CLOB API
             url = f"{CLOB_API}/markets/{condition_id}"
@@ -77,6 +140,7 @@ class WhaleResultValidator:
 
             if response.status_code == 404:
                 logger.warning(f"⚠️ No se encontró mercado para condition_id: {condition_id[:20]}...")
+                self.resolution_cache.registrar_abierto(condition_id)
                 return None
 
             if response.status_code != 200:
@@ -88,12 +152,15 @@ class WhaleResultValidator:
             # Verificar si el mercado está cerrado
             closed = market.get('closed', False)
             if not closed:
-                return None  # Aún no se resolvió
+                # Aún no se resolvió: programar próxima consulta según fecha de cierre
+                self.resolution_cache.registrar_abierto(condition_id, market.get('end_date_iso'))
+                return None
 
             # Obtener outcome ganador usando tokens
             tokens = market.get('tokens', [])
             if not tokens:
                 logger.warning(f"⚠️ Mercado sin tokens: {condition_id[:20]}...")
+                self.resolution_cache.registrar_abierto(condition_id, market.get('end_date_iso'))
                 return None
 
             # Buscar el token con winner=true
@@ -106,8 +173,12 @@ class WhaleResultValidator:
             # Si no hay ganador definido, el mercado está cerrado pero no resuelto
             if not winning_outcome:
                 logger.info(f"⏳ Mercado cerrado pero aún sin ganador declarado: {condition_id[:20]}...")
+                self.resolution_cache.registrar_abierto(condition_id, market.get('end_date_iso'))
                 return None
 
+            self.resolution_cache.registrar_resuelto(
+                condition_id, winning_outcome, market.get('question', 'N/A')
+            )
             return {
                 'closed': True,
                 'winning_outcome': winning_outcome,
@@ -125,39 +196,10 @@ class WhaleResultValidator:
         Returns:
             tuple (result, pnl_teorico)
         """
-        side = trade['side'].upper()
-        whale_outcome = trade['outcome']
-        poly_price = float(trade['poly_price'])
-
-        # Normalizar outcomes (YES/Yes/yes → YES, NO/No/no → NO)
-        whale_outcome_norm = whale_outcome.upper() if whale_outcome else ''
-        winning_outcome_norm = winning_outcome.upper() if winning_outcome else ''
-
-        # Determinar resultado
-        if side == 'BUY':
-            # Si compró, ganó si su outcome coincide con el ganador
-            if whale_outcome_norm == winning_outcome_norm:
-                result = 'WIN'
-                # PnL teórico con $100 de capital
-                pnl_teorico = 100 * (1 / poly_price - 1)
-            else:
-                result = 'LOSS'
-                pnl_teorico = -100.0
-        else:  # SELL
-            # Si vendió, ganó si su outcome NO coincide con el ganador
-            if whale_outcome_norm != winning_outcome_norm:
-                result = 'WIN'
-                # Al vender (short), si gana se queda con lo que recibió
-                pnl_teorico = 100 * poly_price
-            else:
-                result = 'LOSS'
-                # Al vender, si pierde, pierde lo que NO recibió (el complemento)
-                pnl_teorico = -(100 - 100 * poly_price)
-
-        return result, pnl_teorico
-
-    def actualizar_trade(self, trade_id, result, pnl_teorico):
-        """Actualiza el registro en Supabase con el resultado"""
+        return calcular_resultado(trade['side'], trade['outcome'], trade['poly_price'], winning_outcome)
+
+    def actualizar_trade(self, trade_id, result, pnl_teorico, trade=None):
+        """Actualiza el registro en Supabase con el resultado (y las estadísticas materializadas)"""
         try:
             self.supabase.table('whale_signals')\
                 .update({
@@ -169,6 +211,8 @@ class WhaleResultValidator:
                 .execute()
 
             self.actualizaciones += 1
+            if trade is not None:
+                self.stats_store.registrar_resultado(trade, result, pnl_teorico)
             logger.info(f"✅ Trade {trade_id} actualizado: {result} | PnL: ${pnl_teorico:.2f}")
 
         except Exception as e:
@@ -183,6 +227,26 @@ class WhaleResultValidator:
 
         trades = self.obtener_trades_pendientes()
 
+        try:
+            self._validar_lote(trades)
+        finally:
+            self.resolution_cache.guardar()
+            self.stats_store.guardar()
+
+        # Resumen
+        logger.info("="*80)
+        logger.info("📊 RESUMEN DE VALIDACIÓN")
+        logger.info("="*80)
+        logger.info(f"✅ Trades validados:     {self.validaciones}")
+        logger.info(f"✅ Trades actualizados:  {self.actualizaciones}")
+        logger.info(f"❌ Errores:              {self.errores}")
+        logger.info(f"🌐 Consultas CLOB API:   {self.consultas_api}")
+        logger.info(f"💾 Resueltos en cache:   {self.cache_hits}")
+        logger.info(f"⏭️  Omitidos (backoff):   {self.consultas_omitidas}")
+        logger.info("="*80)
+
+    def _validar_lote(self, trades):
+        """Valida los trades pendientes (iterable en streaming) contra la CLOB API (vía cache)"""
         for trade in trades:
             self.validaciones += 1
 
@@ -208,41 +272,236 @@ class WhaleResultValidator:
             logger.info(f"💰 Resultado: {result} | PnL teórico: ${pnl_teorico:.2f}")
 
             # Actualizar en Supabase
-            self.actualizar_trade(trade_id, result, pnl_teorico)
+            self.actualizar_trade(trade_id, result, pnl_teorico, trade)
 
             # Rate limiting
             time.sleep(0.5)
 
-        # Resumen
-        logger.info("="*80)
-        logger.info("📊 RESUMEN DE VALIDACIÓN")
+    # ------------------------------------------------------------------
+    # Modo daemon: cola de prioridad por próxima resolución esperada
+    # ------------------------------------------------------------------
+
+    def _cargar_pendientes_daemon(self, desde_id=None):
+        """Agrega a la cola los trades sin resolver con id > desde_id. Devuelve cuántos."""
+        nuevos = 0
+        try:
+            paginas = self._paginar(
+                COLUMNAS_PENDIENTES, lambda q: q.is_('resolved_at', 'null'), desde_id=desde_id
+            )
+            for pagina in paginas:
+                for trade in pagina:
+                    self._ultimo_id = max(self._ultimo_id or 0, trade['id'])
+                    condition_id = trade.get('condition_id')
+                    if not condition_id:
+                        continue
+                    grupo = self._por_mercado.setdefault(condition_id, [])
+                    if any(t['id'] == trade['id'] for t in grupo):
+                        continue
+                    grupo.append(trade)
+                    nuevos += 1
+                    if condition_id not in self._programados:
+                        proxima = self.resolution_cache.proxima_consulta(condition_id) or time.time()
+                        self._programar(condition_id, proxima)
+        except Exception as e:
+            logger.error(f"❌ Error cargando trades pendientes: {e}")
+        return nuevos
+
+    def _programar(self, condition_id, cuando):
+        self._programados[condition_id] = cuando
+        heapq.heappush(self._cola, (cuando, condition_id))
+
+    def _procesar_mercado(self, condition_id):
+        """Consulta un mercado vencido y resuelve todos sus trades pendientes"""
+        consultas_previas = self.consultas_api
+        resultado = self.consultar_resultado_mercado(condition_id)
+
+        if not resultado:
+            proxima = self.resolution_cache.proxima_consulta(condition_id)
+            if proxima is None or proxima <= time.time():
+                proxima = time.time() + DAEMON_REINTENTO
+            self._programar(condition_id, proxima)
+        else:
+            winning_outcome = resultado['winning_outcome']
+            for trade in self._por_mercado.pop(condition_id, []):
+                self.validaciones += 1
+                result, pnl_teorico = self.calcular_resultado(trade, winning_outcome)
+                logger.info(f"📊 #{trade['id']} {trade['market_title'][:50]} | Ganador: {winning_outcome} | "
+                            f"Ballena: {trade['outcome']} ({trade['side']}) → {result} ${pnl_teorico:.2f}")
+                self.actualizar_trade(trade['id'], result, pnl_teorico, trade)
+            self.stats_store.guardar()
+
+        # Rate limiting solo si realmente se llamó a la API
+        if self.consultas_api > consultas_previas:
+            time.sleep(0.5)
+
+    def _abrir_socket(self, path):
+        if os.path.exists(path):
+            os.unlink(path)
+        sock = socket.socket(socket.AF_UNIX, socket.SOCK_DGRAM)
+        sock.bind(path)
+        sock.setblocking(False)
+        return sock
+
+    def ejecutar_daemon(self, socket_path=VALIDATOR_SOCKET):
+        """
+        Validación continua. En lugar de recorrer todos los pendientes cada hora:
+        - Mantiene un heap (próxima_consulta, condition_id) con los mercados pendientes,
+          ordenado por la fecha esperada de resolución (ResolutionCache).
+        - Solo consulta la CLOB API por la cabeza del heap cuando vence.
+        - El detector avisa por socket Unix al registrar señales nuevas: se cargan
+          incrementalmente (id > último id visto), sin volver a recorrer la tabla.
+        """
+        self._cola = []
+        self._programados = {}   # condition_id -> próxima consulta vigente (descarta entradas viejas del heap)
+        self._por_mercado = {}   # condition_id -> trades pendientes
+        self._ultimo_id = None
+        self.running = True
+
+        # Self-pipe: desde Python 3.5 (PEP 475) select() se reintenta tras una señal,
+        # así que el handler escribe aquí para despertar el select en el acto
+        despertar_r, despertar_w = os.pipe()
+        os.set_blocking(despertar_w, False)
+
+        def _detener(sig, frame):
+            logger.info("🛑 Deteniendo daemon de validación...")
+            self.running = False
+            try:
+                os.write(despertar_w, b'x')
+            except OSError:
+                pass  # Pipe lleno: ya hay un despertar pendiente
+
+        signal.signal(signal.SIGINT, _detener)
+        signal.signal(signal.SIGTERM, _detener)
+
+        sock = self._abrir_socket(socket_path)
         logger.info("="*80)
-        logger.info(f"✅ Trades validados:     {self.validaciones}")
-        logger.info(f"✅ Trades actualizados:  {self.actualizaciones}")
-        logger.info(f"❌ Errores:              {self.errores}")
+        logger.info(f"🔁 VALIDADOR EN MODO DAEMON (socket: {socket_path})")
         logger.info("="*80)
 
+        total = self._cargar_pendientes_daemon()
+        logger.info(f"📊 {total} trades pendientes en {len(self._por_mercado)} mercados")
+        proximo_refresco = time.time() + DAEMON_REFRESCO
+
+        try:
+            while self.running:
+                ahora = time.time()
+
+                # Procesar todos los mercados vencidos en la cabeza del heap
+                while self._cola and self._cola[0][0] <= ahora and self.running:
+                    cuando, condition_id = heapq.heappop(self._cola)
+                    if self._programados.get(condition_id) != cuando:
+                        continue  # Entrada reemplazada por una programación posterior
+                    del self._programados[condition_id]
+                    if condition_id in self._por_mercado:
+                        self._procesar_mercado(condition_id)
+                    ahora = time.time()
+
+                if ahora >= proximo_refresco:
+                    nuevos = self._cargar_pendientes_daemon(self._ultimo_id)
+                    self.resolution_cache.guardar()
+                    self.stats_store.guardar()
+                    logger.info(f"💓 Daemon: {len(self._por_mercado)} mercados en cola | "
+                                f"{nuevos} nuevos | API: {self.consultas_api} | "
+                                f"Actualizados: {self.actualizaciones}")
+                    proximo_refresco = ahora + DAEMON_REFRESCO
+
+                # Dormir hasta la próxima consulta, el próximo refresco o un aviso del detector
+                siguiente = min(self._cola[0][0] if self._cola else proximo_refresco, proximo_refresco)
+                espera = max(0.0, siguiente - time.time())
+                listos, _, _ = select.select([sock, despertar_r], [], [], espera)
+                if not self.running:
+                    break
+                if sock in listos:
+                    # Vaciar avisos acumulados: una sola carga incremental cubre todos
+                    while True:
+                        try:
+                            sock.recv(64)
+                        except BlockingIOError:
+                            break
+                    nuevos = self._cargar_pendientes_daemon(self._ultimo_id)
+                    if nuevos:
+                        logger.info(f"📥 {nuevos} señales nuevas recibidas del detector")
+        finally:
+            sock.close()
+            os.close(despertar_r)
+            os.close(despertar_w)
+            if os.path.exists(socket_path):
+                os.unlink(socket_path)
+            self.resolution_cache.guardar()
+            self.stats_store.guardar()
+
+            logger.info("="*80)
+            logger.info("📊 RESUMEN DEL DAEMON")
+            logger.info("="*80)
+            logger.info(f"✅ Trades actualizados:  {self.actualizaciones}")
+            logger.info(f"❌ Errores:              {self.errores}")
+            logger.info(f"🌐 Consultas CLOB API:   {self.consultas_api}")
+            logger.info(f"💾 Resueltos en cache:   {self.cache_hits}")
+            logger.info("="*80)
+
+    def archivar_resultados(self, directorio=None):
+        """Exporta los trades resueltos al archivo columnar (whale_archive, requiere pyarrow)"""
+        import whale_archive
+
+        if not whale_archive.ARROW_AVAILABLE:
+            logger.error("❌ pyarrow no instalado: pip install pyarrow")
+            return
+        directorio = directorio or whale_archive.ARCHIVE_DIR
+        total = 0
+
+        def _lotes():
+            nonlocal total
+            paginas = self._paginar(COLUMNAS_ARCHIVO, lambda q: q.not_.is_('result', 'null'))
+            for pagina in paginas:
+                total += len(pagina)
+                yield [whale_archive.fila_desde_supabase(row) for row in pagina]
+
+        # Export completo: reemplaza las particiones existentes de resultados
+        whale_archive.escribir(_lotes(), 'supabase', whale_archive.RESULTADOS, directorio, reemplazar=True)
+        logger.info(f"📦 {total} trades resueltos archivados en {directorio}")
+
+    def reconstruir_estadisticas(self):
+        """Recalcula las estadísticas materializadas desde cero recorriendo whale_signals"""
+        logger.info("🔄 Reconstruyendo estadísticas materializadas desde Supabase...")
+
+        def _filas():
+            for pagina in self._paginar(COLUMNAS_ESTADISTICAS, lambda q: q):
+                yield from pagina
+
+        total = self.stats_store.reconstruir(_filas())
+        logger.info(f"✅ Estadísticas reconstruidas: {total} señales recorridas")
+
+    def _log_dimension(self, titulo, dimension, claves, ancho=20):
+        logger.info(f"\n📊 ESTADÍSTICAS POR {titulo}")
+        logger.info("-"*80)
+
+        for clave in claves:
+            acc = self.stats_store.resumen(dimension, clave)
+            if not acc:
+                continue
+            win_rate = (acc['wins'] / acc['total'] * 100) if acc['total'] > 0 else 0
+
+            logger.info(f"{clave:<{ancho}} | Trades: {acc['total']:>4} | Win Rate: {win_rate:>5.1f}% | PnL: ${acc['pnl']:>8.2f}")
+
     def generar_estadisticas(self):
-        """Genera estadísticas de precisión de ballenas"""
+        """Genera estadísticas de precisión de ballenas (lee las estadísticas materializadas)"""
         try:
-            # Obtener todos los trades resueltos
-            response = self.supabase.table('whale_signals')\
-                .select('*')\
-                .not_.is_('result', 'null')\
-                .execute()
+            if not self.stats_store.reconstruido:
+                # Histórico de whale_signals aún sin materializar (aunque ya haya filas nuevas)
+                self.reconstruir_estadisticas()
 
-            trades = response.data
-            total = len(trades)
+            global_acc = self.stats_store.resumen_global()
+            total = global_acc['total']
 
             if total == 0:
                 logger.info("📊 No hay trades resueltos aún para generar estadísticas")
                 return
 
-            wins = sum(1 for t in trades if t['result'] == 'WIN')
-            losses = sum(1 for t in trades if t['result'] == 'LOSS')
+            wins = global_acc['wins']
+            losses = global_acc['losses']
             win_rate = (wins / total * 100) if total > 0 else 0
 
-            total_pnl = sum(float(t['pnl_teorico'] or 0) for t in trades)
+            total_pnl = global_acc['pnl']
             avg_pnl = total_pnl / total if total > 0 else 0
 
             logger.info("="*80)
@@ -255,39 +514,11 @@ class WhaleResultValidator:
             logger.info(f"💰 PnL promedio por trade: ${avg_pnl:.2f}")
             logger.info("="*80)
 
-            # Estadísticas por tier
-            logger.info("\n📊 ESTADÍSTICAS POR TIER")
-            logger.info("-"*80)
-
-            tiers = set(t['tier'] for t in trades if t['tier'])
-            for tier in sorted(tiers):
-                tier_trades = [t for t in trades if t['tier'] == tier]
-                tier_total = len(tier_trades)
-                tier_wins = sum(1 for t in tier_trades if t['result'] == 'WIN')
-                tier_win_rate = (tier_wins / tier_total * 100) if tier_total > 0 else 0
-                tier_pnl = sum(float(t['pnl_teorico'] or 0) for t in tier_trades)
-
-                logger.info(f"{tier:<20} | Trades: {tier_total:>4} | Win Rate: {tier_win_rate:>5.1f}% | PnL: ${tier_pnl:>8.2f}")
-
-            # Estadísticas por edge
-            logger.info("\n📊 ESTADÍSTICAS POR EDGE")
-            logger.info("-"*80)
-
-            edge_categories = {
-                'Edge Real (>3%)': [t for t in trades if float(t.get('edge_pct', 0)) > 3],
-                'Edge Marginal (0-3%)': [t for t in trades if 0 < float(t.get('edge_pct', 0)) <= 3],
-                'Sucker Bet (<0%)': [t for t in trades if float(t.get('edge_pct', 0)) < 0]
-            }
-
-            for cat_name, cat_trades in edge_categories.items():
-                cat_total = len(cat_trades)
-                if cat_total == 0:
-                    continue
-                cat_wins = sum(1 for t in cat_trades if t['result'] == 'WIN')
-                cat_win_rate = (cat_wins / cat_total * 100) if cat_total > 0 else 0
-                cat_pnl = sum(float(t['pnl_teorico'] or 0) for t in cat_trades)
-
-                logger.info(f"{cat_name:<25} | Trades: {cat_total:>4} | Win Rate: {cat_win_rate:>5.1f}% | PnL: ${cat_pnl:>8.2f}")
+            self._log_dimension("TIER", 'tier', sorted(self.stats_store.claves('tier')))
+            self._log_dimension("EDGE", 'edge', EDGE_BUCKETS, ancho=25)
+            self._log_dimension("SEÑAL", 'signal_id', sorted(self.stats_store.claves('signal_id')))
+            self._log_dimension("CATEGORÍA", 'category', sorted(self.stats_store.claves('category')))
+            self._log_dimension("ZONA DE PRECIO", 'price_zone', PRICE_ZONES)
 
             logger.info("="*80)
 
@@ -296,9 +527,28 @@ class WhaleResultValidator:
 
 
 def main():
+    parser = argparse.ArgumentParser(description="Validación de resultados de ballenas")
+    parser.add_argument('--rebuild-stats', action='store_true',
+                        help="Reconstruir las estadísticas materializadas desde Supabase")
+    parser.add_argument('--daemon', action='store_true',
+                        help="Validación continua (alternativa al cron horario)")
+    parser.add_argument('--socket', default=VALIDATOR_SOCKET,
+                        help="Socket Unix para avisos del detector (modo --daemon)")
+    parser.add_argument('--archivar', action='store_true',
+                        help="Exportar los trades resueltos al archivo columnar (Parquet)")
+    args = parser.parse_args()
+
     try:
         validator = WhaleResultValidator()
-        validator.validar_trades()
+        if args.daemon:
+            validator.ejecutar_daemon(args.socket)
+        elif args.archivar:
+            validator.archivar_resultados()
+            return
+        elif args.rebuild_stats:
+            validator.reconstruir_estadisticas()
+        else:
+            validator.validar_trades()
         validator.generar_estadisticas()
 
     except Exception as e:
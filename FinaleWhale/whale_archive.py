@@ -0,0 +1,398 @@
+#!/usr/bin/env python3
+"""
+Archivo columnar (Parquet) de ballenas, particionado por día y categoría.
+
+Convierte los logs (whales_*.txt), los eventos estructurados (whales_*.jsonl)
+y los trades resueltos de Supabase en un dataset Parquet con particiones
+Hive day=YYYY-MM-DD/category=NBA/. Las consultas filtran por partición
+(día, categoría) y por estadísticas de row group (precio, tier, signal_id),
+así "todos los S2 de NBA de febrero" lee solo esos archivos.
+
+Requiere pyarrow (opcional): pip install pyarrow
+
+Uso:
+    python whale_archive.py archivar trades_live trades_live/events
+    python whale_archive.py consultar --categoria NBA --signal S2 --desde 2026-02-01 --hasta 2026-02-29
+    python whale_archive.py consultar --resultados --tier "GOLD"
+"""
+
+import re
+import sys
+import argparse
+import logging
+from pathlib import Path
+from datetime import datetime
+
+logger = logging.getLogger(__name__)
+
+try:
+    import pyarrow as pa
+    import pyarrow.dataset as ds
+    ARROW_AVAILABLE = True
+except ImportError:
+    ARROW_AVAILABLE = False
+
+ARCHIVE_DIR = Path("trades_live") / "archive"
+EVENTOS = "eventos"         # Ballenas detectadas (logs + eventos JSONL)
+RESULTADOS = "resultados"   # Trades resueltos exportados por el validador
+
+# (nombre, tipo) — los tipos se resuelven solo si pyarrow está disponible
+_COLUMNAS = [
+    ('day', 'string'), ('category', 'string'),
+    ('detected_at', 'string'), ('timestamp', 'string'),
+    ('categoria_ballena', 'string'), ('valor', 'float64'), ('price', 'float64'),
+    ('market_title', 'string'), ('condition_id', 'string'), ('outcome', 'string'),
+    ('side', 'string'), ('volumen', 'float64'), ('wallet', 'string'),
+    ('display_name', 'string'), ('tier', 'string'), ('signal_id', 'string'),
+    ('action', 'string'), ('confidence', 'string'), ('win_rate_hist', 'float64'),
+    ('expected_roi', 'float64'), ('edge_pct', 'float64'), ('es_nicho', 'bool_'),
+    ('filtro_valido', 'bool_'), ('consensus_count', 'int64'), ('coordinated', 'bool_'),
+    ('result', 'string'), ('pnl_teorico', 'float64'), ('fuente', 'string'),
+]
+PARTICIONES = ['day', 'category']
+
+
+def _requerir_arrow():
+    if not ARROW_AVAILABLE:
+        raise ImportError("El archivo columnar requiere pyarrow: pip install pyarrow")
+
+
+def _schema():
+    return pa.schema([(nombre, getattr(pa, tipo)()) for nombre, tipo in _COLUMNAS])
+
+
+def _particionado():
+    return ds.partitioning(pa.schema([(c, pa.string()) for c in PARTICIONES]), flavor='hive')
+
+
+def _categoria_mercado(titulo):
+    from gold_all_claude import _detect_category
+    return _detect_category(titulo or '')
+
+
+def _dia(valor):
+    """'2026-02-28 08:37:25' / ISO / epoch → '2026-02-28' ('desconocido' si no se puede)"""
+    if valor in (None, ''):
+        return 'desconocido'
+    try:
+        if isinstance(valor, (int, float)):
+            return datetime.fromtimestamp(valor).strftime('%Y-%m-%d')
+        return datetime.fromisoformat(str(valor).replace('Z', '+00:00')).strftime('%Y-%m-%d')
+    except (ValueError, OSError):
+        return str(valor)[:10] or 'desconocido'
+
+
+def _float(valor):
+    try:
+        return float(valor) if valor not in (None, '') else None
+    except (TypeError, ValueError):
+        return None
+
+
+def fila_desde_evento(ev):
+    """Evento de whale_events → fila del archivo"""
+    clasif = ev.get('classification') or {}
+    edge = ev.get('edge') or {}
+    return {
+        'day': _dia(ev.get('timestamp') or ev.get('detected_at')),
+        'category': clasif.get('category') or _categoria_mercado(ev.get('market_title')),
+        'detected_at': ev.get('detected_at'),
+        'timestamp': str(ev.get('timestamp') or ''),
+        'categoria_ballena': ev.get('categoria'),
+        'valor': _float(ev.get('valor')),
+        'price': _float(ev.get('price')),
+        'market_title': ev.get('market_title'),
+        'condition_id': ev.get('condition_id'),
+        'outcome': ev.get('outcome'),
+        'side': ev.get('side'),
+        'volumen': _float(ev.get('volumen')),
+        'wallet': ev.get('wallet'),
+        'display_name': ev.get('display_name'),
+        'tier': ev.get('trader_tier') or None,
+        'signal_id': clasif.get('signal_id'),
+        'action': clasif.get('action'),
+        'confidence': clasif.get('confidence'),
+        'win_rate_hist': _float(clasif.get('win_rate_hist')),
+        'expected_roi': _float(clasif.get('expected_roi')),
+        'edge_pct': _float(edge.get('edge_pct')),
+        'es_nicho': bool(ev.get('es_nicho')),
+        'filtro_valido': (ev.get('filtro') or {}).get('valido', True),
+        'consensus_count': int((ev.get('consensus') or {}).get('count') or 0),
+        'coordinated': bool((ev.get('coordination') or {}).get('activo')),
+        'result': None,
+        'pnl_teorico': None,
+        'fuente': 'evento',
+    }
+
+
+def fila_desde_log(trade):
+    """Trade parseado de whales_*.txt (columnas de backtest.py) → fila del archivo"""
+    return {
+        'day': _dia(trade.get('hora')),
+        'category': _categoria_mercado(trade.get('mercado')),
+        'detected_at': None,
+        'timestamp': trade.get('hora') or '',
+        'categoria_ballena': trade.get('categoria'),
+        'valor': _float(trade.get('valor')),
+        'price': _float(trade.get('precio')),
+        'market_title': trade.get('mercado'),
+        'condition_id': None,
+        'outcome': trade.get('outcome'),
+        'side': 'BUY' if trade.get('lado') == 'COMPRA' else 'SELL',
+        'volumen': _float(trade.get('volumen')),
+        'wallet': trade.get('wallet') or None,
+        'display_name': trade.get('nombre') or None,
+        'tier': None, 'signal_id': None, 'action': None, 'confidence': None,
+        'win_rate_hist': None, 'expected_roi': None, 'edge_pct': None,
+        'es_nicho': False, 'filtro_valido': True, 'consensus_count': 0, 'coordinated': False,
+        'result': None, 'pnl_teorico': None,
+        'fuente': 'log',
+    }
+
+
+def fila_desde_supabase(row):
+    """Fila de whale_signals (resuelta) → fila del archivo"""
+    return {
+        'day': _dia(row.get('detected_at')),
+        'category': row.get('category') or _categoria_mercado(row.get('market_title')),
+        'detected_at': row.get('detected_at'),
+        'timestamp': row.get('detected_at') or '',
+        'categoria_ballena': None,
+        'valor': _float(row.get('valor_usd')),
+        'price': _float(row.get('poly_price')),
+        'market_title': row.get('market_title'),
+        'condition_id': row.get('condition_id'),
+        'outcome': row.get('outcome'),
+        'side': row.get('side'),
+        'volumen': None,
+        'wallet': None,
+        'display_name': row.get('display_name'),
+        'tier': row.get('tier') or None,
+        'signal_id': row.get('signal_id'),
+        'action': row.get('action'),
+        'confidence': row.get('confidence'),
+        'win_rate_hist': _float(row.get('win_rate_hist')),
+        'expected_roi': _float(row.get('expected_roi')),
+        'edge_pct': _float(row.get('edge_pct')),
+        'es_nicho': bool(row.get('is_nicho')),
+        'filtro_valido': True,
+        'consensus_count': 0,
+        'coordinated': False,
+        'result': row.get('result'),
+        'pnl_teorico': _float(row.get('pnl_teorico')),
+        'fuente': 'supabase',
+    }
+
+
+def escribir(lotes_de_filas, nombre, dataset=EVENTOS, directorio=ARCHIVE_DIR, reemplazar=False):
+    """
+    Escribe lotes (listas de filas) en el dataset, en streaming.
+
+    Args:
+        nombre: prefijo de los archivos de la fuente; antes de escribir se borran sus
+            archivos de TODAS las particiones, así re-archivar una fuente que creció
+            (o cambió de particiones) la reemplaza en vez de duplicar filas
+        reemplazar: borrar las particiones tocadas antes de escribir (export completo)
+    """
+    _requerir_arrow()
+    schema = _schema()
+    raiz = Path(directorio) / dataset
+    if raiz.is_dir():
+        propio = re.compile(re.escape(nombre) + r'-\d+\.parquet')
+        for viejo in raiz.rglob(f"{nombre}-*.parquet"):
+            if propio.fullmatch(viejo.name):
+                viejo.unlink()
+
+    def _batches():
+        for filas in lotes_de_filas:
+            if filas:
+                yield pa.RecordBatch.from_pylist(filas, schema=schema)
+
+    ds.write_dataset(
+        _batches(),
+        str(Path(directorio) / dataset),
+        schema=schema,
+        format='parquet',
+        partitioning=_particionado(),
+        basename_template=f"{nombre}-{{i}}.parquet",
+        existing_data_behavior='delete_matching' if reemplazar else 'overwrite_or_ignore',
+    )
+
+
+def _clave_whale(fila):
+    """Identidad de una ballena entre fuentes: los logs .txt no traen condition_id,
+    así que se usa (wallet, segundo, mercado). La hora del log es el mismo instante
+    que el timestamp ISO del evento, truncado a segundos."""
+    hora = fila['timestamp'] or ''
+    try:
+        hora = datetime.fromisoformat(hora.replace('Z', '+00:00')).strftime('%Y-%m-%d %H:%M:%S')
+    except ValueError:
+        pass
+    return (fila['wallet'] or '', hora, fila['market_title'] or '')
+
+
+def _eventos_del_dia(log, eventos_pasados):
+    """Archivos de eventos del mismo día que un log whales_YYYYMMDD_HHMMSS.txt
+    (los pasados en esta llamada y los de <dir del log>/events)"""
+    from whale_events import archivos_eventos, EVENTS_DIR
+
+    partes = log.name.split('_')
+    if len(partes) < 2:
+        return []
+    prefijo = f"whales_{partes[1].split('.')[0]}"
+    candidatos = set(eventos_pasados)
+    for d in (log.parent / 'events', EVENTS_DIR):
+        if d.is_dir():
+            candidatos.update(archivos_eventos(d))
+    return sorted(p for p in candidatos if p.name.startswith(prefijo))
+
+
+def archivar_logs(rutas, directorio=ARCHIVE_DIR):
+    """
+    Archiva logs .txt y eventos .jsonl[.zst] (un conjunto de archivos Parquet por fuente).
+
+    Desde los eventos estructurados cada sesión escribe ambos: las ballenas de un
+    .txt que ya están en los eventos de su día se omiten para no contarlas dos veces.
+    """
+    from backtest import resolver_logs, _parsear_archivo
+    from whale_events import leer_eventos, es_archivo_eventos
+
+    logs = resolver_logs(rutas)
+    eventos = [log for log in logs if es_archivo_eventos(log)]
+    claves_eventos = {}   # archivo de eventos -> claves de sus ballenas
+
+    def _claves(archivo):
+        if archivo not in claves_eventos:
+            claves_eventos[archivo] = {_clave_whale(fila_desde_evento(ev)) for ev in leer_eventos(archivo)}
+        return claves_eventos[archivo]
+
+    total = 0
+    # Eventos primero: son la fuente completa; los .txt solo aportan lo que falte
+    for log in eventos + [log for log in logs if not es_archivo_eventos(log)]:
+        nombre = log.name.split('.')[0]
+        omitidas = 0
+        if es_archivo_eventos(log):
+            filas = [fila_desde_evento(ev) for ev in leer_eventos(log)]
+        else:
+            columnas = _parsear_archivo(log, usar_cache=True)
+            claves = list(columnas.keys())
+            filas = [fila_desde_log(dict(zip(claves, v))) for v in zip(*columnas.values())]
+            ya_archivadas = set()
+            for archivo in _eventos_del_dia(log, eventos):
+                ya_archivadas |= _claves(archivo)
+            if ya_archivadas:
+                n = len(filas)
+                filas = [f for f in filas if _clave_whale(f) not in ya_archivadas]
+                omitidas = n - len(filas)
+            nombre = f"log_{nombre}"
+        escribir([filas], nombre, EVENTOS, directorio)
+        total += len(filas)
+        logger.info(f"📦 {log.name}: {len(filas)} filas archivadas"
+                    + (f" ({omitidas} ya en eventos)" if omitidas else ""))
+    return total
+
+
+def _filtro(categoria=None, signal_id=None, tier=None, precio_min=None, precio_max=None,
+            desde=None, hasta=None, solo_resueltos=False, solo_validos=False):
+    condiciones = []
+    if categoria:
+        condiciones.append(ds.field('category') == categoria)
+    if desde:
+        condiciones.append(ds.field('day') >= desde)
+    if hasta:
+        condiciones.append(ds.field('day') <= hasta)
+    if signal_id:
+        condiciones.append(ds.field('signal_id') == signal_id)
+    if tier:
+        condiciones.append(ds.field('tier') == tier)
+    if precio_min is not None:
+        condiciones.append(ds.field('price') >= precio_min)
+    if precio_max is not None:
+        condiciones.append(ds.field('price') <= precio_max)
+    if solo_resueltos:
+        condiciones.append(ds.field('result').is_valid())
+    if solo_validos:
+        condiciones.append(ds.field('filtro_valido'))
+
+    expr = None
+    for c in condiciones:
+        expr = c if expr is None else expr & c
+    return expr
+
+
+def consultar(dataset=EVENTOS, directorio=ARCHIVE_DIR, columnas=None, **filtros):
+    """
+    Devuelve una pyarrow.Table con las filas que cumplen los filtros
+    (categoria, signal_id, tier, precio_min, precio_max, desde, hasta, solo_resueltos,
+    solo_validos).
+    Día y categoría podan particiones; precio/tier/signal_id usan estadísticas Parquet.
+    """
+    _requerir_arrow()
+    ruta = Path(directorio) / dataset
+    if not ruta.exists():
+        return _schema().empty_table()
+    dataset_pq = ds.dataset(str(ruta), format='parquet', partitioning=_particionado(), schema=_schema())
+    return dataset_pq.to_table(columns=columnas, filter=_filtro(**filtros))
+
+
+def resumen_resultados(tabla):
+    """Win rate / PnL de una tabla de resultados (mismo formato que el validador)"""
+    resultado = tabla.column('result').to_pylist()
+    pnl = tabla.column('pnl_teorico').to_pylist()
+    wins = sum(1 for r in resultado if r == 'WIN')
+    losses = sum(1 for r in resultado if r == 'LOSS')
+    return {
+        'total': len(resultado),
+        'wins': wins,
+        'losses': losses,
+        'pnl': sum(p or 0 for p in pnl),
+    }
+
+
+def main():
+    logging.basicConfig(level=logging.INFO, format='%(message)s')
+    parser = argparse.ArgumentParser(description="Archivo columnar de ballenas (Parquet)")
+    parser.add_argument('--dir', default=str(ARCHIVE_DIR), help="Directorio del archivo")
+    sub = parser.add_subparsers(dest='comando', required=True)
+
+    p_arch = sub.add_parser('archivar', help="Archivar logs .txt / eventos .jsonl")
+    p_arch.add_argument('rutas', nargs='+')
+
+    p_cons = sub.add_parser('consultar', help="Consultar el archivo con filtros")
+    p_cons.add_argument('--categoria')
+    p_cons.add_argument('--signal', dest='signal_id')
+    p_cons.add_argument('--tier')
+    p_cons.add_argument('--precio-min', type=float)
+    p_cons.add_argument('--precio-max', type=float)
+    p_cons.add_argument('--desde', help="YYYY-MM-DD")
+    p_cons.add_argument('--hasta', help="YYYY-MM-DD")
+    p_cons.add_argument('--resultados', action='store_true',
+                        help="Consultar los trades resueltos (export del validador)")
+
+    args = parser.parse_args()
+    if not ARROW_AVAILABLE:
+        print("❌ pyarrow no instalado: pip install pyarrow")
+        sys.exit(1)
+
+    if args.comando == 'archivar':
+        total = archivar_logs(args.rutas, args.dir)
+        print(f"✅ {total} filas archivadas en {args.dir}")
+        return
+
+    filtros = {k: getattr(args, k) for k in
+               ('categoria', 'signal_id', 'tier', 'precio_min', 'precio_max', 'desde', 'hasta')}
+    if args.resultados:
+        tabla = consultar(RESULTADOS, args.dir, solo_resueltos=True, **filtros)
+        r = resumen_resultados(tabla)
+        wr = (r['wins'] / r['total'] * 100) if r['total'] else 0
+        print(f"📊 Trades: {r['total']} | Win Rate: {wr:.1f}% | PnL: ${r['pnl']:.2f}")
+    else:
+        tabla = consultar(EVENTOS, args.dir, **filtros)
+        print(f"📊 {tabla.num_rows} ballenas")
+        for fila in tabla.slice(0, 20).to_pylist():
+            print(f"  {fila['day']} {fila['category']:<8} {fila['side']:<4} {fila['price'] or 0:.2f} "
+                  f"${fila['valor'] or 0:>10,.0f} {fila['signal_id'] or '-':<5} {(fila['market_title'] or '')[:50]}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,141 @@
+#!/usr/bin/env python3
+"""
+Log estructurado de ballenas (JSONL), paralelo al log humano whales_*.txt.
+
+El detector emite una línea JSON por ballena con todo lo que calculó
+(filtro, clasificación, consenso, coordinación, edge, tier). backtest.py y
+forensic_finale.py lo leen directamente, sin regex sobre los banners del .txt.
+
+- Escritura con buffer: se vuelca cada BUFFER_LINEAS eventos o FLUSH_SEGUNDOS
+  (comprobado al emitir y en cada ciclo del detector con volcar_si_vencido).
+- Rotación diaria: trades_live/events/whales_YYYYMMDD.jsonl
+- Compresión zstd opcional (.jsonl.zst, un frame por volcado) si está instalado
+  zstandard y se activa con WHALE_EVENTS_ZSTD=1.
+"""
+
+import io
+import os
+import json
+import time
+import logging
+import threading
+from pathlib import Path
+from datetime import datetime
+
+logger = logging.getLogger(__name__)
+
+try:
+    import zstandard
+    ZSTD_AVAILABLE = True
+except ImportError:
+    ZSTD_AVAILABLE = False
+
+EVENTS_DIR = Path("trades_live") / "events"
+BUFFER_LINEAS = 200
+FLUSH_SEGUNDOS = 5
+ZSTD_NIVEL = 3
+EVENTS_ZSTD = os.getenv('WHALE_EVENTS_ZSTD', '') == '1'
+
+
+class WhaleEventWriter:
+    """Writer JSONL con buffer y rotación diaria (thread-safe)"""
+
+    def __init__(self, directorio=EVENTS_DIR, comprimir=EVENTS_ZSTD):
+        self.directorio = Path(directorio)
+        self.directorio.mkdir(parents=True, exist_ok=True)
+        if comprimir and not ZSTD_AVAILABLE:
+            logger.warning("zstandard no instalado: eventos sin comprimir (pip install zstandard)")
+        self.comprimir = comprimir and ZSTD_AVAILABLE
+        self._lock = threading.Lock()
+        self._buffer = []
+        self._dia = None
+        self._ultimo_flush = time.time()
+        self.eventos_escritos = 0
+
+    def ruta_del_dia(self, dia):
+        sufijo = ".jsonl.zst" if self.comprimir else ".jsonl"
+        return self.directorio / f"whales_{dia}{sufijo}"
+
+    def emitir(self, evento):
+        """Encola un evento; vuelca a disco si el buffer está lleno o pasó FLUSH_SEGUNDOS"""
+        linea = json.dumps(evento, ensure_ascii=False, default=str)
+        dia = datetime.now().strftime("%Y%m%d")
+        with self._lock:
+            if self._dia is not None and dia != self._dia:
+                self._volcar()   # Rotación: lo pendiente va al archivo del día anterior
+            self._dia = dia
+            self._buffer.append(linea)
+            if len(self._buffer) >= BUFFER_LINEAS or time.time() - self._ultimo_flush >= FLUSH_SEGUNDOS:
+                self._volcar()
+
+    def volcar_si_vencido(self):
+        """Vuelca lo pendiente si pasó FLUSH_SEGUNDOS aunque no lleguen eventos nuevos"""
+        with self._lock:
+            if self._buffer and time.time() - self._ultimo_flush >= FLUSH_SEGUNDOS:
+                self._volcar()
+
+    def flush(self):
+        with self._lock:
+            self._volcar()
+
+    def _volcar(self):
+        self._ultimo_flush = time.time()
+        if not self._buffer:
+            return
+        datos = ("\n".join(self._buffer) + "\n").encode('utf-8')
+        ruta = self.ruta_del_dia(self._dia)
+        try:
+            with open(ruta, 'ab') as f:
+                if self.comprimir:
+                    # Frame independiente por volcado: un corte a mitad no corrompe los anteriores
+                    f.write(zstandard.ZstdCompressor(level=ZSTD_NIVEL).compress(datos))
+                else:
+                    f.write(datos)
+            self.eventos_escritos += len(self._buffer)
+            self._buffer = []
+        except OSError as e:
+            logger.error(f"Error escribiendo eventos en {ruta}: {e}")
+
+
+def archivos_eventos(ruta=EVENTS_DIR):
+    """Archivos de eventos (.jsonl / .jsonl.zst) de un directorio, en orden cronológico"""
+    ruta = Path(ruta)
+    if ruta.is_file():
+        return [ruta]
+    archivos = list(ruta.glob("whales_*.jsonl")) + list(ruta.glob("whales_*.jsonl.zst"))
+    return sorted(archivos, key=lambda p: p.name)
+
+
+def es_archivo_eventos(ruta):
+    nombre = Path(ruta).name
+    return nombre.endswith(".jsonl") or nombre.endswith(".jsonl.zst")
+
+
+def _abrir_texto(ruta):
+    ruta = Path(ruta)
+    if ruta.name.endswith(".zst"):
+        if not ZSTD_AVAILABLE:
+            raise ImportError(f"{ruta.name} está comprimido con zstd: pip install zstandard")
+        raw = open(ruta, 'rb')
+        lector = zstandard.ZstdDecompressor().stream_reader(raw, read_across_frames=True, closefd=True)
+        return io.TextIOWrapper(lector, encoding='utf-8')
+    return open(ruta, 'r', encoding='utf-8')
+
+
+def leer_eventos(rutas=EVENTS_DIR):
+    """
+    Itera los eventos (dicts) de uno o varios archivos/directorios en streaming.
+    Las líneas incompletas (p.ej. proceso cortado a mitad de escritura) se saltan.
+    """
+    if isinstance(rutas, (str, Path)):
+        rutas = [rutas]
+    for ruta in rutas:
+        for archivo in archivos_eventos(ruta):
+            with _abrir_texto(archivo) as f:
+                for linea in f:
+                    if not linea.strip():
+                        continue
+                    try:
+                        yield json.loads(linea)
+                    except ValueError:
+                        logger.debug(f"Línea inválida en {archivo.name}, se omite")
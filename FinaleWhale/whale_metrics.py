@@ -0,0 +1,269 @@
+#!/usr/bin/env python3
+"""
+📏 MÉTRICAS DEL DETECTOR LIVE (gold_all_claude.py --live)
+
+Histogramas de latencia con buckets fijos en escala logarítmica (estilo HDR:
+cada potencia de 10 partida en 1-2-5). Registrar un valor es un bisect sobre
+una tupla de ~25 límites más un incremento, así que se puede llamar en el hot
+path de cada trade sin coste apreciable.
+
+Además, contadores (con etiquetas) y gauges. Los gauges son funciones que se
+evalúan al servir /metrics (tamaños de cache, cola del executor, RSS…), así que
+no cuestan nada en el ciclo del detector.
+
+- RegistroMetricas.medir('classify') → context manager que cronometra un bloque
+- RegistroMetricas.contador('trades_total').inc(etiquetas=('nuevo',))
+- RegistroMetricas.gauge('cache_size', funcion) → valor (o {etiquetas: valor}) al servir
+- RegistroMetricas.resumen() → líneas p50/p90/p99/max para heartbeat y resumen final
+- RegistroMetricas.texto_prometheus() → formato de texto de Prometheus
+- iniciar_servidor(registro, puerto) → GET /metrics en 127.0.0.1:<puerto> (hilo daemon)
+"""
+
+import os
+import time
+import logging
+import threading
+from bisect import bisect_left
+
+logger = logging.getLogger(__name__)
+
+# 100µs … 5000s
+BUCKETS_SEGUNDOS = tuple(m * 10.0 ** e for e in range(-4, 4) for m in (1, 2, 5))
+PERCENTILES = (0.50, 0.90, 0.99)
+
+
+def _fmt_segundos(s):
+    if s < 1:
+        return f"{s * 1000:.1f}ms"
+    return f"{s:.2f}s"
+
+
+class Histograma:
+    """Histograma acumulativo de buckets fijos (límites superiores inclusivos, como Prometheus)"""
+    __slots__ = ('nombre', 'ayuda', 'limites', 'conteos', 'suma', 'n', 'maximo', '_lock')
+
+    def __init__(self, nombre, ayuda='', limites=BUCKETS_SEGUNDOS):
+        self.nombre = nombre
+        self.ayuda = ayuda
+        self.limites = tuple(limites)
+        self.conteos = [0] * (len(self.limites) + 1)   # último = +Inf
+        self.suma = 0.0
+        self.n = 0
+        self.maximo = 0.0
+        self._lock = threading.Lock()
+
+    def observar(self, valor):
+        i = bisect_left(self.limites, valor)
+        with self._lock:
+            self.conteos[i] += 1
+            self.suma += valor
+            self.n += 1
+            if valor > self.maximo:
+                self.maximo = valor
+
+    def percentil(self, q):
+        """Límite superior del bucket que contiene el percentil q (acotado por el máximo visto)"""
+        if not self.n:
+            return 0.0
+        objetivo = q * self.n
+        acumulado = 0
+        for i, c in enumerate(self.conteos):
+            acumulado += c
+            if acumulado >= objetivo:
+                return min(self.limites[i], self.maximo) if i < len(self.limites) else self.maximo
+        return self.maximo
+
+    def resumen(self):
+        if not self.n:
+            return f"{self.nombre}: sin datos"
+        partes = [f"p{int(q * 100)}={_fmt_segundos(self.percentil(q))}" for q in PERCENTILES]
+        return (f"{self.nombre}: n={self.n} " + " ".join(partes)
+                + f" max={_fmt_segundos(self.maximo)} media={_fmt_segundos(self.suma / self.n)}")
+
+    def prometheus(self, prefijo=''):
+        nombre = prefijo + self.nombre
+        with self._lock:
+            conteos, suma, n = list(self.conteos), self.suma, self.n
+        lineas = [f"# HELP {nombre} {self.ayuda or nombre}", f"# TYPE {nombre} histogram"]
+        acumulado = 0
+        for limite, c in zip(self.limites, conteos):
+            acumulado += c
+            lineas.append(f'{nombre}_bucket{{le="{limite:g}"}} {acumulado}')
+        lineas.append(f'{nombre}_bucket{{le="+Inf"}} {n}')
+        lineas.append(f"{nombre}_sum {suma}")
+        lineas.append(f"{nombre}_count {n}")
+        return lineas
+
+
+def _escapar(valor):
+    return str(valor).replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+
+
+def _etiquetas(nombres, valores):
+    if not nombres:
+        return ''
+    return "{" + ",".join(f'{k}="{_escapar(v)}"' for k, v in zip(nombres, valores)) + "}"
+
+
+class Contador:
+    """Contador monótono, opcionalmente con etiquetas (una serie por tupla de valores)"""
+    __slots__ = ('nombre', 'ayuda', 'nombres_etiquetas', 'valores', '_lock')
+
+    def __init__(self, nombre, ayuda='', etiquetas=()):
+        self.nombre = nombre
+        self.ayuda = ayuda
+        self.nombres_etiquetas = tuple(etiquetas)
+        self.valores = {}
+        self._lock = threading.Lock()
+
+    def inc(self, valor=1, etiquetas=()):
+        with self._lock:
+            self.valores[etiquetas] = self.valores.get(etiquetas, 0) + valor
+
+    def total(self):
+        return sum(self.valores.values())
+
+    def prometheus(self, prefijo=''):
+        nombre = prefijo + self.nombre
+        lineas = [f"# HELP {nombre} {self.ayuda or nombre}", f"# TYPE {nombre} counter"]
+        with self._lock:
+            valores = dict(self.valores)
+        if not valores and not self.nombres_etiquetas:
+            valores = {(): 0}
+        for etiquetas, v in valores.items():
+            lineas.append(f"{nombre}{_etiquetas(self.nombres_etiquetas, etiquetas)} {v}")
+        return lineas
+
+
+class Gauge:
+    """Valor instantáneo calculado por una función al servir las métricas"""
+    __slots__ = ('nombre', 'ayuda', 'nombres_etiquetas', 'funcion')
+
+    def __init__(self, nombre, funcion, ayuda='', etiquetas=()):
+        self.nombre = nombre
+        self.funcion = funcion
+        self.ayuda = ayuda
+        self.nombres_etiquetas = tuple(etiquetas)
+
+    def prometheus(self, prefijo=''):
+        nombre = prefijo + self.nombre
+        try:
+            valor = self.funcion()
+        except Exception as e:
+            logger.debug(f"Gauge {nombre} falló: {e}")
+            return []
+        lineas = [f"# HELP {nombre} {self.ayuda or nombre}", f"# TYPE {nombre} gauge"]
+        serie = valor if isinstance(valor, dict) else {(): valor}
+        for etiquetas, v in serie.items():
+            lineas.append(f"{nombre}{_etiquetas(self.nombres_etiquetas, etiquetas)} {float(v)}")
+        return lineas
+
+
+def rss_bytes():
+    """Memoria residente del proceso (Linux: /proc/self/statm; si no, pico de getrusage)"""
+    try:
+        with open('/proc/self/statm', 'r') as f:
+            return int(f.read().split()[1]) * os.sysconf('SC_PAGE_SIZE')
+    except (OSError, ValueError, IndexError, AttributeError):
+        import resource
+        import sys
+        pico = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        return pico if sys.platform == 'darwin' else pico * 1024
+
+
+class _Cronometro:
+    __slots__ = ('histograma', 'inicio')
+
+    def __init__(self, histograma):
+        self.histograma = histograma
+
+    def __enter__(self):
+        self.inicio = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc):
+        self.histograma.observar(time.perf_counter() - self.inicio)
+        return False
+
+
+class RegistroMetricas:
+    def __init__(self, prefijo=''):
+        self.prefijo = prefijo
+        self.histogramas = {}
+        self.contadores = {}
+        self.gauges = {}
+        self._lock = threading.Lock()
+
+    def histograma(self, nombre, ayuda='', limites=BUCKETS_SEGUNDOS):
+        h = self.histogramas.get(nombre)
+        if h is None:
+            with self._lock:
+                h = self.histogramas.setdefault(nombre, Histograma(nombre, ayuda, limites))
+        return h
+
+    def contador(self, nombre, ayuda='', etiquetas=()):
+        c = self.contadores.get(nombre)
+        if c is None:
+            with self._lock:
+                c = self.contadores.setdefault(nombre, Contador(nombre, ayuda, etiquetas))
+        return c
+
+    def gauge(self, nombre, funcion, ayuda='', etiquetas=()):
+        """Registra (o reemplaza) un gauge calculado por funcion()"""
+        with self._lock:
+            self.gauges[nombre] = Gauge(nombre, funcion, ayuda, etiquetas)
+
+    def observar(self, nombre, valor):
+        self.histograma(nombre).observar(valor)
+
+    def medir(self, nombre):
+        return _Cronometro(self.histograma(nombre))
+
+    def resumen(self):
+        return "\n".join(f"   {h.resumen()}" for h in self.histogramas.values() if h.n)
+
+    def texto_prometheus(self):
+        lineas = []
+        for c in list(self.contadores.values()):
+            lineas.extend(c.prometheus(self.prefijo))
+        for g in list(self.gauges.values()):
+            lineas.extend(g.prometheus(self.prefijo))
+        for h in list(self.histogramas.values()):
+            lineas.extend(h.prometheus(self.prefijo))
+        return "\n".join(lineas) + "\n"
+
+
+# --- Endpoint HTTP (http.server se importa solo si se sirve /metrics) ---
+
+class _MetricsHandlerMixin:
+    registro = None
+
+    def do_GET(self):
+        if self.path.split('?', 1)[0] not in ('/metrics', '/'):
+            self.send_error(404)
+            return
+        cuerpo = self.registro.texto_prometheus().encode('utf-8')
+        self.send_response(200)
+        self.send_header('Content-Type', 'text/plain; version=0.0.4; charset=utf-8')
+        self.send_header('Content-Length', str(len(cuerpo)))
+        self.end_headers()
+        self.wfile.write(cuerpo)
+
+    def log_message(self, format, *args):
+        pass
+
+
+def iniciar_servidor(registro, puerto, host='127.0.0.1'):
+    """Sirve /metrics en un hilo daemon. Devuelve el servidor (o None si el puerto está ocupado)"""
+    from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+    handler = type('MetricsHandler', (_MetricsHandlerMixin, BaseHTTPRequestHandler), {'registro': registro})
+    try:
+        servidor = ThreadingHTTPServer((host, puerto), handler)
+    except OSError as e:
+        logger.warning(f"No se pudo abrir el endpoint de métricas en {host}:{puerto}: {e}")
+        return None
+    servidor.daemon_threads = True
+    threading.Thread(target=servidor.serve_forever, name='metrics-http', daemon=True).start()
+    logger.info(f"📏 Métricas Prometheus en http://{host}:{servidor.server_port}/metrics")
+    return servidor
@@ -9,8 +9,17 @@ Sistema de scoring (100 puntos):
 - Consistencia (25 pts): Win Rate, ratio ganancia/pérdida promedio
 - Gestión de Riesgo (20 pts): Drawdown máximo, diversificación
 - Experiencia (20 pts): Antigüedad, volumen, ranking global
+
+Las curvas de puntos viven en VERSIONES_SCORING (tablas de umbrales que se
+evalúan con bisect). 'v5' es el ajuste actual y 'v4' conserva los valores
+anteriores ("Era ..."); WHALE_SCORING_VERSION o el atributo version_scoring
+eligen cuál usa cada instancia, así dos versiones pueden puntuar las mismas
+wallets a la vez (whale_scorer_batch.py --comparar).
 """
 
+import os
+from bisect import bisect_left, bisect_right
+
 # Niveles de Ballenas Configurables
 WHALE_TIERS = [
     (40000, "🐋🐋🐋🐋🐋", "TITAN BALLENA"),
@@ -22,22 +31,135 @@ WHALE_TIERS = [
 ]
 
 
+class Escala:
+    """Escalera de umbrales `if x > 25: ... elif x > 18: ...` como tabla.
+
+    umbrales/puntos/etiquetas van en el orden de la cadena de elif: gana el
+    primer umbral que cumple `x <comparacion> umbral`; si ninguno, sin puntos.
+    Las etiquetas (opcionales) son la strength de ese escalón, con {} = x.
+    """
+    __slots__ = ('comparacion', 'umbrales', 'puntos', 'etiquetas', 'limites', 'bisect', 'por_k')
+
+    def __init__(self, comparacion, umbrales, puntos, etiquetas=()):
+        self.comparacion = comparacion
+        self.umbrales = tuple(umbrales)
+        self.puntos = tuple(puntos)
+        self.etiquetas = tuple(etiquetas) + (None,) * (len(self.umbrales) - len(etiquetas))
+        n = len(self.umbrales)
+        # Límites ascendentes; k = bisect(límites, x) = cuántos límites quedan por
+        # debajo de x y peldanos[k] el índice del escalón que ganaría el elif
+        if comparacion in ('>', '>='):
+            self.limites = self.umbrales[::-1]
+            self.bisect = bisect_left if comparacion == '>' else bisect_right
+            peldanos = (None,) + tuple(range(n - 1, -1, -1))
+        elif comparacion in ('<', '<='):
+            self.limites = self.umbrales
+            self.bisect = bisect_right if comparacion == '<' else bisect_left
+            peldanos = tuple(range(n)) + (None,)
+        else:
+            raise ValueError(f"comparación no soportada: {comparacion}")
+        if list(self.limites) != sorted(self.limites):
+            raise ValueError(f"umbrales fuera de orden para '{comparacion}': {self.umbrales}")
+        # k -> (puntos, etiqueta) | None: una sola indexación tras el bisect
+        self.por_k = tuple(None if i is None else (self.puntos[i], self.etiquetas[i]) for i in peldanos)
+
+    def peldano(self, x):
+        """(puntos, etiqueta) del escalón que gana x, o None si ninguno (o x es NaN)"""
+        if x != x:
+            return None
+        return self.por_k[self.bisect(self.limites, x)]
+
+    def __repr__(self):
+        return f"Escala({self.comparacion!r}, {self.umbrales}, {self.puntos})"
+
+
+# ✅ V5 AJUSTADO (actual)
+_V5 = {
+    'maximos': {'profitability': 35, 'consistency': 25, 'risk_management': 20, 'experience': 20},
+    # Rentabilidad: umbrales más realistas + bonificación a rango 10-25%
+    'roi': Escala('>', (25, 18, 13, 10, 7, 5, 2, 0), (15, 13, 11, 9, 7, 5, 3, 1),
+                  ("✓ ROI excepcional: {:.1f}%", "✓ ROI excelente: {:.1f}%",
+                   "✓ ROI muy bueno: {:.1f}%", "✓ ROI sólido: {:.1f}%")),
+    # Umbrales más alcanzables + bonificación al rango 1.2-2.0x (>1.0 suma 2 dos veces)
+    'profit_factor': Escala('>', (2.8, 2.3, 1.9, 1.5, 1.2, 1.0), (12, 10, 8, 7, 5, 4),
+                            ("✓ Profit Factor elite: {:.2f}", "✓ Profit Factor excelente: {:.2f}",
+                             None, None, "✓ Profit Factor positivo: {:.2f}")),
+    'pnl': Escala('>', (100000, 50000, 20000, 5000, 0), (8, 6, 4, 2, 1)),
+    # Consistencia
+    'win_rate': Escala('>', (70, 62, 57, 52, 48, 43), (12, 10, 8, 6, 4, 2),
+                       ("✓ Win Rate excepcional: {:.1f}%", "✓ Win Rate alto: {:.1f}%")),
+    'win_loss_ratio': Escala('>', (2.0, 1.5, 1.2, 1.0), (8, 6, 4, 2),
+                             ("✓ Ganancias 2x mayores que pérdidas",)),
+    'concentracion': Escala('<', (0.2, 0.3, 0.4), (5, 4, 2), ("✓ Ganancias bien distribuidas",)),
+    # Gestión de riesgo: menos puntos, mismos umbrales
+    'loss_concentration': Escala('<', (0.15, 0.25, 0.35, 0.5), (10, 8, 5, 2),
+                                 ("✓ Pérdidas bien controladas",)),
+    'categorias': Escala('>=', (5, 3, 2), (6, 4, 2), ("✓ Opera en {} categorías",)),
+    'risk_reward': Escala('>', (10, 5, 3, 1), (4, 3, 2, 1)),
+    # Experiencia
+    'rank': Escala('<=', (100, 500, 1000, 2500, 5000, 10000), (7, 6, 5, 3, 2, 1),
+                   ("✓ Top 100 global (#{})", "✓ Top 500 global (#{})")),
+    'total_traded': Escala('>', (500000, 200000, 100000, 50000, 10000), (5, 4, 3, 2, 1)),
+}
+
+# V4 (valores anteriores al ajuste: los "Era ..." de V5). Rentabilidad 30 y riesgo 25 pts
+_V4 = dict(
+    _V5,
+    maximos={'profitability': 30, 'consistency': 25, 'risk_management': 25, 'experience': 20},
+    roi=Escala('>', (30, 20, 15, 9, 5, 0), (12, 10, 8, 8, 5, 2),
+               ("✓ ROI excepcional: {:.1f}%", "✓ ROI excelente: {:.1f}%", "✓ ROI muy bueno: {:.1f}%")),
+    profit_factor=Escala('>', (3.0, 2.5, 2.0, 1.5, 1.2, 1.0), (10, 9, 7, 5, 3, 2),
+                         ("✓ Profit Factor elite: {:.2f}", "✓ Profit Factor excelente: {:.2f}",
+                          None, None, "✓ Profit Factor positivo: {:.2f}")),
+    win_rate=Escala('>', (75, 67, 60, 55, 50, 45), (12, 10, 8, 6, 4, 2),
+                    ("✓ Win Rate excepcional: {:.1f}%", "✓ Win Rate alto: {:.1f}%")),
+    loss_concentration=Escala('<', (0.15, 0.25, 0.35, 0.5), (12, 9, 6, 3),
+                              ("✓ Pérdidas bien controladas",)),
+    categorias=Escala('>=', (5, 3, 2), (8, 5, 2), ("✓ Opera en {} categorías",)),
+    risk_reward=Escala('>', (10, 5, 3, 1), (5, 4, 3, 1)),
+)
+
+VERSIONES_SCORING = {'v4': _V4, 'v5': _V5}
+VERSION_SCORING = os.getenv('WHALE_SCORING_VERSION', 'v5')
+if VERSION_SCORING not in VERSIONES_SCORING:
+    raise ValueError(f"WHALE_SCORING_VERSION desconocida: {VERSION_SCORING} "
+                     f"(válidas: {', '.join(VERSIONES_SCORING)})")
+
+
 class WhaleScorer:
     """
     Mixin con métodos de scoring compartidos.
     Las clases que hereden deben inicializar:
       self.scraped_data, self.scores, self.red_flags, self.strengths
+    version_scoring (clave de VERSIONES_SCORING) se puede fijar por instancia.
     """
+    version_scoring = VERSION_SCORING
+
+    def _escalon(self, escala, x):
+        """Puntos del escalón de x en `escala` (None si ninguno); añade su strength si tiene"""
+        if x != x:
+            return None
+        escalon = escala.por_k[escala.bisect(escala.limites, x)]
+        if escalon is None:
+            return None
+        if escalon[1]:
+            self.strengths.append(escalon[1].format(x))
+        return escalon[0]
+
+    def _acotar(self, escalas, componente, score):
+        self.scores[componente] = min(score, escalas['maximos'][componente])
+        return self.scores[componente]
 
     def calculate_profitability_score(self):
         """
-        RENTABILIDAD (35 puntos) - AJUSTADO [+5 pts]
-        - ROI efectivo (15 pts) [+3]
-        - Profit Factor (12 pts) [+2]
-        - PnL absoluto (8 pts) [igual]
+        RENTABILIDAD (35 puntos en v5)
+        - ROI efectivo (15 pts)
+        - Profit Factor (12 pts)
+        - PnL absoluto (8 pts)
         """
         score = 0
         d = self.scraped_data
+        escalas = VERSIONES_SCORING[self.version_scoring]
 
         # 1. ROI = PnL / (Gains + Losses) * 100
         pnl = d.get('pnl', 0)
@@ -47,27 +169,9 @@ class WhaleScorer:
             roi = (pnl / total_traded) * 100
             self.roi = roi
 
-            # ✅ AJUSTE: Umbrales más realistas + bonificación a rango 10-25%
-            if roi > 25:  # Era >30
-                score += 15  # Era 12
-                self.strengths.append(f"✓ ROI excepcional: {roi:.1f}%")
-            elif roi > 18:  # Era >20
-                score += 13  # Era 10
-                self.strengths.append(f"✓ ROI excelente: {roi:.1f}%")
-            elif roi > 13:  # Era >15
-                score += 11  # Era 8, ahora 11 (+3)
-                self.strengths.append(f"✓ ROI muy bueno: {roi:.1f}%")
-            elif roi > 10:  # NUEVO: reconocer ROI >10%
-                score += 9  # Era 8, ahora 9 (+1)
-                self.strengths.append(f"✓ ROI sólido: {roi:.1f}%")
-            elif roi > 7:  # Era >9
-                score += 7  # Era 8, ahora 7 (-1)
-            elif roi > 5:
-                score += 5  # Igual
-            elif roi > 2:  # Era >0
-                score += 3  # Era 2
-            elif roi > 0:
-                score += 1
+            puntos = self._escalon(escalas['roi'], roi)
+            if puntos is not None:
+                score += puntos
             elif roi < -10:
                 self.red_flags.append(f"⚠️ ROI negativo: {roi:.1f}%")
 
@@ -75,73 +179,39 @@ class WhaleScorer:
         profit_factor = d.get('profit_factor', 0)
         self.profit_factor = profit_factor
 
-        # ✅ AJUSTE: Umbrales más alcanzables + bonificación al rango 1.2-2.0x
-        if profit_factor > 2.8:  # Era >3.0
-            score += 12  # Era 10
-            self.strengths.append(f"✓ Profit Factor elite: {profit_factor:.2f}")
-        elif profit_factor > 2.3:  # Era >2.5
-            score += 10  # Era 9
-            self.strengths.append(f"✓ Profit Factor excelente: {profit_factor:.2f}")
-        elif profit_factor > 1.9:  # Era >2.0
-            score += 8  # Era 7
-        elif profit_factor > 1.5:
-            score += 7  # Era 5, ahora 7 (+2)
-        elif profit_factor > 1.2:
-            score += 5  # Era 3, ahora 5 (+2) ← Aquí entra Predictoor99
-            self.strengths.append(f"✓ Profit Factor positivo: {profit_factor:.2f}")
-        elif profit_factor > 1.0:
-            score += 2  # Era 1
-            score += 2  # Era 1
+        puntos = self._escalon(escalas['profit_factor'], profit_factor)
+        if puntos is not None:
+            score += puntos
         elif profit_factor < 1.0:
             self.red_flags.append(f"⚠️ Profit Factor < 1: {profit_factor:.2f}")
 
-        # 3. PnL Absoluto (tamaño del éxito) - SIN CAMBIOS
-        if pnl > 100000:
-            score += 8
-        elif pnl > 50000:
-            score += 6
-        elif pnl > 20000:
-            score += 4
-        elif pnl > 5000:
-            score += 2
-        elif pnl > 0:
-            score += 1
+        # 3. PnL Absoluto (tamaño del éxito)
+        score += self._escalon(escalas['pnl'], pnl) or 0
 
-        self.scores['profitability'] = min(score, 35)
-        return self.scores['profitability']
+        return self._acotar(escalas, 'profitability', score)
 
     def calculate_consistency_score(self):
         """
-        CONSISTENCIA (25 puntos) - AJUSTADO
-        - Win Rate (12 pts) [umbrales suavizados]
+        CONSISTENCIA (25 puntos)
+        - Win Rate (12 pts)
         - Ratio Avg Win / Avg Loss (8 pts)
         - Distribución de ganancias (5 pts)
         """
         score = 0
         d = self.scraped_data
+        escalas = VERSIONES_SCORING[self.version_scoring]
 
-        # 1. Win Rate - ✅ AJUSTE: Umbrales más realistas
+        # 1. Win Rate
         win_rate = d.get('win_rate', 0)
         self.win_rate = win_rate
 
-        if win_rate > 70:  # Era >75
-            score += 12
-            self.strengths.append(f"✓ Win Rate excepcional: {win_rate:.1f}%")
-        elif win_rate > 62:  # Era >67
-            score += 10
-            self.strengths.append(f"✓ Win Rate alto: {win_rate:.1f}%")
-        elif win_rate > 57:  # Era >60
-            score += 8
-        elif win_rate > 52:  # Era >55
-            score += 6
-        elif win_rate > 48:  # Era >50
-            score += 4
-        elif win_rate > 43:  # Era >45
-            score += 2
+        puntos = self._escalon(escalas['win_rate'], win_rate)
+        if puntos is not None:
+            score += puntos
         elif win_rate < 40:
             self.red_flags.append(f"⚠️ Win Rate bajo: {win_rate:.1f}%")
 
-        # 2. Ratio Avg Win / Avg Loss - SIN CAMBIOS
+        # 2. Ratio Avg Win / Avg Loss
         avg_win = d.get('avg_win', 0)
         avg_loss = d.get('avg_loss', 1)
 
@@ -149,49 +219,39 @@ class WhaleScorer:
             win_loss_ratio = avg_win / avg_loss
             self.win_loss_ratio = win_loss_ratio
 
-            if win_loss_ratio > 2.0:
-                score += 8
-                self.strengths.append(f"✓ Ganancias 2x mayores que pérdidas")
-            elif win_loss_ratio > 1.5:
-                score += 6
-            elif win_loss_ratio > 1.2:
-                score += 4
-            elif win_loss_ratio > 1.0:
-                score += 2
+            puntos = self._escalon(escalas['win_loss_ratio'], win_loss_ratio)
+            if puntos is not None:
+                score += puntos
             elif win_loss_ratio < 0.8:
                 self.red_flags.append(f"⚠️ Pérdidas promedio mayores que ganancias")
 
-        # 3. Distribución de ganancias - SIN CAMBIOS
+        # 3. Distribución de ganancias
         wins = d.get('biggest_wins', [])
         if len(wins) >= 3 and d.get('total_gains', 0) > 0:
             top_win = wins[0]['amount'] if wins else 0
             total_gains = d.get('total_gains', 1)
             concentration = top_win / total_gains
 
-            if concentration < 0.2:
-                score += 5
-                self.strengths.append("✓ Ganancias bien distribuidas")
-            elif concentration < 0.3:
-                score += 4
-            elif concentration < 0.4:
-                score += 2
+            puntos = self._escalon(escalas['concentracion'], concentration)
+            if puntos is not None:
+                score += puntos
             elif concentration > 0.5:
                 self.red_flags.append(f"⚠️ {concentration*100:.0f}% de ganancias en 1 trade")
 
-        self.scores['consistency'] = min(score, 25)
-        return self.scores['consistency']
+        return self._acotar(escalas, 'consistency', score)
 
     def calculate_risk_management_score(self):
         """
-        GESTIÓN DE RIESGO (20 puntos) - AJUSTADO [-5 pts]
-        - Control de pérdidas máximas (10 pts) [-2]
-        - Diversificación por categoría (6 pts) [-2]
-        - Ratio PnL / Max Loss (4 pts) [-1]
+        GESTIÓN DE RIESGO (20 puntos en v5)
+        - Control de pérdidas máximas (10 pts)
+        - Diversificación por categoría (6 pts)
+        - Ratio PnL / Max Loss (4 pts)
         """
         score = 0
         d = self.scraped_data
+        escalas = VERSIONES_SCORING[self.version_scoring]
 
-        # 1. Control de pérdidas máximas - ✅ AJUSTE: Menos puntos pero mismos umbrales
+        # 1. Control de pérdidas máximas
         max_loss = d.get('max_loss', 0)
         total_losses = d.get('total_losses', 1)
         pnl = d.get('pnl', 0)
@@ -201,57 +261,38 @@ class WhaleScorer:
             self.max_loss = max_loss
             self.loss_concentration = loss_concentration
 
-            if loss_concentration < 0.15:
-                score += 10  # Era 12
-                self.strengths.append("✓ Pérdidas bien controladas")
-            elif loss_concentration < 0.25:
-                score += 8  # Era 9
-            elif loss_concentration < 0.35:
-                score += 5  # Era 6
-            elif loss_concentration < 0.5:
-                score += 2  # Era 3
+            puntos = self._escalon(escalas['loss_concentration'], loss_concentration)
+            if puntos is not None:
+                score += puntos
             else:
                 self.red_flags.append(f"⚠️ {loss_concentration*100:.0f}% de pérdidas en 1 trade")
 
-        # 2. Diversificación por categoría - ✅ AJUSTE: Menos estricto
+        # 2. Diversificación por categoría
         categories = d.get('categories', [])
         if len(categories) >= 2:
-            if len(categories) >= 5:
-                score += 6  # Era 8
-                self.strengths.append(f"✓ Opera en {len(categories)} categorías")
-            elif len(categories) >= 3:
-                score += 4  # Era 5
-            elif len(categories) >= 2:
-                score += 2  # Igual
+            score += self._escalon(escalas['categorias'], len(categories)) or 0
         else:
             self.red_flags.append("⚠️ Solo opera en 1 categoría")
 
-        # 3. Ratio PnL / Max Loss - ✅ AJUSTE: Menos puntos
+        # 3. Ratio PnL / Max Loss
         if max_loss > 0:
             risk_reward = pnl / max_loss
             self.risk_reward_ratio = risk_reward
 
-            if risk_reward > 10:
-                score += 4  # Era 5
-            elif risk_reward > 5:
-                score += 3  # Era 4
-            elif risk_reward > 3:
-                score += 2  # Era 3
-            elif risk_reward > 1:
-                score += 1  # Igual
+            score += self._escalon(escalas['risk_reward'], risk_reward) or 0
 
-        self.scores['risk_management'] = min(score, 20)
-        return self.scores['risk_management']
+        return self._acotar(escalas, 'risk_management', score)
 
     def calculate_experience_score(self):
         """
-        EXPERIENCIA (20 puntos) - SIN CAMBIOS
+        EXPERIENCIA (20 puntos)
         - Antigüedad y badges (8 pts)
         - Ranking global (7 pts)
         - Volumen operado (5 pts)
         """
         score = 0
         d = self.scraped_data
+        escalas = VERSIONES_SCORING[self.version_scoring]
 
         # 1. Badges de experiencia
         badges = d.get('badges', [])
@@ -269,38 +310,15 @@ class WhaleScorer:
         rank = d.get('rank', 999999)
         self.rank = rank
 
-        if rank <= 100:
-            score += 7
-            self.strengths.append(f"✓ Top 100 global (#{rank})")
-        elif rank <= 500:
-            score += 6
-            self.strengths.append(f"✓ Top 500 global (#{rank})")
-        elif rank <= 1000:
-            score += 5
-        elif rank <= 2500:
-            score += 3
-        elif rank <= 5000:
-            score += 2
-        elif rank <= 10000:
-            score += 1
+        score += self._escalon(escalas['rank'], rank) or 0
 
         # 3. Volumen operado (total_gains + total_losses)
         total_traded = d.get('total_gains', 0) + d.get('total_losses', 0)
         self.total_traded = total_traded
 
-        if total_traded > 500000:
-            score += 5
-        elif total_traded > 200000:
-            score += 4
-        elif total_traded > 100000:
-            score += 3
-        elif total_traded > 50000:
-            score += 2
-        elif total_traded > 10000:
-            score += 1
+        score += self._escalon(escalas['total_traded'], total_traded) or 0
 
-        self.scores['experience'] = min(score, 20)
-        return self.scores['experience']
+        return self._acotar(escalas, 'experience', score)
 
     def detect_bot_behavior(self):
         """
@@ -0,0 +1,391 @@
+#!/usr/bin/env python3
+"""
+🦈 WHALE SCORER POR LOTES - puntúa miles de wallets de una vez
+
+Misma puntuación que WhaleScorer (whale_scorer.py) pero sobre columnas: cada
+Escala de VERSIONES_SCORING es un np.searchsorted sobre un array de límites
+ordenado, y las condiciones de detección de bots son máscaras booleanas.
+Sub-scores, bot_confidence, total y tier son idénticos (entero a entero) a los
+del camino por objeto; no genera strengths/red_flags ni recomendación (para
+eso, WhaleScorer).
+
+Entrada: dict de columnas (listas o arrays NumPy) o un DataFrame de pandas,
+una fila por wallet. NaN = dato ausente (se usa el mismo valor por defecto
+que los d.get() de WhaleScorer). Columnas (todas opcionales):
+
+    pnl, total_gains, total_losses, profit_factor, win_rate, avg_win, avg_loss,
+    max_loss, rank, total_trades, markets_traded,
+    n_categories, n_biggest_wins, top_win,        # len(categories), len(biggest_wins), biggest_wins[0]
+    badge_veteran, badge_pnl_100k, badge_pnl_10k  # 1/0
+
+columnas_desde_perfiles() las construye a partir de dicts scraped_data.
+
+Requiere numpy (opcional): pip install numpy
+
+Uso:
+    python whale_scorer_batch.py perfiles.json              # lista JSON o JSONL de scraped_data
+    python whale_scorer_batch.py perfiles.jsonl --verificar # comparar con WhaleScorer fila a fila
+    python whale_scorer_batch.py perfiles.json --version v5 --comparar v4   # A/B de versiones
+"""
+
+import sys
+import json
+import time
+import argparse
+from collections import Counter
+
+from whale_scorer import Escala, VERSIONES_SCORING, VERSION_SCORING
+
+try:
+    import numpy as np
+    NUMPY_AVAILABLE = True
+except ImportError:
+    NUMPY_AVAILABLE = False
+
+COLUMNAS = ('pnl', 'total_gains', 'total_losses', 'profit_factor', 'win_rate', 'avg_win', 'avg_loss',
+            'max_loss', 'rank', 'total_trades', 'markets_traded', 'n_categories', 'n_biggest_wins',
+            'top_win', 'badge_veteran', 'badge_pnl_100k', 'badge_pnl_10k')
+
+# Escaleras de detect_bot_behavior (indicadores 1 y 10); no dependen de la versión
+ESCALAS_BOT = {
+    'trades_por_mercado': Escala('>', (50, 25, 15), (40, 30, 15)),
+    'vol_pnl_ratio': Escala('>', (15, 10, 8, 6), (45, 35, 30, 20)),
+}
+
+# (total mínimo, tier, grade) de calculate_final_score, de mayor a menor
+TIERS = (
+    (85, "💎 DIAMOND", "A+"),
+    (75, "🥇 GOLD", "A"),
+    (65, "🥈 SILVER", "B+"),
+    (55, "🥉 BRONZE", "B"),
+    (45, "📊 STANDARD", "C"),
+    (35, "⚠️ RISKY", "D"),
+)
+TIER_BOT = ("🤖 BOT/MM", "N/A")
+TIER_RESTO = ("💀 HIGH RISK", "F")
+
+
+def _requerir_numpy():
+    if not NUMPY_AVAILABLE:
+        raise ImportError("El scoring por lotes requiere numpy: pip install numpy")
+
+
+def _compilar(escala):
+    """Escala → (límites ascendentes, side de searchsorted, puntos por índice).
+
+    Con límites ascendentes b, searchsorted da k = cuántos límites quedan por
+    debajo de x ('left': estrictamente; 'right': incluidos los iguales), y
+    puntos[k] es el escalón que ganaría la cadena de elif.
+    """
+    comparacion, umbrales, puntos = escala.comparacion, escala.umbrales, escala.puntos
+    if comparacion in ('>', '>='):
+        # umbrales descendentes: k límites superados → escalón n-k
+        limites = np.array(umbrales[::-1], dtype=np.float64)
+        tabla = (0,) + tuple(puntos[::-1])
+        side = 'left' if comparacion == '>' else 'right'
+    else:
+        # umbrales ascendentes: k límites ya superados → escalón k (n = ninguno)
+        limites = np.array(umbrales, dtype=np.float64)
+        tabla = tuple(puntos) + (0,)
+        side = 'right' if comparacion == '<' else 'left'
+    return limites, side, np.array(tabla, dtype=np.int64)
+
+
+_COMPILADAS = {}   # id(Escala) -> (escala, límites, side, puntos)
+
+
+def _escalon(escala, x):
+    compilada = _COMPILADAS.get(id(escala))
+    if compilada is None or compilada[0] is not escala:
+        compilada = _COMPILADAS[id(escala)] = (escala,) + _compilar(escala)
+    _, limites, side, tabla = compilada
+    return tabla[np.searchsorted(limites, x, side=side)]
+
+
+def columnas_desde_perfiles(perfiles):
+    """Lista de dicts scraped_data → dict de columnas float64 (NaN = ausente)"""
+    _requerir_numpy()
+    filas = {c: [] for c in COLUMNAS}
+    nan = float('nan')
+    for d in perfiles:
+        for c in ('pnl', 'total_gains', 'total_losses', 'profit_factor', 'win_rate', 'avg_win',
+                  'avg_loss', 'max_loss', 'rank', 'total_trades', 'markets_traded'):
+            v = d.get(c)
+            filas[c].append(nan if v is None else v)
+        wins = d.get('biggest_wins', [])
+        badges = d.get('badges', [])
+        filas['n_categories'].append(len(d.get('categories', [])))
+        filas['n_biggest_wins'].append(len(wins))
+        filas['top_win'].append(wins[0]['amount'] if wins else 0)
+        filas['badge_veteran'].append('veteran' in badges)
+        filas['badge_pnl_100k'].append('pnl_100k' in badges)
+        filas['badge_pnl_10k'].append('pnl_10k' in badges)
+    return {c: np.array(v, dtype=np.float64) for c, v in filas.items()}
+
+
+def puntuar_lote(tabla, version=VERSION_SCORING):
+    """Columnas de métricas → dict de arrays (una posición por wallet).
+
+    version: clave de VERSIONES_SCORING (curvas de puntos y máximos).
+    Claves: profitability, consistency, risk_management, experience, is_bot,
+    bot_confidence, bot_penalty, total, tier, reliability_grade.
+    """
+    _requerir_numpy()
+    escalas = VERSIONES_SCORING[version]
+    maximos = escalas['maximos']
+    presentes = set(tabla.columns) if hasattr(tabla, 'columns') else set(tabla)
+    desconocidas = presentes - set(COLUMNAS)
+    if desconocidas:
+        raise ValueError(f"columnas desconocidas: {', '.join(sorted(desconocidas))}")
+    n = None
+    cols = {}
+    for c in presentes:
+        cols[c] = np.asarray(tabla[c], dtype=np.float64)
+        if n is None:
+            n = len(cols[c])
+        elif len(cols[c]) != n:
+            raise ValueError(f"la columna {c} tiene {len(cols[c])} filas (se esperaban {n})")
+    n = n or 0
+
+    def col(nombre, defecto):
+        """Equivalente a d.get(nombre, defecto)"""
+        x = cols.get(nombre)
+        if x is None:
+            return np.full(n, defecto, dtype=np.float64)
+        return np.where(np.isnan(x), defecto, x)
+
+    def cociente(a, b, mascara):
+        """a / b solo donde mascara (fuera, 0.0: esas filas no usan el valor)"""
+        return np.divide(a, b, out=np.zeros(n), where=mascara)
+
+    pnl = col('pnl', 0)
+    total_gains = col('total_gains', 0)
+    total_losses_0 = col('total_losses', 0)   # rentabilidad/experiencia/bots usan defecto 0...
+    total_losses_1 = col('total_losses', 1)   # ...y gestión de riesgo, defecto 1
+    profit_factor = col('profit_factor', 0)
+    win_rate = col('win_rate', 0)
+    max_loss = col('max_loss', 0)
+    total_trades = col('total_trades', 0)
+    markets = col('markets_traded', 0)
+    total_traded = total_gains + total_losses_0
+    cero = np.zeros(n, dtype=np.int64)
+
+    # --- Rentabilidad (35) ---
+    hay_volumen = total_traded > 0
+    roi = cociente(pnl, total_traded, hay_volumen) * 100
+    profitability = (np.where(hay_volumen, _escalon(escalas['roi'], roi), cero)
+                     + _escalon(escalas['profit_factor'], profit_factor)
+                     + _escalon(escalas['pnl'], pnl))
+    profitability = np.minimum(profitability, maximos['profitability'])
+
+    # --- Consistencia (25) ---
+    avg_loss = col('avg_loss', 1)
+    hay_avg_loss = avg_loss > 0
+    ratio = cociente(col('avg_win', 0), avg_loss, hay_avg_loss)
+    con_wins = (col('n_biggest_wins', 0) >= 3) & (total_gains > 0)
+    concentracion = cociente(col('top_win', 0), total_gains, con_wins)
+    consistency = (_escalon(escalas['win_rate'], win_rate)
+                   + np.where(hay_avg_loss, _escalon(escalas['win_loss_ratio'], ratio), cero)
+                   + np.where(con_wins, _escalon(escalas['concentracion'], concentracion), cero))
+    consistency = np.minimum(consistency, maximos['consistency'])
+
+    # --- Gestión de riesgo (20) ---
+    hay_max_loss = max_loss > 0
+    con_perdidas = (total_losses_1 > 0) & hay_max_loss
+    loss_conc = cociente(max_loss, total_losses_1, con_perdidas)
+    risk_reward = cociente(pnl, max_loss, hay_max_loss)
+    risk_management = (np.where(con_perdidas, _escalon(escalas['loss_concentration'], loss_conc), cero)
+                       + _escalon(escalas['categorias'], col('n_categories', 0))
+                       + np.where(hay_max_loss, _escalon(escalas['risk_reward'], risk_reward), cero))
+    risk_management = np.minimum(risk_management, maximos['risk_management'])
+
+    # --- Experiencia (20) ---
+    badges = (np.where(col('badge_veteran', 0) != 0, 5, 0)
+              + np.where(col('badge_pnl_100k', 0) != 0, 3, np.where(col('badge_pnl_10k', 0) != 0, 2, 0)))
+    experience = (badges + _escalon(escalas['rank'], col('rank', 999999))
+                  + _escalon(escalas['total_traded'], total_traded))
+    experience = np.minimum(experience, maximos['experience'])
+
+    # --- Detección de bots (mismos indicadores que detect_bot_behavior) ---
+    is_bot = np.zeros(n, dtype=bool)
+    conf = np.zeros(n, dtype=np.int64)
+
+    def sumar(mascara, puntos, bot=False):
+        nonlocal is_bot, conf
+        conf = conf + np.where(mascara, puntos, 0)
+        if bot:
+            is_bot = is_bot | mascara
+
+    # 1. Trades por mercado
+    con_mercados = (markets > 0) & (total_trades > 0)
+    tpm = cociente(total_trades, markets, markets > 0)
+    conf = conf + np.where(con_mercados, _escalon(ESCALAS_BOT['trades_por_mercado'], tpm), 0)
+    is_bot |= con_mercados & (tpm > 50)
+    # 2-7
+    sumar((total_trades > 4000) & (markets < 50), 30, bot=True)
+    sumar((total_traded > 1000000) & (profit_factor > 0.95) & (profit_factor < 1.05), 35, bot=True)
+    sumar(total_trades > 7000, 50, bot=True)
+    sumar((win_rate >= 49.5) & (win_rate <= 50.5) & (total_traded > 500000), 25)
+    sumar((total_trades > 3000) & (markets > 100), 35, bot=True)
+    sumar((total_trades > 2000) & (markets > 0) & (tpm > 15), 20)
+
+    # 8-14: heurísticas sin total_trades (el scraper no lo capturó)
+    sin_trades = total_trades == 0
+    rank_0 = col('rank', 0)          # indicadores 8 y 9 usan d.get('rank', 0)
+    rank_9 = col('rank', 999999)     # 11 y 13, d.get('rank', 999999)
+    vol_10m = sin_trades & (total_traded > 10000000)
+    sumar(vol_10m & (profit_factor < 0.9), 25)
+    sumar(vol_10m & (rank_0 > 500000), 35, bot=True)
+    vol_5m = sin_trades & (total_traded > 5000000) & (rank_0 > 1000000)
+    perdedor = vol_5m & (pnl < -500000)
+    sumar(perdedor, 30, bot=True)
+    sumar(vol_5m & ~perdedor & (profit_factor < 0.85), 25)
+    con_ratio = vol_10m & (pnl > 0)
+    vol_pnl = cociente(total_traded, pnl, con_ratio)
+    conf = conf + np.where(con_ratio, _escalon(ESCALAS_BOT['vol_pnl_ratio'], vol_pnl), 0)
+    is_bot |= con_ratio & (vol_pnl > 10)
+    resto = sin_trades.copy()
+    for rank_max, pnl_max, vol_min, puntos, bot in ((10, 10000000, 50000000, 45, True),
+                                                   (20, 5000000, 20000000, 35, True),
+                                                   (50, 3000000, 25000000, 30, False),
+                                                   (100, 2000000, 30000000, 25, False)):
+        m = resto & (rank_9 <= rank_max) & (pnl > 0) & (pnl < pnl_max) & (total_traded > vol_min)
+        sumar(m, puntos, bot=bot)
+        resto &= ~m
+    sumar(sin_trades & (total_traded > 20000000) & (win_rate >= 50) & (win_rate <= 55), 25)
+    con_roi = sin_trades & (pnl > 0) & (total_traded > 0)
+    roi_vol = cociente(pnl, total_traded, con_roi) * 100
+    top10 = con_roi & (rank_9 <= 10) & (roi_vol < 10)
+    sumar(top10, 40, bot=True)
+    sumar(con_roi & ~top10 & (rank_9 <= 20) & (roi_vol < 12), 30)
+    sumar(sin_trades & (total_traded > 30000000) & (profit_factor > 1.1) & (profit_factor < 1.3), 25)
+    bot_confidence = np.minimum(conf, 100)
+
+    # --- Total y tier (calculate_final_score) ---
+    total = profitability + consistency + risk_management + experience
+    bot_penalty = np.where(is_bot, (bot_confidence * 0.3).astype(np.int64), 0)
+    total = np.where(is_bot, np.maximum(0, total - bot_penalty), total)
+
+    minimos = np.array([t[0] for t in TIERS[::-1]], dtype=np.int64)
+    nombres = np.array([TIER_RESTO[0]] + [t[1] for t in TIERS[::-1]], dtype=object)
+    grados = np.array([TIER_RESTO[1]] + [t[2] for t in TIERS[::-1]], dtype=object)
+    k = np.searchsorted(minimos, total, side='right')
+    tier, grade = nombres[k], grados[k]
+    es_bot_mm = is_bot & (bot_confidence > 80)
+    tier[es_bot_mm] = TIER_BOT[0]
+    grade[es_bot_mm] = TIER_BOT[1]
+
+    return {
+        'profitability': profitability,
+        'consistency': consistency,
+        'risk_management': risk_management,
+        'experience': experience,
+        'is_bot': is_bot,
+        'bot_confidence': bot_confidence,
+        'bot_penalty': bot_penalty,
+        'total': total,
+        'tier': tier,
+        'reliability_grade': grade,
+    }
+
+
+def puntuar_objetos(perfiles, version=VERSION_SCORING):
+    """Camino de referencia: WhaleScorer por objeto (mismas claves que puntuar_lote, en listas)"""
+    from whale_scorer import WhaleScorer
+
+    class _Perfil(WhaleScorer):
+        version_scoring = version
+
+        def __init__(self, datos):
+            self.scraped_data = datos
+            self.scores = {}
+            self.red_flags = []
+            self.strengths = []
+
+    salida = {c: [] for c in ('profitability', 'consistency', 'risk_management', 'experience', 'is_bot',
+                              'bot_confidence', 'bot_penalty', 'total', 'tier', 'reliability_grade')}
+    for d in perfiles:
+        p = _Perfil(d)
+        p.calculate_profitability_score()
+        p.calculate_consistency_score()
+        p.calculate_risk_management_score()
+        p.calculate_experience_score()
+        p.calculate_final_score()
+        for c in ('profitability', 'consistency', 'risk_management', 'experience', 'total',
+                  'tier', 'reliability_grade'):
+            salida[c].append(p.scores[c])
+        salida['bot_penalty'].append(p.scores.get('bot_penalty', 0))
+        salida['is_bot'].append(p.is_bot)
+        salida['bot_confidence'].append(p.bot_confidence)
+    return salida
+
+
+def diferencias(lote, objetos):
+    """Filas en las que puntuar_lote y WhaleScorer no coinciden: [(fila, clave, lote, objeto)]"""
+    fallos = []
+    for clave, valores in objetos.items():
+        for i, esperado in enumerate(valores):
+            obtenido = lote[clave][i]
+            if obtenido != esperado:
+                fallos.append((i, clave, obtenido, esperado))
+    return fallos
+
+
+def _leer_perfiles(ruta):
+    with open(ruta, 'r', encoding='utf-8') as f:
+        texto = f.read()
+    if texto.lstrip().startswith('['):
+        return json.loads(texto)
+    return [json.loads(linea) for linea in texto.splitlines() if linea.strip()]
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Scoring de ballenas por lotes (NumPy)")
+    parser.add_argument('perfiles', help="JSON (lista) o JSONL de dicts scraped_data")
+    parser.add_argument('--version', default=VERSION_SCORING, choices=sorted(VERSIONES_SCORING),
+                        help=f"Versión de las curvas de puntos (defecto: {VERSION_SCORING})")
+    parser.add_argument('--comparar', metavar='VERSION', choices=sorted(VERSIONES_SCORING),
+                        help="Puntuar también con otra versión y mostrar los cambios de tier")
+    parser.add_argument('--verificar', action='store_true',
+                        help="Comparar con WhaleScorer fila a fila")
+    args = parser.parse_args()
+
+    if not NUMPY_AVAILABLE:
+        print("❌ Requiere numpy: pip install numpy")
+        sys.exit(1)
+
+    perfiles = _leer_perfiles(args.perfiles)
+    tabla = columnas_desde_perfiles(perfiles)
+    inicio = time.perf_counter()
+    lote = puntuar_lote(tabla, args.version)
+    ms = (time.perf_counter() - inicio) * 1000
+    print(f"🦈 {len(perfiles):,} wallets puntuadas en {ms:.1f} ms (scoring {args.version})")
+    for tier, n in Counter(lote['tier'].tolist()).most_common():
+        print(f"   {tier:<14} {n:>7,}")
+
+    if args.comparar:
+        otro = puntuar_lote(tabla, args.comparar)
+        delta = lote['total'] - otro['total']
+        print(f"\n⚖️  {args.version} vs {args.comparar}: total medio {delta.mean():+.2f} pts, "
+              f"{int((lote['tier'] != otro['tier']).sum()):,} wallets cambian de tier")
+        cambios = Counter(zip(otro['tier'].tolist(), lote['tier'].tolist()))
+        for (antes, despues), n in cambios.most_common():
+            if antes != despues:
+                print(f"   {antes:<14} → {despues:<14} {n:>7,}")
+
+    if args.verificar:
+        inicio = time.perf_counter()
+        objetos = puntuar_objetos(perfiles, args.version)
+        ms_obj = (time.perf_counter() - inicio) * 1000
+        fallos = diferencias(lote, objetos)
+        print(f"\n🔍 WhaleScorer por objeto: {ms_obj:.1f} ms")
+        if fallos:
+            for i, clave, obtenido, esperado in fallos[:20]:
+                print(f"   ❌ fila {i} {clave}: lote={obtenido!r} objeto={esperado!r}")
+            print(f"❌ {len(fallos):,} diferencias")
+            sys.exit(1)
+        print("✅ Idéntico al camino por objeto")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,310 @@
+#!/usr/bin/env python3
+"""
+Estadísticas materializadas e incrementales de whale_signals.
+
+En lugar de recalcular win rate / PnL recorriendo todas las filas resueltas,
+se mantienen contadores acumulados que se actualizan en el momento en que:
+- el detector GOLD registra una señal (registrar_senal), y
+- el validador resuelve un trade (registrar_resultado).
+
+Dimensiones: tier, signal_id, category, edge, price_zone, display_name.
+Lecturas (resumen, historial_trader) son O(1) sobre el dict en memoria.
+
+Persistencia: JSON local compartido por el detector y el validador. Cada proceso
+acumula sus operaciones pendientes y al guardar las aplica sobre la versión en
+disco bajo flock, así que dos procesos escribiendo no se pisan los contadores.
+"""
+
+import os
+import json
+import time
+import fcntl
+import logging
+import threading
+from datetime import datetime
+
+logger = logging.getLogger(__name__)
+
+STATS_PATH = "whale_stats.json"
+DIMENSIONES = ('tier', 'signal_id', 'category', 'edge', 'price_zone', 'display_name')
+RECIENTES_POR_TRADER = 5
+REFRESCO_MIN_SEG = 5  # No hacer stat() del archivo más de una vez cada 5s
+
+# Buckets de edge (mismo orden que el reporte del validador)
+EDGE_BUCKETS = ['Edge Real (>3%)', 'Edge Marginal (0-3%)', 'Sucker Bet (<0%)']
+
+# Zonas de precio alineadas con las señales de classify()
+PRICE_ZONES = ['<0.40', '0.40-0.44', '0.45-0.49', '0.50-0.60', '0.60-0.80', '0.80-0.85', '>0.85']
+
+
+def _bucket_edge(edge_pct):
+    """Bucket de edge de un trade; None si edge == 0 (sin datos de Pinnacle)"""
+    if edge_pct > 3:
+        return 'Edge Real (>3%)'
+    if edge_pct > 0:
+        return 'Edge Marginal (0-3%)'
+    if edge_pct < 0:
+        return 'Sucker Bet (<0%)'
+    return None
+
+
+def _zona_precio(price):
+    if price < 0.40:
+        return '<0.40'
+    if price < 0.45:
+        return '0.40-0.44'
+    if price < 0.50:
+        return '0.45-0.49'
+    if price <= 0.60:
+        return '0.50-0.60'
+    if price <= 0.80:
+        return '0.60-0.80'
+    if price <= 0.85:
+        return '0.80-0.85'
+    return '>0.85'
+
+
+def _nuevo_acumulador():
+    return {'total': 0, 'wins': 0, 'losses': 0, 'pnl': 0.0}
+
+
+def _acumular(acc, trade):
+    acc['total'] += 1
+    if trade['result'] == 'WIN':
+        acc['wins'] += 1
+    elif trade['result'] == 'LOSS':
+        acc['losses'] += 1
+    acc['pnl'] += float(trade.get('pnl_teorico') or 0)
+
+
+def _categoria(fila):
+    """Categoría de la fila; si no viene (tabla sin columna category) se deriva del título"""
+    if fila.get('category'):
+        return fila['category']
+    from taxonomy import detectar_categoria
+    return detectar_categoria(fila.get('market_title') or '')
+
+
+def claves_de(fila):
+    """Clave de cada dimensión para una fila de whale_signals (None = no aplica)"""
+    return {
+        'tier': fila.get('tier') or None,
+        'signal_id': fila.get('signal_id') or None,
+        'category': _categoria(fila),
+        'edge': _bucket_edge(float(fila.get('edge_pct') or 0)),
+        'price_zone': _zona_precio(float(fila.get('poly_price') or 0)),
+        'display_name': fila.get('display_name') or None,
+    }
+
+
+def _datos_vacios():
+    return {
+        'global': _nuevo_acumulador(),
+        'dims': {dim: {} for dim in DIMENSIONES},
+        'traders': {},
+    }
+
+
+def _fila_reciente(fila):
+    return {
+        'id': fila.get('id'),
+        'detected_at': fila.get('detected_at') or '',
+        'side': fila.get('side', ''),
+        'market_title': fila.get('market_title', ''),
+        'result': fila.get('result'),
+        'pnl_teorico': fila.get('pnl_teorico'),
+    }
+
+
+def _aplicar(datos, op):
+    """Aplica una operación ('senal' | 'resultado') sobre un dict de datos"""
+    tipo, fila = op
+    nombre = fila.get('display_name') or ''
+    trader = datos['traders'].setdefault(nombre, {'registrados': 0, 'recientes': []})
+
+    if tipo == 'senal':
+        trader['registrados'] += 1
+        trader['recientes'].append(_fila_reciente(fila))
+        del trader['recientes'][:-RECIENTES_POR_TRADER]
+        return
+
+    # tipo == 'resultado'
+    _acumular(datos['global'], fila)
+    for dim, clave in fila['_claves'].items():
+        if clave is not None:
+            _acumular(datos['dims'][dim].setdefault(clave, _nuevo_acumulador()), fila)
+    for reciente in trader['recientes']:
+        if reciente['id'] is not None and reciente['id'] == fila.get('id'):
+            reciente['result'] = fila['result']
+            reciente['pnl_teorico'] = fila.get('pnl_teorico')
+
+
+class WhaleStatsStore:
+    """Contadores acumulados por dimensión, persistidos en JSON"""
+
+    def __init__(self, path=STATS_PATH):
+        self.path = path
+        self._lock = threading.Lock()
+        self._pendientes = []       # operaciones aún no escritas a disco
+        self._mtime = None
+        self._ultimo_refresco = 0.0
+        self.datos = self._leer_disco()
+
+    # --- Persistencia ---
+
+    def _leer_disco(self):
+        if not os.path.exists(self.path):
+            return _datos_vacios()
+        try:
+            with open(self.path, 'r', encoding='utf-8') as f:
+                datos = json.load(f)
+            self._mtime = os.path.getmtime(self.path)
+            for dim in DIMENSIONES:
+                datos['dims'].setdefault(dim, {})
+            return datos
+        except Exception as e:
+            logger.warning(f"No se pudieron leer estadísticas ({self.path}): {e}")
+            return _datos_vacios()
+
+    def _escribir_disco(self, datos):
+        tmp_path = f"{self.path}.tmp"
+        datos['ultima_actualizacion'] = datetime.now().isoformat()
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump(datos, f)
+        os.replace(tmp_path, self.path)
+        self._mtime = os.path.getmtime(self.path)
+
+    def guardar(self):
+        """Fusiona las operaciones pendientes con la versión en disco (bajo flock)"""
+        with self._lock:
+            ops, self._pendientes = self._pendientes, []
+        if not ops:
+            return
+        try:
+            with open(f"{self.path}.lock", 'w') as lock_file:
+                fcntl.flock(lock_file, fcntl.LOCK_EX)
+                datos = self._leer_disco()
+                for op in ops:
+                    _aplicar(datos, op)
+                self._escribir_disco(datos)
+            with self._lock:
+                # Operaciones llegadas durante la escritura siguen pendientes: re-aplicar en memoria
+                for op in self._pendientes:
+                    _aplicar(datos, op)
+                self.datos = datos
+        except Exception as e:
+            logger.error(f"Error guardando estadísticas: {e}")
+            with self._lock:
+                self._pendientes = ops + self._pendientes
+
+    def refrescar(self):
+        """Recarga desde disco si otro proceso escribió (p.ej. el validador resolvió trades)"""
+        ahora = time.time()
+        if ahora - self._ultimo_refresco < REFRESCO_MIN_SEG:
+            return
+        self._ultimo_refresco = ahora
+        try:
+            mtime = os.path.getmtime(self.path)
+        except OSError:
+            return
+        if mtime == self._mtime:
+            return
+        datos = self._leer_disco()
+        with self._lock:
+            for op in self._pendientes:
+                _aplicar(datos, op)
+            self.datos = datos
+
+    def reconstruir(self, filas):
+        """
+        Reconstruye todas las estadísticas desde cero a partir de un iterable de filas
+        de whale_signals ordenadas por id (resueltas y pendientes).
+        """
+        datos = _datos_vacios()
+        total = 0
+        for fila in filas:
+            total += 1
+            _aplicar(datos, ('senal', fila))
+            if fila.get('result'):
+                _aplicar(datos, ('resultado', {**fila, '_claves': claves_de(fila)}))
+        # Marca de agua: el store ya contiene el histórico de Supabase (ver `reconstruido`)
+        datos['reconstruido'] = datetime.now().isoformat()
+        with open(f"{self.path}.lock", 'w') as lock_file:
+            fcntl.flock(lock_file, fcntl.LOCK_EX)
+            self._escribir_disco(datos)
+        with self._lock:
+            self._pendientes = []
+            self.datos = datos
+        return total
+
+    # --- Escritura incremental ---
+
+    def _registrar(self, op):
+        with self._lock:
+            _aplicar(self.datos, op)
+            self._pendientes.append(op)
+
+    def registrar_senal(self, fila):
+        """Señal insertada en whale_signals (detector GOLD)"""
+        self._registrar(('senal', {
+            'id': fila.get('id'),
+            'display_name': fila.get('display_name', ''),
+            'detected_at': fila.get('detected_at', ''),
+            'side': fila.get('side', ''),
+            'market_title': fila.get('market_title', ''),
+        }))
+
+    def registrar_resultado(self, fila, result, pnl_teorico):
+        """Trade resuelto por el validador"""
+        resuelta = {
+            'id': fila.get('id'),
+            'display_name': fila.get('display_name', ''),
+            'result': result,
+            'pnl_teorico': pnl_teorico,
+        }
+        resuelta['_claves'] = claves_de(fila)
+        self._registrar(('resultado', resuelta))
+
+    # --- Lecturas O(1) ---
+
+    @property
+    def reconstruido(self):
+        """True si el store se construyó alguna vez desde whale_signals.
+
+        Sin esta marca solo contiene lo registrado desde el despliegue (aunque
+        no esté vacío) y no sirve como historial completo."""
+        return bool(self.datos.get('reconstruido'))
+
+    def resumen_global(self):
+        return dict(self.datos['global'])
+
+    def resumen(self, dimension, clave):
+        acc = self.datos['dims'].get(dimension, {}).get(clave)
+        return dict(acc) if acc else None
+
+    def claves(self, dimension):
+        return list(self.datos['dims'].get(dimension, {}).keys())
+
+    def historial_trader(self, display_name):
+        """
+        Historial de un trader en el formato de GoldWhaleDetector._obtener_historial_trader.
+        Devuelve {} si el trader no tiene señales registradas.
+        """
+        trader = self.datos['traders'].get(display_name)
+        acc = self.datos['dims']['display_name'].get(display_name, _nuevo_acumulador())
+        if not trader and not acc['total']:
+            return {}
+
+        registrados = trader['registrados'] if trader else 0
+        total = max(registrados, acc['total'])
+        recientes = sorted(trader['recientes'] if trader else [],
+                           key=lambda t: t.get('detected_at') or '', reverse=True)
+        return {
+            'total': total,
+            'resolved': acc['total'],
+            'wins': acc['wins'],
+            'losses': acc['losses'],
+            'open': total - acc['total'],
+            'pnl_total': acc['pnl'],
+            'recent': recientes,
+        }